@@ -0,0 +1,102 @@
+"""Benchmark de los ajustes masivos de precio y stock.
+
+Compara subir un 8 % el precio de los productos de una estación:
+
+- ``uno por uno``: ``InventarioService.actualizar_producto`` por producto,
+  como al editarlos de a uno (una transacción cada uno).
+- ``masivo``: ``AjustesService.aplicar`` (una sentencia sobre la selección
+  en una transacción, con el detalle para deshacerlo).
+
+Verifica que el ajuste deje los precios calculados en Python, que deshacer
+un ajuste de precio respete los productos que cambiaron después, que
+deshacer uno de stock reste solo la diferencia y que el libro de movimientos
+siga cuadrando. Sale con código 1 si algo falla.
+
+Uso::
+
+    python -m benchmarks.bench_ajustes [productos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import database
+from services.ajustes import Ajuste, AjustesService
+from services.inventario import InventarioService
+from services.movimientos import MovimientosService
+from tools.generar_datos import generar_base_datos
+
+ESTACION = "Barra"
+PORCENTAJE = 8
+
+def precios(conexion):
+    return dict(conexion.execute("SELECT id, precio FROM productos"))
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_ajustes_"), "ajustes.db")
+    generar_base_datos(ruta, informar=None, mesas=1, productos=cantidad, dias=0)
+    database.configurar_base_datos(ruta)
+    inventario, ajustes = InventarioService(), AjustesService()
+    conexion = database.crear_conexion(ruta)
+    seleccion = conexion.execute(
+        "SELECT id, nombre, precio, stock FROM productos WHERE estacion = ?", (ESTACION,)
+    ).fetchall()
+    print(f"{cantidad} productos, {len(seleccion)} en {ESTACION}")
+
+    inicio = time.perf_counter()
+    for producto_id, nombre, precio, stock in seleccion:
+        inventario.actualizar_producto(producto_id, nombre, round(precio * (1 + PORCENTAJE / 100), 2), stock)
+    uno_por_uno = time.perf_counter() - inicio
+    # Volver a los precios originales antes de medir el ajuste masivo
+    conexion.executemany("UPDATE productos SET precio = ? WHERE id = ?", [(p, i) for i, _, p, _ in seleccion])
+    conexion.commit()
+
+    antes = precios(conexion)
+    inicio = time.perf_counter()
+    ajuste_id, cambiados = ajustes.aplicar(Ajuste("precio", "porcentaje", PORCENTAJE, estacion=ESTACION), "bench")
+    masivo = time.perf_counter() - inicio
+    print(f"uno por uno  {uno_por_uno * 1000:9.1f} ms")
+    print(f"masivo       {masivo * 1000:9.1f} ms  ({cambiados} productos)")
+
+    fallos = []
+    despues = precios(conexion)
+    seleccionados = {producto_id for producto_id, *_ in seleccion}
+    for producto_id, precio in antes.items():
+        esperado = max(0.01, round(precio * (1 + PORCENTAJE / 100), 2)) if producto_id in seleccionados else precio
+        if abs(despues[producto_id] - esperado) > 0.005:
+            fallos.append(f"precio del producto {producto_id}: {despues[producto_id]} en vez de {esperado}")
+            break
+
+    # Un producto editado después del ajuste conserva su precio al deshacer
+    editado = seleccion[0][0]
+    conexion.execute("UPDATE productos SET precio = 123.45 WHERE id = ?", (editado,))
+    conexion.commit()
+    inicio = time.perf_counter()
+    revertidos = ajustes.deshacer(ajuste_id)
+    print(f"deshacer     {(time.perf_counter() - inicio) * 1000:9.1f} ms  ({revertidos} productos)")
+    esperado = {**antes, editado: 123.45}
+    if precios(conexion) != esperado or revertidos != cambiados - 1:
+        fallos.append("deshacer el ajuste de precio no dejó los precios anteriores")
+
+    # Stock: entrega de 200 unidades, ventas y deshacer
+    stock_antes = dict(conexion.execute("SELECT id, stock FROM productos"))
+    ajuste_id, _ = ajustes.aplicar(Ajuste("stock", "cantidad", 200, estacion=ESTACION), "bench")
+    conexion.execute("UPDATE productos SET stock = stock - 150 WHERE id = ?", (editado,))
+    conexion.commit()
+    ajustes.deshacer(ajuste_id)
+    esperado = {**stock_antes, editado: max(0, stock_antes[editado] - 150)}
+    if dict(conexion.execute("SELECT id, stock FROM productos")) != esperado:
+        fallos.append("deshacer el ajuste de stock no restó solo la diferencia")
+    if MovimientosService().verificar():
+        fallos.append("el libro de movimientos no cuadra después de los ajustes")
+    conexion.close()
+
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("\nLos ajustes y su deshacer dejan los valores esperados y el libro cuadra")
+
+if __name__ == "__main__":
+    main()
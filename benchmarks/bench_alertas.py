@@ -0,0 +1,107 @@
+"""Benchmark de las alertas de stock bajo con 50.000 productos.
+
+Compara lo que cuesta saber qué productos están en su stock mínimo o por
+debajo:
+
+- ``recorrer``: filtrar la tabla ``productos`` completa (lo que haría cada
+  pantalla sin la tabla de alertas).
+- ``alertas``: ``InventarioService.alertas_stock``, que lee solo
+  ``alertas_stock``.
+
+Mide también lo que agregan los triggers a cada cambio de stock (contra una
+copia de la base sin ellos) y verifica que, después de cambios de stock que
+cruzan el mínimo en los dos sentidos, cambios de mínimo y bajas, la tabla de
+alertas tenga exactamente los productos que da el recorrido. Sale con código
+1 si no coinciden.
+
+Uso::
+
+    python -m benchmarks.bench_alertas [productos]
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+from services.inventario import InventarioService
+from tools.generar_datos import generar_base_datos
+
+CAMBIOS = 20_000
+
+def en_alerta(conexion):
+    return {fila[0] for fila in conexion.execute(
+        "SELECT id FROM productos WHERE stock_minimo > 0 AND stock <= stock_minimo"
+    )}
+
+def medir(funcion, repeticiones=20):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def cambiar_stock(ruta, ids, semilla):
+    """Segundos de ``CAMBIOS`` actualizaciones de stock de a una transacción por lote"""
+    rng = random.Random(semilla)
+    conexion = database.crear_conexion(ruta)
+    cambios = [(rng.randint(0, 60), rng.choice(ids)) for _ in range(CAMBIOS)]
+    inicio = time.perf_counter()
+    for desde in range(0, CAMBIOS, 100):
+        conexion.executemany("UPDATE productos SET stock = ? WHERE id = ?", cambios[desde:desde + 100])
+        conexion.commit()
+    segundos = time.perf_counter() - inicio
+    conexion.close()
+    return segundos
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    directorio = tempfile.mkdtemp(prefix="bench_alertas_")
+    ruta = os.path.join(directorio, "alertas.db")
+    generar_base_datos(ruta, informar=None, mesas=1, productos=cantidad, dias=0)
+    database.configurar_base_datos(ruta)
+    servicio = InventarioService()
+    conexion = database.crear_conexion(ruta)
+    ids = [fila[0] for fila in conexion.execute("SELECT id FROM productos")]
+
+    print(f"{cantidad} productos, {len(servicio.alertas_stock())} en alerta")
+    print(f"recorrer   {medir(lambda: en_alerta(conexion)):8.3f} ms")
+    print(f"alertas    {medir(servicio.alertas_stock):8.3f} ms")
+
+    # Costo de los triggers en cada cambio de stock
+    sin_triggers = os.path.join(directorio, "sin_triggers.db")
+    conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    shutil.copy(ruta, sin_triggers)
+    copia = database.crear_conexion(sin_triggers)
+    for (nombre,) in copia.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                                   "AND name LIKE 'alertas_stock_%'").fetchall():
+        copia.execute(f"DROP TRIGGER {nombre}")
+    copia.commit()
+    copia.close()
+    con, sin = cambiar_stock(ruta, ids, 1), cambiar_stock(sin_triggers, ids, 1)
+    print(f"\n{CAMBIOS} cambios de stock: {sin:.2f} s sin triggers de alertas, {con:.2f} s con "
+          f"({(con - sin) / CAMBIOS * 1e6:+.1f} µs por cambio)")
+
+    # Mínimos nuevos, productos quitados y más cambios de stock
+    rng = random.Random(2)
+    conexion.executemany("UPDATE productos SET stock_minimo = ? WHERE id = ?",
+                         [(rng.choice((0, 5, 40)), rng.choice(ids)) for _ in range(2000)])
+    borrados = rng.sample(ids, 50)
+    conexion.executemany("DELETE FROM productos WHERE id = ?", [(producto_id,) for producto_id in borrados])
+    conexion.commit()
+    cambiar_stock(ruta, [i for i in ids if i not in set(borrados)], 3)
+
+    alertas = {alerta.producto_id for alerta in servicio.alertas_stock()}
+    esperadas = en_alerta(conexion)
+    conexion.close()
+    if alertas != esperadas:
+        print(f"\nalertas_stock no coincide: {len(alertas - esperadas)} de más, {len(esperadas - alertas)} de menos")
+        sys.exit(1)
+    print(f"\nalertas_stock coincide con el recorrido ({len(alertas)} productos)")
+
+if __name__ == "__main__":
+    main()
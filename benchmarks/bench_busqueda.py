@@ -0,0 +1,89 @@
+"""Benchmark de la búsqueda de productos al tomar pedidos.
+
+Arma un catálogo sintético de 20.000 productos (nombres de
+``tools.generar_datos``) con popularidad tipo Zipf y simula a un mesero
+escribiendo varias consultas letra por letra. Para cada índice mide el tiempo
+de construcción y la latencia por tecla (mediana, p99 y máximo):
+
+- ``lineal``: recorrer todo el catálogo comparando texto normalizado y ordenar
+  por popularidad (lo que costaría filtrar la lista sin índice).
+- ``trie``: ``IndiceProductos``.
+- ``fts5``: ``IndiceFTS`` (si SQLite tiene FTS5).
+
+Uso::
+
+    python -m benchmarks.bench_busqueda [productos]
+"""
+import random
+import statistics
+import sys
+import time
+
+from services.busqueda import IndiceFTS, IndiceProductos, LIMITE_RESULTADOS, fts5_disponible, palabras
+from services.catalogo import Producto
+from tools.generar_datos import generar_productos
+
+CONSULTAS = ("pizza gourmet", "cafe", "hamburguesa doble", "tiramsu", "limonada 3", "ens ces")
+
+class BusquedaLineal:
+    def __init__(self, productos, popularidad):
+        self.productos = sorted(productos, key=lambda p: -popularidad.get(p.id, 0))
+        self.nombres = [palabras(p.nombre) for p in self.productos]
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS):
+        consulta = palabras(texto)
+        resultados = []
+        for producto, propias in zip(self.productos, self.nombres):
+            if all(any(p.startswith(t) for p in propias) for t in consulta):
+                resultados.append(producto)
+                if len(resultados) >= limite:
+                    break
+        return resultados
+
+def crear_catalogo(cantidad, rng):
+    filas = generar_productos({"productos": cantidad}, rng)
+    productos = [Producto(i, *fila) for i, fila in enumerate(filas, 1)]
+    # Pocos productos concentran la mayoría de las ventas
+    orden = list(range(1, cantidad + 1))
+    rng.shuffle(orden)
+    popularidad = {producto_id: int(10000 / rango) for rango, producto_id in enumerate(orden, 1)}
+    return productos, popularidad
+
+def teclear(indice, consultas):
+    """Latencias (ms) de buscar cada prefijo de cada consulta"""
+    tiempos = []
+    for consulta in consultas:
+        for fin in range(1, len(consulta) + 1):
+            inicio = time.perf_counter()
+            indice.buscar(consulta[:fin])
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+    return tiempos
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = random.Random(7)
+    productos, popularidad = crear_catalogo(cantidad, rng)
+
+    tipos = [("lineal", BusquedaLineal), ("trie", IndiceProductos)]
+    if fts5_disponible():
+        tipos.append(("fts5", IndiceFTS))
+
+    print(f"{cantidad} productos, {sum(len(c) for c in CONSULTAS)} teclas por ronda")
+    print(f"{'índice':<8}{'construir (ms)':>16}{'mediana (ms)':>14}{'p99 (ms)':>11}{'máx (ms)':>11}")
+    for nombre, tipo in tipos:
+        inicio = time.perf_counter()
+        indice = tipo(productos, popularidad)
+        construir = (time.perf_counter() - inicio) * 1000
+
+        teclear(indice, CONSULTAS)  # calentar
+        tiempos = sorted(t for _ in range(5) for t in teclear(indice, CONSULTAS))
+        p99 = tiempos[int(len(tiempos) * 0.99) - 1]
+        print(f"{nombre:<8}{construir:>16.1f}{statistics.median(tiempos):>14.3f}{p99:>11.3f}{tiempos[-1]:>11.3f}")
+
+    indice = IndiceProductos(productos, popularidad)
+    for consulta in CONSULTAS:
+        encontrados = [p.nombre for p in indice.buscar(consulta, 3)]
+        print(f"  {consulta!r}: {encontrados}")
+
+if __name__ == "__main__":
+    main()
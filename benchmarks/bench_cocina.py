@@ -0,0 +1,121 @@
+"""Benchmark de la pantalla de cocina con cientos de órdenes abiertas.
+
+Llena una base con un historial de comandas ya entregadas y 300 órdenes
+abiertas con sus comandas pendientes; después confirma cambios de a uno (como
+llegarían durante el servicio) y mide cuánto cuesta poner la pantalla al día
+después de cada uno:
+
+- ``recarga``: leer todas las comandas activas (``activas``) y reiniciar el
+  modelo, lo que haría una pantalla que relee todo.
+- ``novedades``: leer lo posterior a la última secuencia vista y aplicarlo al
+  modelo fila por fila.
+
+También mide el costo de revisar sin cambios (``PRAGMA data_version`` del
+vigilante), que es lo que ocurre la mayor parte del tiempo.
+
+Uso::
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_cocina [ordenes] [cambios]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from PySide6.QtWidgets import QApplication
+
+import database
+from services.cocina import ComandasService, registrar_comanda
+from services.mesas import MesasService
+from services.ordenes import OrdenService
+from tools.generar_datos import generar_base_datos
+from views.cocina import ModeloComandas
+from vigilante_bd import VigilanteBD
+
+HISTORIAL = 50_000
+
+def llenar_historial(ruta, cantidad, productos, rng):
+    """Comandas ya entregadas, como las de días anteriores"""
+    conexion = database.crear_conexion(ruta)
+    cursor = conexion.cursor()
+    orden_id = cursor.execute("SELECT MIN(id) FROM ordenes").fetchone()[0]
+    for _ in range(cantidad):
+        registrar_comanda(cursor, orden_id, 1, [(p, rng.randint(1, 3)) for p in rng.sample(productos, 3)])
+    cursor.execute("UPDATE comanda_estaciones SET estado = 'entregada'")
+    conexion.commit()
+    conexion.close()
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000, max(tiempos) * 1000
+
+def main():
+    ordenes = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cambios = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    app = QApplication(sys.argv)
+    rng = random.Random(3)
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_cocina_"), "cocina.db")
+    generar_base_datos(ruta, informar=None, mesas=ordenes, productos=400, dias=1)
+    database.configurar_base_datos(ruta)
+    conexion = database.crear_conexion(ruta)
+    conexion.execute("UPDATE productos SET stock = 100000")
+    conexion.commit()
+    productos = conexion.execute("SELECT id, nombre, precio FROM productos").fetchall()
+    llenar_historial(ruta, HISTORIAL, [p[0] for p in productos], rng)
+
+    servicio = OrdenService()
+    comandas = ComandasService()
+    abiertas = []
+    for mesa in MesasService().listar_mesas()[:ordenes]:
+        orden = servicio.abrir(mesa)
+        for producto_id, nombre, precio in rng.sample(productos, 4):
+            orden.agregar(producto_id, nombre, precio, rng.randint(1, 3))
+        servicio.confirmar(orden)
+        abiertas.append(orden)
+
+    completo = ModeloComandas()
+    incremental = ModeloComandas()
+    incremental.establecer(*comandas.activas())
+    print(f"{ordenes} órdenes abiertas, {incremental.rowCount()} comandas activas por estación, "
+          f"{HISTORIAL} comandas en el historial")
+
+    def cambio():
+        orden = rng.choice(abiertas)
+        producto_id, nombre, precio = rng.choice(productos)
+        orden.agregar(producto_id, nombre, precio, 1)
+        servicio.confirmar(orden)
+
+    tiempos = {"recarga": [], "novedades": []}
+    for _ in range(cambios):
+        cambio()
+        inicio = time.perf_counter()
+        completo.establecer(*comandas.activas())
+        tiempos["recarga"].append(time.perf_counter() - inicio)
+
+        inicio = time.perf_counter()
+        incremental.aplicar(comandas.novedades(incremental.secuencia))
+        tiempos["novedades"].append(time.perf_counter() - inicio)
+    app.processEvents()
+
+    for nombre, valores in tiempos.items():
+        print(f"{nombre:<10} mediana {statistics.median(valores) * 1000:7.3f} ms   "
+              f"máx {max(valores) * 1000:7.3f} ms   total {sum(valores) * 1000:8.1f} ms")
+    if completo.rowCount() != incremental.rowCount():
+        print(f"Los modelos no coinciden: {completo.rowCount()} y {incremental.rowCount()}")
+        sys.exit(1)
+
+    vigilante = VigilanteBD(ruta)
+    vigilante.iniciar()
+    mediana, maximo = medir(vigilante.revisar, 1000)
+    print(f"revisar sin cambios: mediana {mediana * 1000:.1f} µs, máx {maximo * 1000:.1f} µs")
+    vigilante.detener()
+
+if __name__ == "__main__":
+    main()
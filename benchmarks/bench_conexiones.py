@@ -0,0 +1,73 @@
+"""Micro-benchmark: costo de obtener una conexión por operación.
+
+Compara el patrón anterior (``sqlite3.connect`` + consulta + ``close`` en cada
+acción de la interfaz) contra el pool de ``database.obtener_conexion``.
+
+Uso::
+
+    python -m benchmarks.bench_conexiones [iteraciones]
+"""
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+# La base de datos del benchmark nunca debe ser la de producción
+_directorio = tempfile.mkdtemp(prefix="bench_conexiones_")
+os.environ["RESTAURANTE_BD"] = os.path.join(_directorio, "bench.db")
+
+import database  # noqa: E402
+
+CONSULTA = "SELECT stock FROM productos WHERE id = ?"
+
+def preparar(ruta):
+    conexion = database.crear_conexion(ruta)
+    conexion.executemany(
+        "INSERT OR IGNORE INTO productos (nombre, precio, stock) VALUES (?, ?, ?)",
+        [(f"Producto {i}", 1.0 + i, 100) for i in range(1, 501)]
+    )
+    conexion.commit()
+    conexion.close()
+
+def medir(nombre, operacion, iteraciones):
+    tiempos = []
+    for i in range(iteraciones):
+        inicio = time.perf_counter()
+        operacion(i % 500 + 1)
+        tiempos.append((time.perf_counter() - inicio) * 1e6)
+    tiempos.sort()
+    p99 = tiempos[int(len(tiempos) * 0.99) - 1]
+    print(f"{nombre:<38} media {statistics.mean(tiempos):8.1f} us   "
+          f"p50 {statistics.median(tiempos):8.1f} us   p99 {p99:8.1f} us")
+    return statistics.mean(tiempos)
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ruta = os.environ["RESTAURANTE_BD"]
+    database.inicializar_base_datos()
+    preparar(ruta)
+
+    def antes(producto_id):
+        conexion = sqlite3.connect(ruta)
+        conexion.execute(CONSULTA, (producto_id,)).fetchone()
+        conexion.close()
+
+    def antes_configurada(producto_id):
+        conexion = database.crear_conexion(ruta)
+        conexion.execute(CONSULTA, (producto_id,)).fetchone()
+        conexion.close()
+
+    def pool(producto_id):
+        with database.obtener_conexion() as conexion:
+            conexion.execute(CONSULTA, (producto_id,)).fetchone()
+
+    print(f"{iteraciones} consultas de stock sobre {ruta}\n")
+    t_antes = medir("connect/close por operación", antes, iteraciones)
+    medir("connect/close + PRAGMAs por operación", antes_configurada, iteraciones)
+    t_pool = medir("pool (obtener_conexion)", pool, iteraciones)
+    print(f"\nAceleración del pool: {t_antes / t_pool:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark de la confirmación de órdenes grandes.
+
+Para órdenes de 20, 100 y 500 líneas ya confirmadas, simula al mesero que
+suma una unidad a una línea y agrega un producto nuevo, y vuelve a
+confirmar. Compara:
+
+- ``antes``: borrar y volver a insertar todas las líneas una por una, con un
+  ``SELECT`` y un ``UPDATE`` de stock por producto (la versión anterior de
+  ``OrdenService.confirmar``).
+- ``ahora``: ``OrdenService.confirmar``, que escribe solo las diferencias en
+  lotes ``executemany`` dentro de ``BEGIN IMMEDIATE``.
+
+Por confirmación informa las sentencias ejecutadas, las filas escritas
+(``total_changes``, incluidos los triggers), los bytes agregados al WAL y el
+tiempo que se mantiene el bloqueo de escritura (de la primera escritura al
+``commit``).
+
+Uso::
+
+    python -m benchmarks.bench_confirmar [repeticiones]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+from services.inventario import InventarioService
+from services.ordenes import OrdenService, StockInsuficiente
+from tools.generar_datos import generar_base_datos
+
+ESCALAS = (20, 100, 500)
+ESCRITURAS = ("BEGIN", "INSERT", "UPDATE", "DELETE")
+
+class OrdenServiceAntes(OrdenService):
+    def confirmar(self, orden):
+        mesa_id = orden.mesa[0]
+        total = orden.total
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT id FROM ordenes WHERE mesa_id = ? AND estado = 'abierta'", (mesa_id,))
+            orden_existente = cursor.fetchone()
+            if orden_existente:
+                orden_id = orden_existente[0]
+                cursor.execute("UPDATE ordenes SET cliente_nombre = ?, total = ? WHERE id = ?",
+                               (orden.cliente, total, orden_id))
+            else:
+                cursor.execute("INSERT INTO ordenes (mesa_id, cliente_nombre, estado, total) VALUES (?, ?, ?, ?)",
+                               (mesa_id, orden.cliente, 'abierta', total))
+                orden_id = cursor.lastrowid
+            cursor.execute("UPDATE mesas SET estado = 'ocupada' WHERE id = ?", (mesa_id,))
+
+            cambios_stock = orden.cambios_stock()
+            for producto_id, diferencia in cambios_stock.items():
+                if diferencia > 0:
+                    cursor.execute("SELECT stock, nombre FROM productos WHERE id = ?", (producto_id,))
+                    stock_actual, nombre = cursor.fetchone()
+                    if stock_actual < diferencia:
+                        raise StockInsuficiente(nombre, stock_actual)
+            for producto_id, diferencia in cambios_stock.items():
+                if diferencia != 0:
+                    cursor.execute("UPDATE productos SET stock = stock - ? WHERE id = ?", (diferencia, producto_id))
+
+            cursor.execute("DELETE FROM orden_detalles WHERE orden_id = ?", (orden_id,))
+            for linea in orden.lineas:
+                cursor.execute("""
+                    INSERT INTO orden_detalles (orden_id, producto_id, cantidad, subtotal)
+                    VALUES (?, ?, ?, ?)
+                """, (orden_id, linea['id'], linea['cantidad'], linea['subtotal']))
+            conexion.commit()
+
+        orden.orden_id = orden_id
+        orden.originales = {linea['id']: linea['cantidad'] for linea in orden.lineas}
+        return orden_id
+
+class Medidor:
+    """Sentencias, filas, bytes de WAL y bloqueo de cada confirmación"""
+
+    def __init__(self, pool, ruta):
+        self.pool = pool
+        self.wal = ruta + "-wal"
+        with pool.conexion() as conexion:
+            # Sin checkpoints el WAL solo crece: su tamaño mide lo escrito
+            conexion.execute("PRAGMA wal_autocheckpoint = 0")
+            conexion.set_trace_callback(self._traza)
+            self.conexion = conexion
+        self._sentencias = 0
+        self._primera_escritura = None
+
+    def _traza(self, sentencia):
+        self._sentencias += 1
+        if self._primera_escritura is None and sentencia.lstrip().upper().startswith(ESCRITURAS):
+            self._primera_escritura = time.perf_counter()
+
+    def medir(self, funcion, *args):
+        self._sentencias = 0
+        self._primera_escritura = None
+        cambios = self.conexion.total_changes
+        wal = os.path.getsize(self.wal)
+        funcion(*args)
+        fin = time.perf_counter()
+        return (self._sentencias, self.conexion.total_changes - cambios,
+                os.path.getsize(self.wal) - wal, (fin - self._primera_escritura) * 1000)
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    directorio = tempfile.mkdtemp(prefix="bench_confirmar_")
+
+    print(f"{'versión':<8}{'líneas':>7}{'sentencias':>12}{'filas':>8}{'WAL (KB)':>10}{'bloqueo (ms)':>14}")
+    for lineas in ESCALAS:
+        for nombre, clase in (("antes", OrdenServiceAntes), ("ahora", OrdenService)):
+            ruta = os.path.join(directorio, f"{nombre}_{lineas}.db")
+            generar_base_datos(ruta, informar=None, mesas=2, productos=lineas + repeticiones + 10, dias=0)
+            conexion = database.crear_conexion(ruta)
+            conexion.execute("UPDATE productos SET stock = 1000000")
+            conexion.commit()
+            conexion.close()
+
+            pool = database.PoolConexiones(ruta, tamano=1)
+            servicio = clase(pool)
+            medidor = Medidor(pool, ruta)
+            productos = InventarioService(pool).productos_disponibles()
+            mesa = (1, 1, "Principal", "libre")
+
+            # Orden inicial ya confirmada
+            orden = servicio.abrir(mesa)
+            orden.cliente = "Banquete"
+            for producto_id, nombre_producto, precio in productos[:lineas]:
+                orden.agregar(producto_id, nombre_producto, precio, 2)
+            servicio.confirmar(orden)
+
+            resultados = []
+            for i in range(repeticiones):
+                primero = productos[i % lineas]
+                orden.agregar(*primero, 1)
+                orden.agregar(*productos[lineas + i], 1)
+                resultados.append(medidor.medir(servicio.confirmar, orden))
+
+            sentencias, filas, wal, bloqueo = (statistics.median(columna) for columna in zip(*resultados))
+            print(f"{nombre:<8}{lineas:>7}{sentencias:>12.0f}{filas:>8.0f}{wal / 1024:>10.1f}{bloqueo:>14.2f}")
+            pool.cerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Benchmark de la importación y exportación masiva de productos.
+
+Genera un CSV y un JSON Lines con 100.000 productos (con algunas filas
+inválidas intercaladas) y mide:
+
+- ``una a una``: ``InventarioService.agregar_producto`` por fila, una
+  transacción por producto (sobre una muestra, extrapolado).
+- ``importar``: ``ImportacionService.importar``, por lotes con
+  ``executemany``; la segunda pasada actualiza los productos existentes.
+- ``exportar``: la tabla completa a CSV y a JSON Lines.
+
+Con ``tracemalloc`` se mide la memoria máxima de cada operación: debe
+quedarse en el tamaño de un lote (y del reporte de errores), no en el del
+archivo. Verifica además que el reporte de errores tenga exactamente las
+filas inválidas y que la exportación vuelva a importarse sin cambios. Sale
+con código 1 si algo no coincide.
+
+Uso::
+
+    python -m benchmarks.bench_importacion [productos]
+"""
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import database
+from services.cocina import ESTACIONES
+from services.importacion import ImportacionService
+from services.inventario import InventarioService
+from tools.generar_datos import generar_base_datos
+
+MUESTRA_UNA_A_UNA = 2000
+
+def generar_archivos(directorio, cantidad):
+    """CSV y JSONL con ``cantidad`` filas; devuelve las líneas inválidas de cada uno"""
+    ruta_csv = os.path.join(directorio, "productos.csv")
+    ruta_jsonl = os.path.join(directorio, "productos.jsonl")
+    malas_csv, malas_jsonl = set(), set()
+    with open(ruta_csv, "w", newline="", encoding="utf-8") as archivo_csv, \
+            open(ruta_jsonl, "w", encoding="utf-8") as archivo_jsonl:
+        escritor = csv.writer(archivo_csv)
+        escritor.writerow(("Nombre", "Precio", "Stock", "Estación"))
+        for i in range(cantidad):
+            nombre = f"Producto {i:06d}"
+            precio, stock = f"{1 + i % 500}.{i % 100:02d}", i % 300
+            estacion = ESTACIONES[i % len(ESTACIONES)]
+            if i % 997 == 0:
+                precio = "gratis"
+            elif i % 1009 == 0:
+                nombre = ""
+            if i % 997 == 0 or i % 1009 == 0:
+                malas_csv.add(i + 2)
+                malas_jsonl.add(i + 1)
+            escritor.writerow((nombre, precio.replace(".", ","), stock, estacion))
+            if i % 5003 == 0:
+                archivo_jsonl.write("{no es json\n")
+                malas_jsonl.add(i + 1)
+                continue
+            archivo_jsonl.write(json.dumps(
+                {"nombre": nombre, "precio": precio, "stock": stock, "estacion": estacion}) + "\n")
+    return (ruta_csv, malas_csv), (ruta_jsonl, malas_jsonl)
+
+def medir(funcion):
+    """(resultado, segundos, MB de memoria máxima).
+
+    La memoria se mide repitiendo la operación con ``tracemalloc`` (que la
+    hace varias veces más lenta): importar y exportar se pueden repetir sin
+    cambiar el resultado.
+    """
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcion()
+    _, maximo = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, segundos, maximo / 1e6
+
+def contar(ruta):
+    conexion = database.crear_conexion(ruta)
+    total = conexion.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+    conexion.close()
+    return total
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    directorio = tempfile.mkdtemp(prefix="bench_importacion_")
+    (ruta_csv, malas_csv), (ruta_jsonl, malas_jsonl) = generar_archivos(directorio, cantidad)
+    fallos = []
+
+    # Una a una, sobre una base aparte
+    ruta_antes = os.path.join(directorio, "antes.db")
+    generar_base_datos(ruta_antes, informar=None, mesas=1, productos=1, dias=0)
+    database.configurar_base_datos(ruta_antes)
+    inventario = InventarioService()
+    inicio = time.perf_counter()
+    for i in range(MUESTRA_UNA_A_UNA):
+        inventario.agregar_producto(f"Producto {i:06d}", 1.0 + i % 500, i % 300)
+    por_fila = (time.perf_counter() - inicio) / MUESTRA_UNA_A_UNA
+    print(f"{cantidad} filas ({os.path.getsize(ruta_csv) / 1e6:.1f} MB en CSV)")
+    print(f"una a una          {por_fila * cantidad:8.2f} s  (extrapolado de {MUESTRA_UNA_A_UNA} filas)")
+
+    ruta = os.path.join(directorio, "importacion.db")
+    generar_base_datos(ruta, informar=None, mesas=1, productos=1, dias=0)
+    database.configurar_base_datos(ruta)
+    servicio = ImportacionService()
+    inicial = contar(ruta)
+
+    for etiqueta, archivo, malas in (("importar CSV", ruta_csv, malas_csv),
+                                     ("actualizar CSV", ruta_csv, malas_csv),
+                                     ("actualizar JSONL", ruta_jsonl, malas_jsonl)):
+        resultado, segundos, memoria = medir(lambda: servicio.importar("productos", archivo))
+        print(f"{etiqueta:<18} {segundos:8.2f} s  {memoria:6.1f} MB  "
+              f"{resultado.guardadas} guardadas, {len(resultado.errores)} errores")
+        lineas = {error.linea for error in resultado.errores}
+        if lineas != malas:
+            fallos.append(f"{etiqueta}: errores en {sorted(lineas ^ malas)[:10]}")
+        if resultado.guardadas != resultado.leidas - len(malas):
+            fallos.append(f"{etiqueta}: {resultado.guardadas} guardadas de {resultado.leidas}")
+
+    esperados = inicial + cantidad - len(malas_csv)
+    if contar(ruta) != esperados:
+        fallos.append(f"hay {contar(ruta)} productos, se esperaban {esperados}")
+
+    for formato in ("csv", "jsonl"):
+        destino = os.path.join(directorio, f"exportados.{formato}")
+        filas, segundos, memoria = medir(lambda: servicio.exportar("productos", destino))
+        print(f"exportar {formato.upper():<9} {segundos:8.2f} s  {memoria:6.1f} MB  {filas} filas")
+        if filas != esperados:
+            fallos.append(f"exportar {formato}: {filas} filas")
+
+    # Reimportar lo exportado no debe fallar ni cambiar la cantidad
+    resultado = servicio.importar("productos", os.path.join(directorio, "exportados.csv"))
+    if resultado.errores or contar(ruta) != esperados:
+        fallos.append(f"reimportar: {len(resultado.errores)} errores, {contar(ruta)} productos")
+
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("\nErrores reportados en las líneas esperadas; la exportación se reimporta sin cambios")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark de la impresión de recibos en una ráfaga de cierre de caja.
+
+Simula 30 facturas seguidas y, para cada formato (PDF, ESC/POS) y destino
+(carpeta de spool, impresora simulada por TCP), compara:
+
+- ``en línea``: renderizar y enviar cada recibo en el hilo que factura (lo que
+  bloquearía ``generar_factura``).
+- ``cola``: ``ColaImpresion.imprimir``, que solo encola; se mide lo que tarda
+  en volver cada llamada y cuánto tarda la cola en vaciarse.
+
+También mide renderizar con la plantilla en caché contra analizarla en cada
+recibo, y verifica que lleguen todos los recibos al destino. Sale con código
+1 si falta alguno.
+
+Uso::
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_impresion [facturas]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from PySide6.QtGui import QGuiApplication
+
+from impresion import ColaImpresion, DestinoSocket, DestinoSpool, renderizar
+from services.facturas import Factura, LineaFactura
+from services.recibos import PLANTILLA_RECIBO, PlantillaRecibo, datos_factura, obtener_plantilla
+from tools.impresora_simulada import ImpresoraSimulada
+
+def crear_facturas(cantidad, rng):
+    facturas = []
+    for i in range(1, cantidad + 1):
+        lineas = []
+        for producto in rng.sample(range(1, 400), rng.randint(2, 12)):
+            cantidad_linea = rng.randint(1, 4)
+            precio = round(rng.uniform(1.5, 40), 2)
+            lineas.append(LineaFactura(producto, f"Producto número {producto}", precio,
+                                       cantidad_linea, round(precio * cantidad_linea, 2), 0.0))
+        total = round(sum(linea.subtotal for linea in lineas), 2)
+        facturas.append(Factura(f"FACT-20260101-01-{i:06d}", "2026-01-01 23:00:00",
+                                f"Cliente {i}", rng.randint(1, 40), total, 0.0, lineas))
+    return facturas
+
+def en_linea(facturas, formato, destino):
+    tiempos = []
+    for factura in facturas:
+        inicio = time.perf_counter()
+        destino.enviar(f"{factura.numero}.{formato}", renderizar(factura, formato))
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos, sum(tiempos)
+
+def en_cola(facturas, formato, destino):
+    cola = ColaImpresion(destino, formato)
+    impresos = []
+    cola.impreso.connect(lambda numero, _: impresos.append(numero))
+    tiempos = []
+    inicio_total = time.perf_counter()
+    for factura in facturas:
+        inicio = time.perf_counter()
+        cola.imprimir(factura)
+        tiempos.append(time.perf_counter() - inicio)
+    cola.esperar()
+    total = time.perf_counter() - inicio_total
+    cola.detener()
+    return tiempos, total
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    app = QGuiApplication(sys.argv)
+    facturas = crear_facturas(cantidad, random.Random(7))
+    directorio = tempfile.mkdtemp(prefix="bench_impresion_")
+
+    plantilla = obtener_plantilla()
+    datos = [datos_factura(factura) for factura in facturas]
+    for nombre, funcion in (("plantilla en caché", lambda d: plantilla.renderizar(d)),
+                            ("analizar cada vez", lambda d: PlantillaRecibo(PLANTILLA_RECIBO).renderizar(d))):
+        inicio = time.perf_counter()
+        for _ in range(20):
+            for d in datos:
+                funcion(d)
+        print(f"{nombre:<20}{(time.perf_counter() - inicio) / (20 * cantidad) * 1e6:>8.1f} µs por recibo")
+
+    impresora = ImpresoraSimulada("127.0.0.1", puerto=0)
+    threading.Thread(target=impresora.serve_forever, daemon=True).start()
+    puerto = impresora.server_address[1]
+
+    fallos = []
+    print(f"\n{cantidad} facturas       bloqueo por factura (mediana / máx)   total")
+    for formato in ("pdf", "escpos"):
+        for nombre_destino, crear in (
+            ("spool", lambda etiqueta: DestinoSpool(os.path.join(directorio, etiqueta))),
+            ("tcp", lambda etiqueta: DestinoSocket("127.0.0.1", puerto)),
+        ):
+            for modo, funcion in (("en línea", en_linea), ("cola", en_cola)):
+                etiqueta = f"{formato}-{nombre_destino}-{modo}"
+                destino = crear(etiqueta)
+                recibidos_antes = len(impresora.trabajos)
+                tiempos, total = funcion(facturas, formato, destino)
+                if nombre_destino == "spool":
+                    recibidos = len(os.listdir(destino.directorio))
+                else:
+                    # El servidor termina de leer un poco después de que el cliente cierra
+                    limite = time.monotonic() + 5
+                    while len(impresora.trabajos) - recibidos_antes < cantidad and time.monotonic() < limite:
+                        time.sleep(0.01)
+                    recibidos = len(impresora.trabajos) - recibidos_antes
+                if recibidos != cantidad:
+                    fallos.append(f"{etiqueta}: llegaron {recibidos} de {cantidad}")
+                print(f"{formato:<7}{nombre_destino:<6}{modo:<9}"
+                      f"{statistics.median(tiempos) * 1000:>10.3f} ms {max(tiempos) * 1000:>9.3f} ms"
+                      f"{total * 1000:>14.1f} ms")
+
+    impresora.shutdown()
+    app.processEvents()
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("Todos los recibos llegaron")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark de la pantalla de inventario con 50.000 productos.
+
+Compara lo que tarda en abrir la tabla:
+
+- ``antes``: leer todos los productos y crear un ``QTableWidgetItem`` por
+  celda (lo que hacía ``InventarioView`` en cada cambio de vista).
+- ``modelo``: ``ModeloInventario`` en un ``QTableView``, que lee solo la
+  primera página.
+
+Mide también el costo de cada página siguiente al desplazarse (paginación
+por clave contra ``OFFSET``), ordenando por cada columna, y verifica con
+``EXPLAIN QUERY PLAN`` que ninguna combinación de orden y filtro recorra la
+tabla completa (sus consultas se arman según la columna, así que
+``tools.verificar_planes`` no las ve). Sale con código 1 si alguna la recorre.
+
+Uso::
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_inventario [productos]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from PySide6.QtWidgets import QApplication, QTableView, QTableWidget, QTableWidgetItem
+
+import database
+from ejecutor_bd import obtener_ejecutor
+from services.inventario import ORDENES_PRODUCTOS, PAGINA_PRODUCTOS, InventarioService, consultas_pagina
+from tools.generar_datos import generar_base_datos
+from views.modelo_inventario import ModeloInventario
+
+def abrir_antes(app, servicio):
+    tabla = QTableWidget()
+    tabla.setColumnCount(5)
+    tabla.show()
+    productos = servicio.listar_productos()
+    tabla.setRowCount(len(productos))
+    for row, producto in enumerate(productos):
+        tabla.setItem(row, 0, QTableWidgetItem(str(producto[0])))
+        tabla.setItem(row, 1, QTableWidgetItem(producto[1]))
+        tabla.setItem(row, 2, QTableWidgetItem(f"${producto[2]:.2f}"))
+        tabla.setItem(row, 3, QTableWidgetItem(str(producto[3])))
+        tabla.setItem(row, 4, QTableWidgetItem(producto[4]))
+    app.processEvents()
+    return tabla
+
+def abrir_modelo(app, servicio):
+    tabla = QTableView()
+    modelo = ModeloInventario(servicio, parent=tabla)
+    tabla.setModel(modelo)
+    tabla.show()
+    modelo.reiniciar()
+    obtener_ejecutor().esperar()
+    app.processEvents()
+    return tabla
+
+def medir(funcion, repeticiones=5):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        del resultado
+    return statistics.median(tiempos) * 1000
+
+def recorrer(servicio, orden, paginas):
+    """Tiempo medio por página leyendo ``paginas`` seguidas por clave"""
+    despues = None
+    inicio = time.perf_counter()
+    for _ in range(paginas):
+        filas = servicio.pagina_productos(orden, despues=despues)
+        despues = getattr(filas[-1], orden), filas[-1].id
+    return (time.perf_counter() - inicio) / paginas * 1000
+
+def con_offset(conexion, columna, paginas):
+    inicio = time.perf_counter()
+    for pagina in range(paginas):
+        conexion.execute(
+            f"SELECT id, nombre, precio, stock, estacion FROM productos "
+            f"ORDER BY {columna}, id LIMIT ? OFFSET ?", (PAGINA_PRODUCTOS, pagina * PAGINA_PRODUCTOS)
+        ).fetchall()
+    return (time.perf_counter() - inicio) / paginas * 1000
+
+def recorridos_completos(conexion):
+    fallos = []
+    for orden in ORDENES_PRODUCTOS:
+        for descendente in (False, True):
+            for filtro in ("", "piz"):
+                for despues in (None, (1, 1)):
+                    for sql, parametros in consultas_pagina(orden, descendente, filtro, despues):
+                        plan = [fila[3] for fila in conexion.execute(f"EXPLAIN QUERY PLAN {sql}", (*parametros, 1))]
+                        # Recorrer por rowid ya es el orden por id y se corta en LIMIT
+                        if orden != "id" and "SCAN productos" in plan:
+                            fallos.append(f"{orden} desc={descendente} filtro={filtro!r} "
+                                          f"despues={despues}: {plan}")
+    return fallos
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    app = QApplication(sys.argv)
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_inventario_"), "inventario.db")
+    generar_base_datos(ruta, informar=None, mesas=10, productos=cantidad, dias=0)
+    database.configurar_base_datos(ruta)
+    servicio = InventarioService()
+
+    print(f"{cantidad} productos")
+    print(f"abrir antes   {medir(lambda: abrir_antes(app, servicio), 3):9.1f} ms")
+    print(f"abrir modelo  {medir(lambda: abrir_modelo(app, servicio)):9.1f} ms")
+
+    conexion = database.crear_conexion(ruta)
+    paginas = cantidad // PAGINA_PRODUCTOS
+    print(f"\npágina siguiente (media de {paginas} páginas)   por clave    OFFSET")
+    for orden, columna in ORDENES_PRODUCTOS.items():
+        print(f"  {orden:<10}{recorrer(servicio, orden, paginas):26.3f} ms"
+              f"{con_offset(conexion, columna, paginas):8.3f} ms")
+
+    fallos = recorridos_completos(conexion)
+    conexion.close()
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("\nNinguna combinación de orden y filtro recorre la tabla completa")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark de la tabla de líneas de una orden.
+
+Para órdenes de 10, 60 y 300 líneas compara lo que cuesta sumar una unidad a
+una línea existente y agregar y quitar una línea nueva en:
+
+- ``antes``: reconstruir un ``QTableWidget`` completo con un ``QPushButton``
+  "Eliminar" por fila (lo que hacía ``OrdenDialog`` en cada cambio).
+- ``modelo``: ``ModeloLineasOrden`` en un ``QTableView``, que solo avisa la
+  fila afectada.
+
+Incluye el procesamiento de eventos posterior (layout y pintado) y cuenta las
+filas que el modelo notifica en cada operación.
+
+Uso::
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_lineas_orden [repeticiones]
+"""
+import statistics
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication, QHeaderView, QPushButton, QTableView, QTableWidget, QTableWidgetItem
+
+from services.ordenes import Orden
+from views.lineas_orden import DelegadoEliminar, ModeloLineasOrden
+
+ESCALAS = (10, 60, 300)
+
+def reconstruir(tabla, orden):
+    tabla.setRowCount(len(orden.lineas))
+    for fila, producto in enumerate(orden.lineas):
+        tabla.setItem(fila, 0, QTableWidgetItem(producto['nombre']))
+        tabla.setItem(fila, 1, QTableWidgetItem(f"${producto['precio']:.2f}"))
+        tabla.setItem(fila, 2, QTableWidgetItem(str(producto['cantidad'])))
+        tabla.setItem(fila, 3, QTableWidgetItem(f"${producto['subtotal']:.2f}"))
+        btn_eliminar = QPushButton("Eliminar")
+        btn_eliminar.setStyleSheet("background-color: #e74c3c; color: white;")
+        tabla.setCellWidget(fila, 4, btn_eliminar)
+
+def crear_orden(lineas):
+    orden = Orden((1, 1, "Principal", "ocupada"))
+    for i in range(1, lineas + 1):
+        orden.agregar(i, f"Producto {i}", 1.5 + i % 7, 1)
+    return orden
+
+def medir(app, funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        app.processEvents()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def contar_filas(modelo):
+    """Filas notificadas por el modelo en cada operación"""
+    contador = [0]
+    modelo.dataChanged.connect(lambda a, b: contador.__setitem__(0, contador[0] + b.row() - a.row() + 1))
+    modelo.rowsInserted.connect(lambda _, a, b: contador.__setitem__(0, contador[0] + b - a + 1))
+    modelo.rowsRemoved.connect(lambda _, a, b: contador.__setitem__(0, contador[0] + b - a + 1))
+    return contador
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'tabla':<8}{'líneas':>7}{'sumar (ms)':>12}{'agregar y quitar (ms)':>23}{'filas':>7}")
+    for lineas in ESCALAS:
+        # Antes: reconstrucción completa
+        orden = crear_orden(lineas)
+        tabla = QTableWidget()
+        tabla.setColumnCount(5)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        tabla.resize(800, 600)
+        tabla.show()
+        reconstruir(tabla, orden)
+        app.processEvents()
+
+        sumar = medir(app, lambda: (orden.agregar(1, "", 0, 1), reconstruir(tabla, orden)), repeticiones)
+
+        def nueva():
+            orden.agregar(10**6, "Nuevo", 2.0, 1)
+            reconstruir(tabla, orden)
+            orden.quitar(10**6)
+            reconstruir(tabla, orden)
+        ida_vuelta = medir(app, nueva, repeticiones)
+        print(f"{'antes':<8}{lineas:>7}{sumar:>12.2f}{ida_vuelta:>23.2f}{lineas:>7}")
+        tabla.close()
+        tabla.deleteLater()
+        app.processEvents()
+
+        # Modelo: solo la fila afectada
+        modelo = ModeloLineasOrden(crear_orden(lineas))
+        vista = QTableView()
+        vista.setModel(modelo)
+        vista.setItemDelegateForColumn(ModeloLineasOrden.COLUMNA_ELIMINAR, DelegadoEliminar(vista))
+        vista.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        vista.resize(800, 600)
+        vista.show()
+        app.processEvents()
+        filas = contar_filas(modelo)
+
+        sumar = medir(app, lambda: modelo.agregar(1, "", 0, 1), repeticiones)
+        filas_sumar = filas[0] // repeticiones
+        nueva = medir(app, lambda: modelo.agregar(10**6, "Nuevo", 2.0, 1) or modelo.quitar(modelo.fila(10**6)),
+                      repeticiones)
+        print(f"{'modelo':<8}{lineas:>7}{sumar:>12.2f}{nueva:>23.2f}{filas_sumar:>7}")
+        vista.close()
+        vista.deleteLater()
+        app.processEvents()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark del refresco del plano de mesas.
+
+Mide, para 50, 500, 800 y 2.000 mesas y en las dos vistas (cuadrícula de
+botones y plano sobre ``QGraphicsScene``), cuánto tarda ``MesasView.mostrar_mesas`` en
+reconstruir la grilla completa (lo que hacía antes en cada refresco), en
+aplicar un refresco sin cambios, uno donde cambia el estado del 5 % de las
+mesas y el refresco de una sola mesa tras confirmar una orden. Incluye el
+procesamiento de eventos posterior (layout y pintado) en cada medición.
+
+Uso::
+
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_mesas [repeticiones]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from PySide6.QtWidgets import QApplication
+
+import database
+from ejecutor_bd import obtener_ejecutor
+from iconos import obtener_iconos
+from tools.generar_datos import generar_base_datos
+from views.mesas import MesasView
+
+ESCALAS = (50, 500, 800, 2000)
+VISTAS = ("Cuadrícula", "Plano")
+
+def medir(app, funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        app.processEvents()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def alternar_estados(mesas, fraccion, rng):
+    cambiadas = set(rng.sample(range(len(mesas)), max(1, int(len(mesas) * fraccion))))
+    return [
+        m[:3] + (("libre" if m[3] == "ocupada" else "ocupada") if i in cambiadas else m[3],) + m[4:]
+        for i, m in enumerate(mesas)
+    ]
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    rng = random.Random(7)
+    directorio = tempfile.mkdtemp(prefix="bench_mesas_")
+    print(f"{'vista':<12}{'mesas':>6}{'reconstruir (ms)':>18}{'sin cambios':>14}"
+          f"{'5 % cambios':>14}{'una mesa':>12}{'PNG':>6}")
+    for indice_vista, nombre_vista in enumerate(VISTAS):
+        for cantidad in ESCALAS:
+            ruta = os.path.join(directorio, f"mesas_{cantidad}.db")
+            if not os.path.exists(ruta):
+                generar_base_datos(ruta, informar=None, mesas=cantidad, productos=50, dias=0)
+            database.configurar_base_datos(ruta)
+
+            vista = MesasView()
+            vista.resize(1200, 800)
+            vista.show()
+            vista.combo_vista.setCurrentIndex(indice_vista)
+            obtener_ejecutor().esperar()
+            app.processEvents()
+
+            if vista.vista_plano():
+                mesas = vista.servicio.listar_plano()
+            else:
+                mesas = vista.servicio.listar_mesas()
+            decodificados = obtener_iconos().decodificaciones
+            # Vaciar y volver a crear todo equivale al refresco anterior
+            reconstruir = medir(app, lambda: (vista.mostrar_mesas([]), vista.mostrar_mesas(mesas)),
+                                repeticiones)
+            sin_cambios = medir(app, lambda: vista.mostrar_mesas(mesas), repeticiones)
+
+            estados = [mesas, alternar_estados(mesas, 0.05, rng)]
+            cambios = medir(app, lambda: vista.mostrar_mesas(estados.append(estados.pop(0)) or estados[0]),
+                            repeticiones)
+
+            mesa = rng.choice(mesas)
+            variantes = [mesa[:4], mesa[:3] + ("libre" if mesa[3] == "ocupada" else "ocupada",)]
+            una = medir(app, lambda: vista.mostrar_mesa(mesa[0], variantes.append(variantes.pop(0)) or variantes[0]),
+                        repeticiones)
+
+            print(f"{nombre_vista:<12}{cantidad:>6}{reconstruir:>18.1f}{sin_cambios:>14.2f}{cambios:>14.2f}"
+                  f"{una:>12.3f}{obtener_iconos().decodificaciones - decodificados:>6}")
+            vista.close()
+            vista.deleteLater()
+            app.processEvents()
+
+if __name__ == "__main__":
+    main()
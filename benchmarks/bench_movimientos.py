@@ -0,0 +1,123 @@
+"""Benchmark del libro de movimientos de stock y sus instantáneas.
+
+Genera una historia de cambios de stock por el camino normal (``UPDATE`` de
+``productos``, anotado por los triggers) en varias etapas separadas por más
+de un segundo, tomando una instantánea cada ``MOVIMIENTOS_POR_INSTANTANEA``
+movimientos, y mide el stock en una fecha:
+
+- ``repaso``: sumar todos los movimientos del producto hasta la fecha.
+- ``instantanea``: ``MovimientosService.stock_al`` (saldo de la instantánea
+  más el tramo siguiente).
+
+Igual para el stock de todos los productos (``stock_total_al``). Verifica
+que el stock calculado al final de cada etapa coincida con el que había
+entonces, que ``verificar`` (rápido y completo) no encuentre descuadres y
+que sí encuentre uno agregado a propósito. Sale con código 1 si algo falla.
+
+Uso::
+
+    python -m benchmarks.bench_movimientos [movimientos_por_etapa]
+"""
+import datetime
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+from services.movimientos import MOVIMIENTOS_POR_INSTANTANEA, MovimientosService
+from tools.generar_datos import generar_base_datos
+
+PRODUCTOS = 200
+ETAPAS = 4
+
+def stock_actual(conexion):
+    return dict(conexion.execute("SELECT id, stock FROM productos WHERE stock != 0"))
+
+def repasar(conexion, producto_id, fecha):
+    return conexion.execute(
+        "SELECT COALESCE(SUM(cantidad), 0) FROM movimientos_stock WHERE producto_id = ? AND fecha <= ?",
+        (producto_id, fecha)
+    ).fetchone()[0]
+
+def repasar_todos(conexion, fecha):
+    filas = conexion.execute(
+        "SELECT producto_id, SUM(cantidad) FROM movimientos_stock WHERE fecha <= ? GROUP BY producto_id",
+        (fecha,)
+    )
+    return {producto_id: stock for producto_id, stock in filas if stock}
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(i)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def main():
+    por_etapa = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_movimientos_"), "movimientos.db")
+    generar_base_datos(ruta, informar=None, mesas=1, productos=PRODUCTOS, dias=0)
+    database.configurar_base_datos(ruta)
+    servicio = MovimientosService()
+    conexion = database.crear_conexion(ruta)
+    ids = [fila[0] for fila in conexion.execute("SELECT id FROM productos")]
+    rng = random.Random(7)
+
+    etapas = []
+    for _ in range(ETAPAS):
+        for _ in range(por_etapa // 1000):
+            conexion.executemany(
+                "UPDATE productos SET stock = stock + ?1 WHERE id = ?2 AND stock + ?1 >= 0",
+                [(rng.choice((-3, -2, -1, 1, 2, 5)), rng.choice(ids)) for _ in range(1000)]
+            )
+            conexion.commit()
+            servicio.tomar_instantanea(MOVIMIENTOS_POR_INSTANTANEA)
+        # La fecha se guarda con precisión de segundos
+        etapas.append((datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"), stock_actual(conexion)))
+        time.sleep(1.1)
+
+    total = conexion.execute("SELECT COUNT(*) FROM movimientos_stock").fetchone()[0]
+    instantaneas = conexion.execute("SELECT COUNT(*) FROM instantaneas_stock").fetchone()[0]
+    print(f"{total} movimientos de {PRODUCTOS} productos, {instantaneas} instantáneas")
+
+    fallos = []
+    for numero, (fecha, esperado) in enumerate(etapas, 1):
+        if servicio.stock_total_al(fecha) != esperado:
+            fallos.append(f"stock_total_al no coincide al final de la etapa {numero}")
+        for producto_id in ids[:20]:
+            if servicio.stock_al(producto_id, fecha) != esperado.get(producto_id, 0):
+                fallos.append(f"stock_al({producto_id}) no coincide al final de la etapa {numero}")
+        if repasar_todos(conexion, fecha) != esperado:
+            fallos.append(f"el repaso no coincide al final de la etapa {numero}")
+
+    fecha = etapas[ETAPAS // 2][0]
+    print(f"\nstock de un producto en {fecha}")
+    print(f"  repaso        {medir(lambda i: repasar(conexion, ids[i % PRODUCTOS], fecha), 200):8.3f} ms")
+    print(f"  instantánea   {medir(lambda i: servicio.stock_al(ids[i % PRODUCTOS], fecha), 200):8.3f} ms")
+    print("stock de todos los productos")
+    print(f"  repaso        {medir(lambda i: repasar_todos(conexion, fecha), 5):8.3f} ms")
+    print(f"  instantánea   {medir(lambda i: servicio.stock_total_al(fecha), 5):8.3f} ms")
+    print("verificar")
+    print(f"  rápido        {medir(lambda i: servicio.verificar(), 5):8.3f} ms")
+    print(f"  completo      {medir(lambda i: servicio.verificar(completo=True), 3):8.3f} ms")
+
+    if servicio.verificar() or servicio.verificar(completo=True):
+        fallos.append("verificar encontró descuadres en un libro correcto")
+    # Un movimiento que no pasó por productos tiene que aparecer como descuadre
+    conexion.execute("INSERT INTO movimientos_stock (producto_id, cantidad, motivo) VALUES (?, 1, 'ajuste')", (ids[0],))
+    conexion.commit()
+    if [d.producto_id for d in servicio.verificar()] != [ids[0]]:
+        fallos.append("verificar no encontró el movimiento agregado")
+    conexion.close()
+
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("\nEl stock calculado coincide en cada etapa y verificar detecta el descuadre agregado")
+
+if __name__ == "__main__":
+    main()
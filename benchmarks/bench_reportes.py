@@ -0,0 +1,164 @@
+"""Benchmark del tablero de ventas sobre los resúmenes.
+
+Compara el tablero de los últimos 30 días (totales, ventas por día y por
+hora, productos más vendidos y secciones):
+
+- ``detalle``: calcularlo desde ``facturas`` y ``factura_detalles`` (el
+  rango de fechas usa el índice, pero hay que leer cada línea del mes).
+- ``resúmenes``: ``ReportesService.tablero``, que lee los resúmenes.
+
+Mide también lo que agrega ``acumular_factura`` a cada factura (facturando
+órdenes por ``OrdenService`` con y sin ella) y verifica que los resúmenes
+mantenidos al facturar coincidan con los que da ``reconstruir`` y que el
+tablero coincida con el calculado desde el detalle. Sale con código 1 si
+algo no coincide.
+
+Uso::
+
+    python -m benchmarks.bench_reportes [dias] [ordenes_por_dia]
+"""
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+import services.ordenes
+from services.inventario import InventarioService
+from services.ordenes import OrdenService
+from services.reportes import PRODUCTOS_TABLERO, ReportesService
+from tools.generar_datos import generar_base_datos
+
+FACTURAS = 300
+RESUMENES = ("ventas_dia", "ventas_hora", "ventas_producto", "ventas_seccion")
+
+def desde_detalle(conexion, desde, hasta):
+    """Lo mismo que ``tablero`` leyendo facturas y líneas"""
+    inicio = datetime.datetime.combine(datetime.date.fromisoformat(desde), datetime.time())
+    fin = datetime.datetime.combine(datetime.date.fromisoformat(hasta) + datetime.timedelta(days=1), datetime.time())
+    rango = tuple(momento.astimezone(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+                  for momento in (inicio, fin))
+    resumen = conexion.execute(
+        "SELECT COUNT(*), ROUND(COALESCE(SUM(total), 0), 2) FROM facturas WHERE fecha >= ? AND fecha < ?", rango
+    ).fetchone()
+    dias = conexion.execute("""
+        SELECT date(fecha, 'localtime'), COUNT(*), ROUND(SUM(total), 2) FROM facturas
+        WHERE fecha >= ? AND fecha < ? GROUP BY 1 ORDER BY 1
+    """, rango).fetchall()
+    horas = conexion.execute("""
+        SELECT CAST(strftime('%H', fecha, 'localtime') AS INTEGER), COUNT(*), ROUND(SUM(total), 2) FROM facturas
+        WHERE fecha >= ? AND fecha < ? GROUP BY 1 ORDER BY 1
+    """, rango).fetchall()
+    productos = conexion.execute("""
+        SELECT d.producto_id, SUM(d.cantidad), ROUND(SUM(d.subtotal), 2)
+        FROM facturas f JOIN factura_detalles d ON d.factura_id = f.id
+        WHERE f.fecha >= ? AND f.fecha < ? GROUP BY d.producto_id ORDER BY 3 DESC LIMIT ?
+    """, (*rango, PRODUCTOS_TABLERO)).fetchall()
+    secciones = conexion.execute("""
+        SELECT m.seccion, COUNT(*), ROUND(SUM(f.total), 2)
+        FROM facturas f JOIN ordenes o ON o.id = f.orden_id JOIN mesas m ON m.id = o.mesa_id
+        WHERE f.fecha >= ? AND f.fecha < ? GROUP BY m.seccion ORDER BY 3 DESC
+    """, rango).fetchall()
+    return resumen, dias, horas, productos, secciones
+
+def comparable(tablero):
+    return ((tablero.resumen.facturas, tablero.resumen.total),
+            [tuple(dia) for dia in tablero.dias],
+            [tuple(hora) for hora in tablero.horas],
+            [(p.producto_id, p.cantidad, p.total) for p in tablero.productos],
+            [tuple(seccion) for seccion in tablero.secciones])
+
+def iguales(a, b):
+    """Comparar filas anidadas con los importes a menos de medio centavo"""
+    if isinstance(a, float) or isinstance(b, float):
+        return abs(a - b) < 0.005
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(iguales(x, y) for x, y in zip(a, b))
+    return a == b
+
+def resumenes(conexion):
+    return {tabla: conexion.execute(f"SELECT * FROM {tabla} ORDER BY 1, 2").fetchall() for tabla in RESUMENES}
+
+def facturar(servicio, mesas, productos, cantidad):
+    """Mediana en ms de facturar ``cantidad`` órdenes de 5 líneas"""
+    tiempos = []
+    for i in range(cantidad):
+        orden = servicio.abrir(mesas[i % len(mesas)])
+        orden.cliente = "Bench"
+        for producto_id, nombre, precio in productos[i % 50:i % 50 + 5]:
+            orden.agregar(producto_id, nombre, precio, 1 + i % 3)
+        servicio.confirmar(orden)
+        inicio = time.perf_counter()
+        servicio.facturar(orden, f"BENCH-{time.time_ns()}-{i}")
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000
+
+def main():
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else 180
+    ordenes_dia = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_reportes_"), "reportes.db")
+    conteo = generar_base_datos(ruta, informar=None, mesas=300, productos=4000, dias=dias, ordenes_dia=ordenes_dia)
+    database.configurar_base_datos(ruta)
+    reportes = ReportesService()
+    conexion = database.crear_conexion(ruta)
+    print(f"{conteo['facturas']} facturas, {conteo['factura_detalles']} líneas; "
+          f"resúmenes: {sum(len(filas) for filas in resumenes(conexion).values())} filas")
+
+    hoy = datetime.date.today()
+    desde, hasta = (hoy - datetime.timedelta(days=29)).isoformat(), hoy.isoformat()
+    tiempos_detalle, tiempos_resumenes = [], []
+    for _ in range(5):
+        inicio = time.perf_counter()
+        esperado = desde_detalle(conexion, desde, hasta)
+        tiempos_detalle.append(time.perf_counter() - inicio)
+        inicio = time.perf_counter()
+        tablero = reportes.tablero(desde, hasta)
+        tiempos_resumenes.append(time.perf_counter() - inicio)
+    print(f"\ntablero de {desde} a {hasta}")
+    print(f"  detalle     {statistics.median(tiempos_detalle) * 1000:9.1f} ms")
+    print(f"  resúmenes   {statistics.median(tiempos_resumenes) * 1000:9.1f} ms")
+
+    fallos = []
+    if not iguales(comparable(tablero), esperado):
+        fallos.append("el tablero no coincide con el calculado desde el detalle")
+
+    # Facturar con y sin acumular en los resúmenes
+    mesas = [fila for fila in conexion.execute(
+        "SELECT id, numero, seccion, estado FROM mesas WHERE estado = 'libre' ORDER BY id"
+    )]
+    conexion.execute("UPDATE productos SET stock = 1000000")
+    conexion.commit()
+    productos = InventarioService().productos_disponibles()[:60]
+    servicio = OrdenService()
+    acumular = services.ordenes.acumular_factura
+    services.ordenes.acumular_factura = lambda cursor, factura_id: None
+    try:
+        sin = facturar(servicio, mesas, productos, FACTURAS)
+    finally:
+        services.ordenes.acumular_factura = acumular
+    # Las facturas anteriores quedaron fuera: se parte de resúmenes completos
+    reportes.reconstruir()
+    con = facturar(servicio, mesas, productos, FACTURAS)
+    print(f"\nfacturar ({FACTURAS} órdenes de 5 líneas)")
+    print(f"  sin resúmenes  {sin:7.2f} ms")
+    print(f"  con resúmenes  {con:7.2f} ms  ({(con - sin) * 1000:+.0f} µs por factura)")
+
+    mantenidos = resumenes(conexion)
+    inicio = time.perf_counter()
+    reportes.reconstruir()
+    print(f"  reconstruir    {(time.perf_counter() - inicio) * 1000:7.0f} ms (todo el historial)")
+    reconstruidos = resumenes(conexion)
+    for tabla in RESUMENES:
+        if not iguales(mantenidos[tabla], reconstruidos[tabla]):
+            fallos.append(f"{tabla}: lo acumulado al facturar no coincide con la reconstrucción")
+    conexion.close()
+
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("\nEl tablero coincide con el detalle y los resúmenes acumulados con la reconstrucción")
+
+if __name__ == "__main__":
+    main()
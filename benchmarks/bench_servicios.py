@@ -0,0 +1,91 @@
+"""Benchmark sin interfaz de las rutas críticas de una orden.
+
+Ejecuta miles de ciclos abrir -> agregar líneas -> confirmar -> facturar con
+``OrdenService`` sobre una base de datos sembrada y reporta la latencia p50 y
+p99 de cada operación.
+
+Uso::
+
+    python -m benchmarks.bench_servicios [ciclos] [lineas_por_orden]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import database
+from services.inventario import InventarioService
+from services.mesas import MesasService
+from services.ordenes import OrdenService
+
+MESAS = 100
+PRODUCTOS = 500
+
+def sembrar(ruta):
+    database.inicializar_base_datos(ruta, informar=None)
+    conexion = database.crear_conexion(ruta)
+    conexion.executemany(
+        "INSERT OR IGNORE INTO mesas (numero, seccion) VALUES (?, ?)",
+        [(n, "Principal" if n % 2 else "Terraza") for n in range(1, MESAS + 1)]
+    )
+    conexion.executemany(
+        "INSERT INTO productos (nombre, precio, stock) VALUES (?, ?, ?)",
+        [(f"Producto {i}", round(random.uniform(1, 40), 2), 10_000_000)
+         for i in range(1, PRODUCTOS + 1)]
+    )
+    conexion.commit()
+    conexion.close()
+
+class Cronometro:
+    def __init__(self):
+        self.tiempos = {}
+
+    def medir(self, operacion, funcion, *args):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        self.tiempos.setdefault(operacion, []).append(time.perf_counter() - inicio)
+        return resultado
+
+    def informe(self):
+        print(f"{'operación':<16}{'n':>8}{'p50 (us)':>12}{'p99 (us)':>12}{'ops/s':>10}")
+        for operacion, tiempos in self.tiempos.items():
+            tiempos = sorted(tiempos)
+            p50 = statistics.median(tiempos) * 1e6
+            p99 = tiempos[max(int(len(tiempos) * 0.99) - 1, 0)] * 1e6
+            ops = len(tiempos) / sum(tiempos)
+            print(f"{operacion:<16}{len(tiempos):>8}{p50:>12.1f}{p99:>12.1f}{ops:>10.0f}")
+
+def main():
+    ciclos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    lineas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    random.seed(1)
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="bench_servicios_"), "bench.db")
+    sembrar(ruta)
+    database.configurar_base_datos(ruta)
+
+    mesas = MesasService().listar_mesas()
+    productos = InventarioService().productos_disponibles()
+    ordenes = OrdenService()
+    cronometro = Cronometro()
+
+    inicio = time.perf_counter()
+    for ciclo in range(ciclos):
+        mesa = random.choice(mesas)
+        orden = cronometro.medir("abrir", ordenes.abrir, mesa)
+        orden.cliente = f"Cliente {ciclo}"
+        for producto_id, nombre, precio in random.sample(productos, lineas):
+            cronometro.medir("agregar_linea", ordenes.agregar_linea,
+                             orden, producto_id, nombre, precio, random.randint(1, 3))
+        cronometro.medir("confirmar", ordenes.confirmar, orden)
+        cronometro.medir("facturar", ordenes.facturar, orden, f"BENCH-{ciclo:07d}")
+    duracion = time.perf_counter() - inicio
+
+    print(f"{ciclos} órdenes de {lineas} líneas en {duracion:.2f} s "
+          f"({ciclos / duracion:.0f} órdenes/s)\n")
+    cronometro.informe()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Prueba de concurrencia de la numeración de facturas.
+
+Varios procesos piden en total 100.000 números de factura a la misma base de
+datos, de dos maneras:
+
+- ``transacción``: cada número con ``siguiente_numero`` en su propia
+  transacción, con todos los procesos compartiendo dos cajas (el peor caso:
+  varias terminales sobre el mismo contador).
+- ``bloques``: cada proceso con su caja y un ``NumeradorFacturas`` que
+  reserva bloques; el 1 % de los números se devuelve (factura fallida) y se
+  vuelve a entregar.
+
+Verifica que no haya números repetidos, que cada secuencia sea 1..n sin
+huecos, que cada proceso haya recibido números crecientes de cada caja y
+que ``secuencias_factura`` termine en n. Sale con código 1 si algo falla.
+
+Uso::
+
+    python -m benchmarks.estres_numeracion [procesos] [numeros]
+"""
+import collections
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+from services.numeracion import NumeradorFacturas, fecha_hoy, siguiente_numero
+
+def por_transaccion(ruta, proceso, cantidad, resultados):
+    database.configurar_base_datos(ruta, tamano=1)
+    caja = f"T{proceso % 2}"
+    numeros = []
+    with database.obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        for _ in range(cantidad):
+            numeros.append(siguiente_numero(cursor, caja))
+            conexion.commit()
+    resultados.put(numeros)
+
+def por_bloques(ruta, proceso, cantidad, resultados):
+    database.configurar_base_datos(ruta, tamano=1)
+    rng = random.Random(proceso)
+    numerador = NumeradorFacturas(caja=f"B{proceso:02d}")
+    numeros = []
+    while len(numeros) < cantidad:
+        numero = numerador.tomar()
+        if rng.random() < 0.01:
+            numerador.devolver(numero)
+        else:
+            numeros.append(numero)
+    numerador.cerrar()
+    resultados.put(numeros)
+
+def ejecutar(ruta, funcion, procesos, total):
+    resultados = multiprocessing.Queue()
+    trabajadores = [multiprocessing.Process(target=funcion, args=(ruta, i, total // procesos, resultados))
+                    for i in range(procesos)]
+    inicio = time.perf_counter()
+    for trabajador in trabajadores:
+        trabajador.start()
+    listas = [resultados.get() for _ in trabajadores]
+    for trabajador in trabajadores:
+        trabajador.join()
+    return listas, time.perf_counter() - inicio
+
+def verificar(ruta, listas):
+    fallos = []
+    todos = [numero for lista in listas for numero in lista]
+    repetidos = [n for n, veces in collections.Counter(todos).items() if veces > 1]
+    if repetidos:
+        fallos.append(f"{len(repetidos)} números repetidos, p. ej. {repetidos[:3]}")
+
+    por_caja = collections.defaultdict(list)
+    for lista in listas:
+        ultimos = {}
+        for numero in lista:
+            _, fecha, caja, secuencia = numero.split("-")
+            secuencia = int(secuencia)
+            if secuencia <= ultimos.get(caja, 0):
+                fallos.append(f"{numero} no es mayor que el anterior del mismo proceso")
+            ultimos[caja] = secuencia
+            por_caja[caja].append(secuencia)
+
+    conexion = database.crear_conexion(ruta)
+    guardados = dict(conexion.execute(
+        "SELECT caja, ultimo FROM secuencias_factura WHERE fecha = ?", (fecha_hoy(),)
+    ).fetchall())
+    conexion.close()
+    for caja, secuencias in por_caja.items():
+        if sorted(secuencias) != list(range(1, len(secuencias) + 1)):
+            fallos.append(f"caja {caja}: la secuencia tiene huecos")
+        if guardados.get(caja) != len(secuencias):
+            fallos.append(f"caja {caja}: la base de datos quedó en {guardados.get(caja)}, se usaron {len(secuencias)}")
+    return len(todos), len(por_caja), fallos
+
+def main():
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    directorio = tempfile.mkdtemp(prefix="estres_numeracion_")
+
+    fallidos = False
+    for nombre, funcion in (("transacción", por_transaccion), ("bloques", por_bloques)):
+        ruta = os.path.join(directorio, f"{funcion.__name__}.db")
+        database.inicializar_base_datos(ruta, informar=None)
+        listas, duracion = ejecutar(ruta, funcion, procesos, total)
+        cantidad, cajas, fallos = verificar(ruta, listas)
+        print(f"{nombre:<12} {procesos} procesos, {cajas} cajas: {cantidad} números en {duracion:.2f} s "
+              f"({cantidad / duracion:.0f}/s) - {'OK' if not fallos else 'FALLÓ'}")
+        for fallo in fallos[:10]:
+            print(f"  {fallo}")
+        fallidos = fallidos or bool(fallos)
+
+    if fallidos:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Prueba de estrés de las reservas de stock con varias terminales.
+
+Lanza 20 procesos (terminales) contra la misma base de datos, cada uno con su
+mesa, que durante unos segundos abren órdenes, agregan líneas de un puñado de
+productos con poco stock (reservando), y luego las confirman y facturan, las
+abandonan liberando las reservas o las abandonan sin liberar (las reservas
+vencen solas). Al final verifica que:
+
+- ningún producto quedó con stock negativo,
+- lo descontado del stock de cada producto es exactamente lo que figura en
+  las órdenes (no se vendió nada de más ni se perdieron unidades),
+- las reservas vigentes no superan el stock de ningún producto,
+
+e informa las operaciones por segundo bajo contención. Sale con código 1 si
+alguna verificación falla.
+
+Uso::
+
+    python -m benchmarks.estres_reservas [terminales] [segundos]
+"""
+import collections
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+import database
+from services.mesas import MesasService
+from services.ordenes import OrdenService, StockInsuficiente
+from tools.generar_datos import generar_base_datos
+
+PRODUCTOS = 12
+STOCK_INICIAL = 2000
+DURACION_RESERVA = 2  # segundos, para que las reservas abandonadas venzan durante la prueba
+
+def terminal(ruta, numero, segundos, resultados):
+    database.configurar_base_datos(ruta, tamano=1)
+    rng = random.Random(numero)
+    servicio = OrdenService()
+    servicio.reservas.duracion = DURACION_RESERVA
+    mesa = MesasService().listar_mesas()[numero]
+    productos = database.crear_conexion(ruta).execute("SELECT id, nombre, precio FROM productos").fetchall()
+    contador = collections.Counter()
+
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        try:
+            orden = servicio.abrir(mesa)
+            orden.cliente = f"Terminal {numero}"
+            for _ in range(rng.randint(1, 4)):
+                producto_id, nombre, precio = rng.choice(productos)
+                try:
+                    servicio.agregar_linea(orden, producto_id, nombre, precio, rng.randint(1, 3))
+                    contador["reservas"] += 1
+                except StockInsuficiente:
+                    contador["sin stock"] += 1
+
+            accion = rng.random()
+            if not any(orden.cambios_stock().values()):
+                contador["sin líneas"] += 1
+            elif accion < 0.1:
+                contador["abandonadas"] += 1
+            elif accion < 0.25:
+                servicio.liberar_reservas(orden)
+                contador["liberadas"] += 1
+            else:
+                try:
+                    servicio.confirmar(orden)
+                    servicio.facturar(orden, f"E{numero:02d}-{contador['confirmadas']:06d}")
+                    contador["confirmadas"] += 1
+                except StockInsuficiente:
+                    servicio.liberar_reservas(orden)
+                    contador["confirmación rechazada"] += 1
+        except database.Error as e:
+            contador[f"error: {e}"] += 1
+    resultados.put(dict(contador))
+
+def estado(conexion):
+    stock = dict(conexion.execute("SELECT id, stock FROM productos").fetchall())
+    vendido = dict(conexion.execute(
+        "SELECT producto_id, SUM(cantidad) FROM orden_detalles GROUP BY producto_id"
+    ).fetchall())
+    return stock, vendido
+
+def main():
+    terminales = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    segundos = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix="estres_reservas_"), "estres.db")
+    generar_base_datos(ruta, informar=None, mesas=terminales, productos=PRODUCTOS, dias=0)
+    conexion = database.crear_conexion(ruta)
+    conexion.execute("UPDATE productos SET stock = ?", (STOCK_INICIAL,))
+    conexion.commit()
+    stock_inicial, vendido_inicial = estado(conexion)
+
+    resultados = multiprocessing.Queue()
+    procesos = [multiprocessing.Process(target=terminal, args=(ruta, i, segundos, resultados))
+                for i in range(terminales)]
+    inicio = time.perf_counter()
+    for proceso in procesos:
+        proceso.start()
+    totales = collections.Counter()
+    for _ in procesos:
+        totales.update(resultados.get())
+    for proceso in procesos:
+        proceso.join()
+    duracion = time.perf_counter() - inicio
+
+    stock, vendido = estado(conexion)
+    reservado = dict(conexion.execute(
+        "SELECT producto_id, SUM(cantidad) FROM reservas_stock WHERE expira > ? GROUP BY producto_id",
+        (time.time(),)
+    ).fetchall())
+    conexion.close()
+
+    print(f"{terminales} terminales, {duracion:.1f} s")
+    for clave, valor in sorted(totales.items()):
+        print(f"  {clave:<26}{valor:>8}{valor / duracion:>10.1f}/s")
+
+    fallos = []
+    for producto_id, inicial in stock_inicial.items():
+        descontado = inicial - stock[producto_id]
+        en_ordenes = vendido.get(producto_id, 0) - vendido_inicial.get(producto_id, 0)
+        if stock[producto_id] < 0:
+            fallos.append(f"producto {producto_id}: stock negativo ({stock[producto_id]})")
+        if descontado != en_ordenes:
+            fallos.append(f"producto {producto_id}: se descontaron {descontado} y se vendieron {en_ordenes}")
+        if reservado.get(producto_id, 0) > stock[producto_id]:
+            fallos.append(f"producto {producto_id}: {reservado[producto_id]} reservados con stock {stock[producto_id]}")
+    vendidas = sum(stock_inicial.values()) - sum(stock.values())
+    print(f"  unidades vendidas {vendidas} de {sum(stock_inicial.values())}, "
+          f"reservadas al final {sum(reservado.values())}")
+
+    if fallos:
+        print("\n".join(fallos))
+        sys.exit(1)
+    print("Sin sobreventa")
+
+if __name__ == "__main__":
+    main()
@@ -1,136 +1,147 @@
 import sqlite3
 from sqlite3 import Error
 import datetime
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from migraciones import VERSION_ESQUEMA, aplicar_migraciones, version_actual
 
-def crear_conexion():
+RUTA_BD = os.environ.get("RESTAURANTE_BD", "restaurante.db")
+TAMANO_POOL = 4
+
+# Configuración aplicada una sola vez a cada conexión nueva
+PRAGMAS_CONEXION = [
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",      # 16 MB de caché de páginas
+    "PRAGMA mmap_size = 134217728",    # 128 MB mapeados en memoria
+    "PRAGMA busy_timeout = 5000",      # Esperar 5 s si otra terminal escribe
+    "PRAGMA temp_store = MEMORY",
+]
+
+def configurar_conexion(conexion):
+    """Aplicar los PRAGMAs de rendimiento a una conexión"""
+    for pragma in PRAGMAS_CONEXION:
+        conexion.execute(pragma)
+    return conexion
+
+def crear_conexion(ruta=None):
     """Crear conexión a la base de datos"""
     try:
-        conexion = sqlite3.connect('restaurante.db')
-        return conexion
+        conexion = sqlite3.connect(ruta or RUTA_BD)
+        return configurar_conexion(conexion)
     except Error as e:
         print(e)
     return None
 
-def inicializar_base_datos():
-    """Crear tablas necesarias y actualizar esquema si es necesario"""
-    comandos = [
-        """
-        CREATE TABLE IF NOT EXISTS usuarios (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT NOT NULL,
-            usuario TEXT UNIQUE NOT NULL,
-            clave TEXT NOT NULL,
-            rol TEXT NOT NULL
-        )
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS mesas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            numero INTEGER UNIQUE NOT NULL,
-            estado TEXT NOT NULL DEFAULT 'libre',
-            seccion TEXT NOT NULL DEFAULT 'Principal'
-        )
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS productos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nombre TEXT UNIQUE NOT NULL,
-            precio REAL NOT NULL,
-            stock INTEGER NOT NULL
-        )
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS ordenes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            mesa_id INTEGER NOT NULL UNIQUE,  -- CAMBIO IMPORTANTE: UNIQUE
-            cliente_nombre TEXT NOT NULL,
-            estado TEXT NOT NULL DEFAULT 'abierta',
-            total REAL DEFAULT 0,
-            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (mesa_id) REFERENCES mesas (id)
-        )
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS orden_detalles (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            orden_id INTEGER NOT NULL,
-            producto_id INTEGER NOT NULL,
-            cantidad INTEGER NOT NULL,
-            subtotal REAL NOT NULL,
-            FOREIGN KEY (orden_id) REFERENCES ordenes (id),
-            FOREIGN KEY (producto_id) REFERENCES productos (id)
-        )
-        """,
-        """
-        CREATE TABLE IF NOT EXISTS facturas (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            orden_id INTEGER NOT NULL,
-            numero_factura TEXT UNIQUE NOT NULL,
-            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            cliente_nombre TEXT NOT NULL,
-            total REAL NOT NULL,
-            FOREIGN KEY (orden_id) REFERENCES ordenes (id))
-        """
-    ]
-    
-    # Comandos para actualizar tablas existentes (si es necesario)
-    actualizaciones = [
-        "ALTER TABLE mesas ADD COLUMN seccion TEXT DEFAULT 'Principal';",
-        "CREATE TRIGGER IF NOT EXISTS prevent_negative_stock "
-        "BEFORE UPDATE ON productos "
-        "FOR EACH ROW "
-        "WHEN NEW.stock < 0 "
-        "BEGIN "
-        "   SELECT RAISE(ABORT, 'Stock no puede ser negativo'); "
-        "END;",
-        # Nueva restricción para ordenes
-        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mesa_orden_abierta "
-        "ON ordenes(mesa_id) WHERE estado = 'abierta';"
-    ]
-    
-    conexion = crear_conexion()
-    if conexion is not None:
+class PoolConexiones:
+    """Pool pequeño de conexiones de larga duración a la base de datos.
+
+    Las conexiones se abren bajo demanda hasta ``tamano`` y se reutilizan;
+    cada una se configura una sola vez con ``PRAGMAS_CONEXION``.
+    """
+
+    def __init__(self, ruta=None, tamano=TAMANO_POOL, espera=30):
+        self.ruta = ruta or RUTA_BD
+        self.tamano = tamano
+        self.espera = espera
+        self._libres = queue.LifoQueue()
+        self._abiertas = []
+        self._lock = threading.Lock()
+
+    def _abrir(self):
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        return configurar_conexion(conexion)
+
+    def adquirir(self):
+        """Tomar una conexión libre, abriendo una nueva si el pool no está lleno"""
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._abiertas) < self.tamano:
+                conexion = self._abrir()
+                self._abiertas.append(conexion)
+                return conexion
+
+        try:
+            return self._libres.get(timeout=self.espera)
+        except queue.Empty:
+            raise sqlite3.OperationalError("No hay conexiones libres en el pool")
+
+    def liberar(self, conexion):
+        """Devolver una conexión al pool descartando transacciones pendientes"""
+        if conexion.in_transaction:
+            conexion.rollback()
+        self._libres.put(conexion)
+
+    @contextmanager
+    def conexion(self):
+        conexion = self.adquirir()
         try:
-            cursor = conexion.cursor()
-            
-            # Ejecutar comandos para crear tablas
-            for comando in comandos:
-                try:
-                    cursor.execute(comando)
-                except sqlite3.OperationalError as e:
-                    print(f"Error al ejecutar comando: {e}")
-            
-            # Intentar agregar la nueva columna si no existe
-            for actualizacion in actualizaciones:
-                try:
-                    cursor.execute(actualizacion)
-                except sqlite3.OperationalError:
-                    pass  # La columna ya existe, no hay problema
-            
+            yield conexion
+        except BaseException:
+            conexion.rollback()
+            raise
+        finally:
+            self.liberar(conexion)
+
+    def cerrar(self):
+        with self._lock:
+            for conexion in self._abiertas:
+                conexion.close()
+            self._abiertas = []
+            self._libres = queue.LifoQueue()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def obtener_pool():
+    """Pool compartido por toda la aplicación"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexiones()
+    return _pool
+
+def configurar_base_datos(ruta, tamano=TAMANO_POOL):
+    """Apuntar la aplicación a otra base de datos (pruebas, benchmarks)"""
+    global RUTA_BD, _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar()
+        RUTA_BD = ruta
+        _pool = PoolConexiones(ruta, tamano)
+    return _pool
+
+def obtener_conexion():
+    """Context manager con una conexión del pool compartido.
+
+    Uso::
+
+        with obtener_conexion() as conexion:
+            conexion.execute(...)
             conexion.commit()
-            
-            # Crear usuario admin inicial
-            cursor.execute("SELECT COUNT(*) FROM usuarios")
-            if cursor.fetchone()[0] == 0:
-                cursor.execute(
-                    "INSERT INTO usuarios (nombre, usuario, clave, rol) VALUES (?, ?, ?, ?)",
-                    ("Administrador", "admin", "admin", "admin")
-                )
-                conexion.commit()
-                
-                # Crear 10 mesas iniciales (5 en Principal, 5 en Terraza)
-                for i in range(1, 11):
-                    seccion = "Principal" if i <= 5 else "Terraza"
-                    cursor.execute(
-                        "INSERT INTO mesas (numero, seccion) VALUES (?, ?)",
-                        (i, seccion)
-                    )
-                conexion.commit()
-                
+
+    Si el bloque termina sin ``commit`` la transacción se descarta.
+    """
+    return obtener_pool().conexion()
+
+def inicializar_base_datos(ruta=None, informar=print):
+    """Aplicar las migraciones pendientes del esquema.
+
+    Con el esquema al día solo se compara ``PRAGMA user_version``.
+    """
+    conexion = crear_conexion(ruta)
+    if conexion is not None:
+        try:
+            if version_actual(conexion) < VERSION_ESQUEMA:
+                aplicar_migraciones(conexion, informar=informar)
         except Error as e:
             print(f"Error inicializando BD: {e}")
         finally:
             conexion.close()
-
-# Inicializar BD al importar
-inicializar_base_datos()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""Ejecución de consultas fuera del hilo de la interfaz.
+
+Las vistas envían funciones que trabajan con la base de datos (usando
+``database.obtener_conexion``) y reciben el resultado en el hilo de la
+interfaz a través de señales de Qt::
+
+    ejecutor = obtener_ejecutor()
+    ejecutor.enviar(consultar_mesas, seccion,
+                    al_terminar=self.mostrar_mesas, clave="mesas")
+
+Un trabajo enviado con la misma ``clave`` que otro todavía pendiente lo
+reemplaza: el anterior no se ejecuta si aún no empezó y, si ya terminó, su
+resultado se descarta.
+"""
+import itertools
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+HILOS_BD = 2
+
+class _Senales(QObject):
+    terminado = Signal(int, object)
+    fallido = Signal(int, object)
+
+class _Trabajo(QRunnable):
+    def __init__(self, ejecutor, numero, funcion, args, kwargs):
+        super().__init__()
+        self.ejecutor = ejecutor
+        self.numero = numero
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        # Trabajo reemplazado o cancelado antes de empezar
+        if not self.ejecutor.vigente(self.numero):
+            return
+        try:
+            resultado = self.funcion(*self.args, **self.kwargs)
+        except Exception as e:
+            self.ejecutor._senales.fallido.emit(self.numero, e)
+        else:
+            self.ejecutor._senales.terminado.emit(self.numero, resultado)
+
+class EjecutorBD(QObject):
+    """Pool de hilos que ejecuta trabajos de base de datos"""
+
+    def __init__(self, hilos=HILOS_BD, parent=None):
+        super().__init__(parent)
+        self._hilos = QThreadPool(self)
+        self._hilos.setMaxThreadCount(hilos)
+        self._senales = _Senales(self)
+        self._senales.terminado.connect(self._al_terminar)
+        self._senales.fallido.connect(self._al_fallar)
+        self._contador = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pendientes = {}   # numero -> (clave, al_terminar, al_fallar)
+        self._ultimos = {}      # clave -> numero del trabajo más reciente
+
+    def enviar(self, funcion, *args, al_terminar=None, al_fallar=None,
+               clave=None, **kwargs):
+        """Encolar ``funcion(*args, **kwargs)``; devuelve el número del trabajo"""
+        numero = next(self._contador)
+        with self._lock:
+            if clave is not None:
+                anterior = self._ultimos.get(clave)
+                if anterior is not None:
+                    self._pendientes.pop(anterior, None)
+                self._ultimos[clave] = numero
+            self._pendientes[numero] = (clave, al_terminar, al_fallar)
+        self._hilos.start(_Trabajo(self, numero, funcion, args, kwargs))
+        return numero
+
+    def cancelar(self, numero):
+        """Descartar un trabajo: no se ejecuta si no empezó y no se notifica"""
+        with self._lock:
+            entrada = self._pendientes.pop(numero, None)
+            if entrada and self._ultimos.get(entrada[0]) == numero:
+                del self._ultimos[entrada[0]]
+
+    def vigente(self, numero):
+        with self._lock:
+            return numero in self._pendientes
+
+    def esperar(self, milisegundos=-1):
+        """Bloquear hasta que terminen los trabajos en curso (cierre, pruebas)"""
+        return self._hilos.waitForDone(milisegundos)
+
+    def _retirar(self, numero):
+        with self._lock:
+            entrada = self._pendientes.pop(numero, None)
+            if entrada and self._ultimos.get(entrada[0]) == numero:
+                del self._ultimos[entrada[0]]
+            return entrada
+
+    def _al_terminar(self, numero, resultado):
+        entrada = self._retirar(numero)
+        if entrada and entrada[1]:
+            entrada[1](resultado)
+
+    def _al_fallar(self, numero, error):
+        entrada = self._retirar(numero)
+        if entrada is None:
+            return
+        if entrada[2]:
+            entrada[2](error)
+        else:
+            print(f"Error en consulta de fondo: {error}")
+
+_ejecutor = None
+
+def obtener_ejecutor():
+    """Ejecutor compartido por toda la aplicación (requiere QApplication)"""
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = EjecutorBD()
+    return _ejecutor
@@ -0,0 +1,114 @@
+"""Caché de imágenes compartida por toda la aplicación.
+
+Cada archivo se decodifica una sola vez y cada combinación de tamaño y
+densidad de píxeles (DPI) se escala una sola vez; los botones y etiquetas
+reciben el mismo ``QPixmap``/``QIcon`` en lugar de leer el PNG de nuevo::
+
+    boton.setIcon(obtener_iconos().icono(ruta, 120, 120, boton.devicePixelRatioF()))
+
+Un ``QFileSystemWatcher`` vigila los archivos cargados y la carpeta de
+recursos: si una imagen cambia en disco se descarta y se vuelve a cargar en
+el siguiente pedido.
+"""
+import os
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QSize, Qt
+from PySide6.QtGui import QIcon, QPainter, QPixmap
+
+RUTA_ICONOS = "resources/icons"
+
+ICONOS_MESA = {
+    "ocupada": f"{RUTA_ICONOS}/ocupada.png",
+    "libre": f"{RUTA_ICONOS}/libre.png",
+}
+
+class CacheIconos(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._originales = {}   # ruta -> QPixmap decodificado (nulo si no existe)
+        self._pixmaps = {}      # (ruta, ancho, alto, dpr, componer) -> QPixmap escalado
+        self._iconos = {}       # misma clave -> QIcon
+        self.decodificaciones = 0
+        self._vigilante = QFileSystemWatcher(self)
+        self._vigilante.fileChanged.connect(self.invalidar)
+        self._vigilante.directoryChanged.connect(lambda _: self.invalidar())
+
+    def _original(self, ruta):
+        pixmap = self._originales.get(ruta)
+        if pixmap is None:
+            if os.path.exists(ruta):
+                pixmap = QPixmap(ruta)
+                self.decodificaciones += 1
+                if ruta not in self._vigilante.files():
+                    self._vigilante.addPath(ruta)
+            else:
+                pixmap = QPixmap()
+            carpeta = os.path.dirname(ruta) or "."
+            if os.path.isdir(carpeta) and carpeta not in self._vigilante.directories():
+                self._vigilante.addPath(carpeta)
+            self._originales[ruta] = pixmap
+        return pixmap
+
+    def pixmap(self, ruta, ancho, alto, dpr=1.0, componer=False):
+        """Imagen escalada a ``ancho`` x ``alto`` lógicos; nula si no existe.
+
+        ``componer`` pinta la imagen sobre un lienzo transparente antes de
+        escalar (como hacían los botones de mesa).
+        """
+        clave = (ruta, ancho, alto, dpr, componer)
+        pixmap = self._pixmaps.get(clave)
+        if pixmap is not None:
+            return pixmap
+
+        original = self._original(ruta)
+        if original.isNull():
+            pixmap = original
+        else:
+            if componer:
+                lienzo = QPixmap(original.size())
+                lienzo.fill(Qt.transparent)
+                painter = QPainter(lienzo)
+                painter.drawPixmap(0, 0, original)
+                painter.end()
+                original = lienzo
+
+            # Escalar manteniendo relación de aspecto, a la densidad de la pantalla
+            pixmap = original.scaled(
+                QSize(round(ancho * dpr), round(alto * dpr)),
+                Qt.KeepAspectRatio,
+                Qt.SmoothTransformation
+            )
+            pixmap.setDevicePixelRatio(dpr)
+        self._pixmaps[clave] = pixmap
+        return pixmap
+
+    def icono(self, ruta, ancho, alto, dpr=1.0, componer=False):
+        """``QIcon`` compartido; vacío si la imagen no existe"""
+        clave = (ruta, ancho, alto, dpr, componer)
+        icono = self._iconos.get(clave)
+        if icono is None:
+            pixmap = self.pixmap(ruta, ancho, alto, dpr, componer)
+            icono = QIcon() if pixmap.isNull() else QIcon(pixmap)
+            self._iconos[clave] = icono
+        return icono
+
+    def invalidar(self, ruta=None):
+        """Descartar una imagen (o todas) para que se vuelva a leer de disco"""
+        if ruta is None:
+            self._originales.clear()
+            self._pixmaps.clear()
+            self._iconos.clear()
+            return
+        self._originales.pop(ruta, None)
+        for cache in (self._pixmaps, self._iconos):
+            for clave in [c for c in cache if c[0] == ruta]:
+                del cache[clave]
+
+_cache = None
+
+def obtener_iconos():
+    """Caché compartida por toda la aplicación (requiere QApplication)"""
+    global _cache
+    if _cache is None:
+        _cache = CacheIconos()
+    return _cache
@@ -0,0 +1,224 @@
+"""Impresión de recibos fuera del hilo de la interfaz.
+
+Las vistas encolan la factura ya guardada y siguen trabajando; un hilo propio
+arma el recibo con la plantilla en caché (``services.recibos``), lo convierte
+a PDF (``QPdfWriter``), a bytes ESC/POS o a texto, y lo envía al destino::
+
+    obtener_impresion().imprimir(factura)
+
+El destino se elige con ``RESTAURANTE_IMPRESORA``: ``spool:<carpeta>`` deja
+un archivo por recibo en la carpeta (lo escribe con otro nombre y lo renombra
+al terminar, así quien vigila la carpeta nunca ve un archivo a medias) y
+``tcp:<host>:<puerto>`` lo manda a una impresora de red (puerto 9100; para
+probar sin impresora está ``tools/impresora_simulada.py``). Los recibos se
+imprimen de a uno y en orden; una ráfaga de facturas al cierre solo alarga la
+cola.
+"""
+import atexit
+import os
+import queue
+import socket
+import threading
+import time
+
+from PySide6.QtCore import QBuffer, QIODevice, QMarginsF, QObject, QRectF, QSizeF, Qt, Signal
+from PySide6.QtGui import QFont, QFontMetricsF, QPageLayout, QPageSize, QPainter, QPdfWriter
+
+from services.recibos import ANCHO_RECIBO, a_escpos, a_texto, datos_factura, obtener_plantilla
+
+IMPRESORA = os.environ.get("RESTAURANTE_IMPRESORA", "spool:recibos")
+# pdf, escpos o texto
+FORMATO_RECIBO = os.environ.get("RESTAURANTE_FORMATO_RECIBO", "pdf")
+PLANTILLA = os.environ.get("RESTAURANTE_PLANTILLA_RECIBO") or None
+
+EXTENSIONES = {"pdf": "pdf", "escpos": "bin", "texto": "txt"}
+REINTENTOS = 3
+ESPERA_REINTENTO = 1.0  # segundos, se duplica en cada intento
+
+# Papel térmico de 80 mm con 4 mm de margen
+ANCHO_PAPEL_MM = 80
+MARGEN_MM = 4
+RESOLUCION_PDF = 203
+
+def renderizar_pdf(renglones, ancho=ANCHO_RECIBO):
+    """Bytes de un PDF del alto justo del recibo, con letra de ancho fijo"""
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    escritor = QPdfWriter(buffer)
+    escritor.setResolution(RESOLUCION_PDF)
+    escritor.setCreator("Restaurante")
+
+    fuente = QFont("Monospace")
+    fuente.setStyleHint(QFont.TypeWriter)
+    fuente.setFixedPitch(True)
+    puntos_mm = RESOLUCION_PDF / 25.4
+    util = (ANCHO_PAPEL_MM - 2 * MARGEN_MM) * puntos_mm
+    # Tamaño con el que ``ancho`` caracteres ocupan el ancho útil del papel
+    fuente.setPixelSize(100)
+    fuente.setPixelSize(max(1, int(100 * util / (QFontMetricsF(fuente).horizontalAdvance("M") * ancho))))
+    alto_renglon = QFontMetricsF(fuente).height()
+    alto = sum(2 * alto_renglon if estilo == "titulo" else alto_renglon for _, estilo in renglones)
+    alto_mm = alto / puntos_mm + 2 * MARGEN_MM
+
+    escritor.setPageLayout(QPageLayout(
+        QPageSize(QSizeF(ANCHO_PAPEL_MM, alto_mm), QPageSize.Millimeter),
+        QPageLayout.Portrait, QMarginsF(MARGEN_MM, MARGEN_MM, MARGEN_MM, MARGEN_MM), QPageLayout.Millimeter
+    ))
+    alinear = {"izquierda": Qt.AlignLeft, "centro": Qt.AlignHCenter, "titulo": Qt.AlignHCenter, "derecha": Qt.AlignRight}
+    titulo = QFont(fuente)
+    titulo.setBold(True)
+    titulo.setPixelSize(fuente.pixelSize() * 2)
+
+    pintor = QPainter(escritor)
+    y = 0.0
+    for texto, estilo in renglones:
+        alto_texto = 2 * alto_renglon if estilo == "titulo" else alto_renglon
+        pintor.setFont(titulo if estilo == "titulo" else fuente)
+        pintor.drawText(QRectF(0, y, util, alto_texto), alinear[estilo] | Qt.AlignVCenter, texto)
+        y += alto_texto
+    pintor.end()
+    return bytes(buffer.data())
+
+def renderizar(factura, formato=FORMATO_RECIBO, plantilla=None):
+    """Bytes del recibo de ``factura`` en ``formato``"""
+    plantilla = plantilla or obtener_plantilla(PLANTILLA)
+    renglones = plantilla.renderizar(datos_factura(factura))
+    if formato == "pdf":
+        return renderizar_pdf(renglones, plantilla.ancho)
+    if formato == "escpos":
+        return a_escpos(renglones)
+    if formato == "texto":
+        return a_texto(renglones, plantilla.ancho).encode("utf-8")
+    raise ValueError(f"Formato de recibo desconocido: {formato}")
+
+class DestinoSpool:
+    """Carpeta donde queda un archivo por recibo"""
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+
+    def enviar(self, nombre, datos):
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = os.path.join(self.directorio, nombre)
+        temporal = ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(datos)
+        os.replace(temporal, ruta)
+        return ruta
+
+    def __str__(self):
+        return f"spool:{self.directorio}"
+
+class DestinoSocket:
+    """Impresora de red que recibe los bytes en crudo (puerto 9100)"""
+
+    def __init__(self, host, puerto=9100, espera=10):
+        self.host = host
+        self.puerto = puerto
+        self.espera = espera
+
+    def enviar(self, nombre, datos):
+        with socket.create_connection((self.host, self.puerto), timeout=self.espera) as conexion:
+            conexion.sendall(datos)
+        return f"{self.host}:{self.puerto}"
+
+    def __str__(self):
+        return f"tcp:{self.host}:{self.puerto}"
+
+def crear_destino(especificacion=IMPRESORA):
+    tipo, _, resto = especificacion.partition(":")
+    if tipo == "spool":
+        return DestinoSpool(resto or "recibos")
+    if tipo == "tcp":
+        host, _, puerto = resto.rpartition(":")
+        return DestinoSocket(host or "localhost", int(puerto or 9100))
+    raise ValueError(f"Impresora desconocida: {especificacion}")
+
+class ColaImpresion(QObject):
+    """Cola de recibos que un único hilo renderiza y envía en orden"""
+
+    impreso = Signal(str, str)  # numero de factura, destino
+    fallido = Signal(str, str)  # numero de factura, error
+
+    def __init__(self, destino=None, formato=FORMATO_RECIBO, plantilla=None, parent=None):
+        super().__init__(parent)
+        self.destino = destino or crear_destino()
+        self.formato = formato
+        self.plantilla = plantilla
+        self._cola = queue.Queue()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+    def imprimir(self, factura, formato=None):
+        """Encolar el recibo de ``factura``; vuelve de inmediato"""
+        with self._lock:
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._trabajar, name="impresion", daemon=True)
+                self._hilo.start()
+        self._cola.put((factura, formato or self.formato))
+
+    @property
+    def pendientes(self):
+        return self._cola.unfinished_tasks
+
+    def esperar(self):
+        """Bloquear hasta que se impriman los recibos encolados (cierre, pruebas)"""
+        self._cola.join()
+
+    def detener(self):
+        with self._lock:
+            hilo, self._hilo = self._hilo, None
+        if hilo is not None:
+            self._cola.put(None)
+            hilo.join()
+
+    def _trabajar(self):
+        while True:
+            trabajo = self._cola.get()
+            try:
+                if trabajo is None:
+                    return
+                self._imprimir(*trabajo)
+            finally:
+                self._cola.task_done()
+
+    def _imprimir(self, factura, formato):
+        try:
+            datos = renderizar(factura, formato, self.plantilla)
+        except Exception as e:
+            self.fallido.emit(factura.numero, str(e))
+            return
+        nombre = f"{factura.numero}.{EXTENSIONES.get(formato, formato)}"
+        espera = ESPERA_REINTENTO
+        for intento in range(REINTENTOS):
+            try:
+                destino = self.destino.enviar(nombre, datos)
+            except OSError as e:
+                if intento == REINTENTOS - 1:
+                    self.fallido.emit(factura.numero, str(e))
+                    return
+                time.sleep(espera)
+                espera *= 2
+            else:
+                self.impreso.emit(factura.numero, destino)
+                return
+
+_impresion = None
+
+def obtener_impresion():
+    """Cola de impresión compartida por toda la aplicación (requiere QApplication)"""
+    global _impresion
+    if _impresion is None:
+        _impresion = ColaImpresion()
+        _impresion.fallido.connect(
+            lambda numero, error: print(f"No se pudo imprimir la factura {numero}: {error}")
+        )
+        # También al salir sin pasar por el ciclo de eventos: el hilo no
+        # puede seguir dibujando mientras Qt se destruye
+        atexit.register(terminar_impresion)
+    return _impresion
+
+def terminar_impresion():
+    """Imprimir lo que quedó en cola y detener el hilo (al cerrar la aplicación)"""
+    if _impresion is not None:
+        _impresion.detener()
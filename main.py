@@ -1,13 +1,34 @@
 import sys
 from PySide6.QtWidgets import QApplication, QColorDialog, QPlainTextDocumentLayout
+from database import inicializar_base_datos
+from ejecutor_bd import obtener_ejecutor
+from impresion import terminar_impresion
+from services.movimientos import MOVIMIENTOS_POR_INSTANTANEA, MovimientosService
 from views.login import LoginWindow
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QTimer
 from PySide6.QtGui import QAction, QIcon, QFont, QColor, QPalette
 
+INTERVALO_INSTANTANEAS = 60 * 60 * 1000  # milisegundos
+
+def tomar_instantanea_stock():
+    """Instantánea de saldos de stock si se acumularon movimientos"""
+    obtener_ejecutor().enviar(
+        MovimientosService().tomar_instantanea, MOVIMIENTOS_POR_INSTANTANEA,
+        al_fallar=lambda e: print(f"Error al tomar la instantánea de stock: {e}"),
+        clave="instantanea-stock"
+    )
+
 def main():
+    inicializar_base_datos()
     app = QApplication(sys.argv)
     # En main.py al iniciar la app
     app.setStyle("Fusion")
+    app.aboutToQuit.connect(terminar_impresion)
+
+    tomar_instantanea_stock()
+    timer_instantaneas = QTimer()
+    timer_instantaneas.timeout.connect(tomar_instantanea_stock)
+    timer_instantaneas.start(INTERVALO_INSTANTANEAS)
 
     palette = QPalette()
     palette.setColor(QPalette.Window, QColor("#F5F5DC"))
@@ -0,0 +1,682 @@
+"""Migraciones numeradas del esquema de la base de datos.
+
+La versión aplicada se guarda en ``PRAGMA user_version``: con el esquema al día
+el arranque solo compara ese entero con ``VERSION_ESQUEMA``. Las migraciones
+pendientes se aplican en una única transacción y se informa cuánto tardó cada
+una.
+
+Uso desde la línea de comandos::
+
+    python migraciones.py [ruta.db]            # aplicar pendientes
+    python migraciones.py [ruta.db] --probar   # ensayar sobre una copia
+"""
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+def _columnas(conexion, tabla):
+    return {fila[1] for fila in conexion.execute(f"PRAGMA table_info({tabla})")}
+
+def migracion_1(conexion):
+    """Esquema inicial (compatible con bases creadas antes de las migraciones)"""
+    comandos = [
+        """
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT NOT NULL,
+            usuario TEXT UNIQUE NOT NULL,
+            clave TEXT NOT NULL,
+            rol TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS mesas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numero INTEGER UNIQUE NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'libre',
+            seccion TEXT NOT NULL DEFAULT 'Principal'
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS productos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT UNIQUE NOT NULL,
+            precio REAL NOT NULL,
+            stock INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS ordenes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mesa_id INTEGER NOT NULL UNIQUE,  -- CAMBIO IMPORTANTE: UNIQUE
+            cliente_nombre TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'abierta',
+            total REAL DEFAULT 0,
+            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (mesa_id) REFERENCES mesas (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS orden_detalles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orden_id INTEGER NOT NULL,
+            producto_id INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL,
+            subtotal REAL NOT NULL,
+            FOREIGN KEY (orden_id) REFERENCES ordenes (id),
+            FOREIGN KEY (producto_id) REFERENCES productos (id)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS facturas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orden_id INTEGER NOT NULL,
+            numero_factura TEXT UNIQUE NOT NULL,
+            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            cliente_nombre TEXT NOT NULL,
+            total REAL NOT NULL,
+            FOREIGN KEY (orden_id) REFERENCES ordenes (id))
+        """
+    ]
+    for comando in comandos:
+        conexion.execute(comando)
+
+    # Bases antiguas creadas antes de existir la columna seccion
+    if "seccion" not in _columnas(conexion, "mesas"):
+        conexion.execute("ALTER TABLE mesas ADD COLUMN seccion TEXT DEFAULT 'Principal'")
+
+    conexion.execute(
+        "CREATE TRIGGER IF NOT EXISTS prevent_negative_stock "
+        "BEFORE UPDATE ON productos "
+        "FOR EACH ROW "
+        "WHEN NEW.stock < 0 "
+        "BEGIN "
+        "   SELECT RAISE(ABORT, 'Stock no puede ser negativo'); "
+        "END;"
+    )
+    conexion.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mesa_orden_abierta "
+        "ON ordenes(mesa_id) WHERE estado = 'abierta'"
+    )
+
+def migracion_2(conexion):
+    """Usuario administrador y mesas iniciales en bases vacías"""
+    if conexion.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0] > 0:
+        return
+    conexion.execute(
+        "INSERT INTO usuarios (nombre, usuario, clave, rol) VALUES (?, ?, ?, ?)",
+        ("Administrador", "admin", "admin", "admin")
+    )
+    # 10 mesas iniciales (5 en Principal, 5 en Terraza)
+    conexion.executemany(
+        "INSERT OR IGNORE INTO mesas (numero, seccion) VALUES (?, ?)",
+        [(i, "Principal" if i <= 5 else "Terraza") for i in range(1, 11)]
+    )
+
+def migracion_3(conexion):
+    """Índices para las búsquedas frecuentes de órdenes, mesas y facturas"""
+    indices = [
+        # cargar_orden_existente / confirmar_orden: detalle por orden y producto
+        "CREATE INDEX IF NOT EXISTS idx_orden_detalles_orden "
+        "ON orden_detalles(orden_id, producto_id)",
+        # Orden abierta de una mesa
+        "CREATE INDEX IF NOT EXISTS idx_ordenes_mesa_estado "
+        "ON ordenes(mesa_id, estado)",
+        # Reportes por fecha y factura de una orden
+        "CREATE INDEX IF NOT EXISTS idx_facturas_fecha ON facturas(fecha)",
+        "CREATE INDEX IF NOT EXISTS idx_facturas_orden ON facturas(orden_id)",
+        # Filtro de sección y listado ordenado de mesas
+        "CREATE INDEX IF NOT EXISTS idx_mesas_seccion_numero "
+        "ON mesas(seccion, numero)",
+    ]
+    for indice in indices:
+        conexion.execute(indice)
+
+def migracion_4(conexion):
+    """Quitar UNIQUE de ordenes.mesa_id: una mesa tiene muchas órdenes en su historia.
+
+    La regla de una sola orden abierta por mesa ya la impone
+    ``idx_mesa_orden_abierta``.
+    """
+    unicos = [
+        fila for fila in conexion.execute("PRAGMA index_list(ordenes)")
+        if fila[3] == "u"
+    ]
+    if not unicos:
+        return
+    conexion.execute("""
+        CREATE TABLE ordenes_nueva (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            mesa_id INTEGER NOT NULL,
+            cliente_nombre TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'abierta',
+            total REAL DEFAULT 0,
+            fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (mesa_id) REFERENCES mesas (id)
+        )
+    """)
+    conexion.execute("""
+        INSERT INTO ordenes_nueva (id, mesa_id, cliente_nombre, estado, total, fecha)
+        SELECT id, mesa_id, cliente_nombre, estado, total, fecha FROM ordenes
+    """)
+    conexion.execute("DROP TABLE ordenes")
+    conexion.execute("ALTER TABLE ordenes_nueva RENAME TO ordenes")
+    conexion.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_mesa_orden_abierta "
+        "ON ordenes(mesa_id) WHERE estado = 'abierta'"
+    )
+    conexion.execute(
+        "CREATE INDEX IF NOT EXISTS idx_ordenes_mesa_estado "
+        "ON ordenes(mesa_id, estado)"
+    )
+
+def migracion_5(conexion):
+    """Posición de cada mesa en el plano, relativa al origen de su sección"""
+    columnas = _columnas(conexion, "mesas")
+    if "pos_x" not in columnas:
+        conexion.execute("ALTER TABLE mesas ADD COLUMN pos_x REAL")
+    if "pos_y" not in columnas:
+        conexion.execute("ALTER TABLE mesas ADD COLUMN pos_y REAL")
+
+# Tablas cuyo contador de cambios mantienen los triggers de la migración 6
+TABLAS_CAMBIOS = ("mesas", "productos", "ordenes", "orden_detalles", "facturas")
+
+def migracion_6(conexion):
+    """Contador de cambios por tabla, para refrescar otras terminales"""
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS cambios (
+            tabla TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    for tabla in TABLAS_CAMBIOS:
+        conexion.execute("INSERT OR IGNORE INTO cambios (tabla) VALUES (?)", (tabla,))
+        for evento in ("INSERT", "UPDATE", "DELETE"):
+            conexion.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS cambios_{tabla}_{evento.lower()}
+                AFTER {evento} ON {tabla}
+                BEGIN
+                    UPDATE cambios SET version = version + 1 WHERE tabla = '{tabla}';
+                END
+            """)
+
+def migracion_7(conexion):
+    """Índice por fecha de las órdenes, para las ventas recientes por producto"""
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_ordenes_fecha ON ordenes(fecha)")
+
+def migracion_8(conexion):
+    """Reservas temporales de stock de las órdenes en edición"""
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS reservas_stock (
+            sesion TEXT NOT NULL,
+            producto_id INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL CHECK (cantidad > 0),
+            expira REAL NOT NULL,
+            PRIMARY KEY (sesion, producto_id),
+            FOREIGN KEY (producto_id) REFERENCES productos (id)
+        ) WITHOUT ROWID
+    """)
+    # Reservado vigente de un producto y limpieza de las vencidas
+    conexion.execute(
+        "CREATE INDEX IF NOT EXISTS idx_reservas_producto "
+        "ON reservas_stock(producto_id, expira)"
+    )
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_reservas_expira ON reservas_stock(expira)")
+
+def migracion_9(conexion):
+    """Secuencia diaria de números de factura por caja"""
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS secuencias_factura (
+            caja TEXT NOT NULL,
+            fecha TEXT NOT NULL,
+            ultimo INTEGER NOT NULL,
+            PRIMARY KEY (caja, fecha)
+        ) WITHOUT ROWID
+    """)
+
+def migracion_10(conexion):
+    """Copia del detalle de cada factura tal como se cobró.
+
+    Las facturas anteriores se completan con sus líneas de ``orden_detalles``:
+    el precio unitario sale del subtotal cobrado, el nombre es el actual del
+    producto (el de entonces no se guardaba).
+    """
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS factura_detalles (
+            factura_id INTEGER NOT NULL,
+            linea INTEGER NOT NULL,
+            producto_id INTEGER,
+            nombre TEXT NOT NULL,
+            precio_unitario REAL NOT NULL,
+            cantidad INTEGER NOT NULL,
+            subtotal REAL NOT NULL,
+            tasa_impuesto REAL NOT NULL DEFAULT 0,
+            impuesto REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (factura_id, linea),
+            FOREIGN KEY (factura_id) REFERENCES facturas (id)
+        ) WITHOUT ROWID
+    """)
+    if "impuesto" not in _columnas(conexion, "facturas"):
+        conexion.execute("ALTER TABLE facturas ADD COLUMN impuesto REAL NOT NULL DEFAULT 0")
+    conexion.execute("""
+        INSERT OR IGNORE INTO factura_detalles
+            (factura_id, linea, producto_id, nombre, precio_unitario, cantidad, subtotal)
+        SELECT f.id,
+               ROW_NUMBER() OVER (PARTITION BY f.id ORDER BY d.id),
+               d.producto_id,
+               COALESCE(p.nombre, 'Producto ' || d.producto_id),
+               CASE WHEN d.cantidad != 0 THEN d.subtotal * 1.0 / d.cantidad ELSE COALESCE(p.precio, 0) END,
+               d.cantidad,
+               d.subtotal
+        FROM facturas f
+        JOIN orden_detalles d ON d.orden_id = f.orden_id
+        LEFT JOIN productos p ON p.id = d.producto_id
+    """)
+
+def migracion_11(conexion):
+    """Comandas de cocina: lo que cambió en cada confirmación, por estación.
+
+    ``comandas`` y ``comanda_lineas`` solo reciben inserciones. El estado de
+    preparación de cada estación está en ``comanda_estaciones``, con una
+    ``secuencia`` global que crece en cada cambio: la pantalla de cocina lee
+    solo lo posterior a la última secuencia que vio.
+    """
+    if "estacion" not in _columnas(conexion, "productos"):
+        conexion.execute("ALTER TABLE productos ADD COLUMN estacion TEXT NOT NULL DEFAULT 'Cocina'")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS comandas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            orden_id INTEGER NOT NULL,
+            mesa INTEGER,
+            creada TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (orden_id) REFERENCES ordenes (id)
+        )
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS comanda_lineas (
+            comanda_id INTEGER NOT NULL,
+            linea INTEGER NOT NULL,
+            producto_id INTEGER,
+            nombre TEXT NOT NULL,
+            estacion TEXT NOT NULL,
+            cantidad INTEGER NOT NULL CHECK (cantidad != 0),
+            PRIMARY KEY (comanda_id, linea),
+            FOREIGN KEY (comanda_id) REFERENCES comandas (id)
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS comanda_estaciones (
+            comanda_id INTEGER NOT NULL,
+            estacion TEXT NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'pendiente',
+            secuencia INTEGER NOT NULL,
+            actualizado TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (comanda_id, estacion),
+            FOREIGN KEY (comanda_id) REFERENCES comandas (id)
+        ) WITHOUT ROWID
+    """)
+    # Novedades desde una secuencia y comandas sin entregar por estado
+    conexion.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_comanda_estaciones_secuencia "
+        "ON comanda_estaciones(secuencia)"
+    )
+    conexion.execute(
+        "CREATE INDEX IF NOT EXISTS idx_comanda_estaciones_estado "
+        "ON comanda_estaciones(estado, comanda_id)"
+    )
+    # Avisar a las demás terminales como las tablas de la migración 6
+    conexion.execute("INSERT OR IGNORE INTO cambios (tabla) VALUES ('comanda_estaciones')")
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        conexion.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS cambios_comanda_estaciones_{evento.lower()}
+            AFTER {evento} ON comanda_estaciones
+            BEGIN
+                UPDATE cambios SET version = version + 1 WHERE tabla = 'comanda_estaciones';
+            END
+        """)
+
+def migracion_12(conexion):
+    """Índices de las columnas por las que se ordena el inventario.
+
+    El del nombre usa NOCASE, como el orden y el filtro de la pantalla.
+    """
+    indices = [
+        "CREATE INDEX IF NOT EXISTS idx_productos_nombre_nocase ON productos(nombre COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_productos_precio ON productos(precio)",
+        "CREATE INDEX IF NOT EXISTS idx_productos_stock ON productos(stock)",
+        "CREATE INDEX IF NOT EXISTS idx_productos_estacion ON productos(estacion)",
+    ]
+    for indice in indices:
+        conexion.execute(indice)
+
+def migracion_13(conexion):
+    """Libro de movimientos de stock e instantáneas periódicas de saldos.
+
+    Los triggers de ``productos`` anotan cada cambio de stock en
+    ``movimientos_stock`` (alta, cambio o baja del producto), sea cual sea el
+    camino que lo hizo; quien conoce el motivo (una venta, una importación)
+    lo completa en la misma transacción. Los movimientos no se modifican ni
+    se borran. Los productos existentes arrancan con un movimiento
+    ``inicial`` por su stock actual.
+    """
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS movimientos_stock (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            producto_id INTEGER NOT NULL,
+            fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            cantidad INTEGER NOT NULL CHECK (cantidad != 0),
+            motivo TEXT NOT NULL DEFAULT 'ajuste',
+            referencia INTEGER
+        )
+    """)
+    # Movimientos de un producto en un rango de ids (ver services.movimientos)
+    conexion.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movimientos_producto ON movimientos_stock(producto_id)"
+    )
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS instantaneas_stock (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            movimiento INTEGER NOT NULL
+        )
+    """)
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_instantaneas_fecha ON instantaneas_stock(fecha)")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS saldos_stock (
+            instantanea_id INTEGER NOT NULL,
+            producto_id INTEGER NOT NULL,
+            stock INTEGER NOT NULL,
+            PRIMARY KEY (instantanea_id, producto_id),
+            FOREIGN KEY (instantanea_id) REFERENCES instantaneas_stock (id)
+        ) WITHOUT ROWID
+    """)
+
+    triggers = {
+        "alta": ("AFTER INSERT ON productos WHEN NEW.stock != 0", "NEW.id, NEW.stock, 'alta'"),
+        "cambio": ("AFTER UPDATE OF stock ON productos WHEN NEW.stock != OLD.stock",
+                   "NEW.id, NEW.stock - OLD.stock, 'ajuste'"),
+        "baja": ("AFTER DELETE ON productos WHEN OLD.stock != 0", "OLD.id, -OLD.stock, 'baja'"),
+    }
+    for nombre, (cuando, valores) in triggers.items():
+        conexion.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS movimientos_stock_{nombre}
+            {cuando}
+            BEGIN
+                INSERT INTO movimientos_stock (producto_id, cantidad, motivo) VALUES ({valores});
+            END
+        """)
+    conexion.execute("""
+        CREATE TRIGGER IF NOT EXISTS movimientos_stock_inmutables
+        BEFORE UPDATE OF id, producto_id, fecha, cantidad ON movimientos_stock
+        BEGIN
+            SELECT RAISE(ABORT, 'Los movimientos de stock no se modifican');
+        END
+    """)
+    conexion.execute("""
+        CREATE TRIGGER IF NOT EXISTS movimientos_stock_permanentes
+        BEFORE DELETE ON movimientos_stock
+        BEGIN
+            SELECT RAISE(ABORT, 'Los movimientos de stock no se borran');
+        END
+    """)
+
+    if conexion.execute("SELECT 1 FROM movimientos_stock LIMIT 1").fetchone() is None:
+        conexion.execute("""
+            INSERT INTO movimientos_stock (producto_id, cantidad, motivo)
+            SELECT id, stock, 'inicial' FROM productos WHERE stock != 0 ORDER BY id
+        """)
+
+def migracion_14(conexion):
+    """Stock mínimo por producto y alertas de stock bajo.
+
+    ``alertas_stock`` tiene una fila por cada producto con ``stock_minimo``
+    (mayor que cero) y stock en el mínimo o por debajo. La mantienen los
+    triggers de ``productos`` y solo escriben cuando el producto cruza el
+    mínimo; mientras siga del mismo lado, los cambios de stock no la tocan.
+    """
+    if "stock_minimo" not in _columnas(conexion, "productos"):
+        conexion.execute("ALTER TABLE productos ADD COLUMN stock_minimo INTEGER NOT NULL DEFAULT 0")
+    # Orden de la columna en el inventario, como las de la migración 12
+    conexion.execute("CREATE INDEX IF NOT EXISTS idx_productos_stock_minimo ON productos(stock_minimo)")
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS alertas_stock (
+            producto_id INTEGER PRIMARY KEY,
+            desde TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    bajo_nuevo = "NEW.stock_minimo > 0 AND NEW.stock <= NEW.stock_minimo"
+    bajo_anterior = "OLD.stock_minimo > 0 AND OLD.stock <= OLD.stock_minimo"
+    triggers = {
+        "alta": (f"AFTER INSERT ON productos WHEN {bajo_nuevo}",
+                 "INSERT OR IGNORE INTO alertas_stock (producto_id) VALUES (NEW.id)"),
+        "entra": (f"AFTER UPDATE OF stock, stock_minimo ON productos "
+                  f"WHEN {bajo_nuevo} AND NOT ({bajo_anterior})",
+                  "INSERT OR IGNORE INTO alertas_stock (producto_id) VALUES (NEW.id)"),
+        "sale": (f"AFTER UPDATE OF stock, stock_minimo ON productos "
+                 f"WHEN {bajo_anterior} AND NOT ({bajo_nuevo})",
+                 "DELETE FROM alertas_stock WHERE producto_id = NEW.id"),
+        "baja": (f"AFTER DELETE ON productos WHEN {bajo_anterior}",
+                 "DELETE FROM alertas_stock WHERE producto_id = OLD.id"),
+    }
+    for nombre, (cuando, accion) in triggers.items():
+        conexion.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS alertas_stock_{nombre}
+            {cuando}
+            BEGIN
+                {accion};
+            END
+        """)
+    conexion.execute("""
+        INSERT OR IGNORE INTO alertas_stock (producto_id)
+        SELECT id FROM productos WHERE stock_minimo > 0 AND stock <= stock_minimo
+    """)
+
+def migracion_15(conexion):
+    """Ajustes masivos de precio o stock con su detalle por producto.
+
+    Cada ajuste guarda lo que se pidió (campo, modo, valor y selección) y,
+    por producto, el valor anterior y el nuevo: es el historial de auditoría
+    y lo que permite deshacerlo.
+    """
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ajustes_masivos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            usuario TEXT,
+            campo TEXT NOT NULL CHECK (campo IN ('precio', 'stock')),
+            modo TEXT NOT NULL CHECK (modo IN ('porcentaje', 'cantidad')),
+            valor REAL NOT NULL,
+            filtro TEXT NOT NULL DEFAULT '',
+            estacion TEXT,
+            productos INTEGER NOT NULL DEFAULT 0,
+            deshecho TIMESTAMP
+        )
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ajustes_masivos_detalle (
+            ajuste_id INTEGER NOT NULL,
+            producto_id INTEGER NOT NULL,
+            anterior REAL NOT NULL,
+            nuevo REAL NOT NULL,
+            PRIMARY KEY (ajuste_id, producto_id),
+            FOREIGN KEY (ajuste_id) REFERENCES ajustes_masivos (id)
+        ) WITHOUT ROWID
+    """)
+
+def migracion_16(conexion):
+    """Resúmenes de ventas por día, hora, producto y sección.
+
+    Se acumulan al facturar, en la misma transacción que la factura (ver
+    ``services.reportes``). Las fechas y horas son locales, las del día de
+    trabajo del restaurante. Las facturas existentes se resumen aquí; después
+    se puede reconstruir con ``python -m tools.reconstruir_ventas``.
+    """
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ventas_dia (
+            fecha TEXT PRIMARY KEY,
+            facturas INTEGER NOT NULL,
+            total REAL NOT NULL,
+            impuesto REAL NOT NULL
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ventas_hora (
+            fecha TEXT NOT NULL,
+            hora INTEGER NOT NULL,
+            facturas INTEGER NOT NULL,
+            total REAL NOT NULL,
+            PRIMARY KEY (fecha, hora)
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ventas_producto (
+            fecha TEXT NOT NULL,
+            producto_id INTEGER NOT NULL,
+            nombre TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            total REAL NOT NULL,
+            PRIMARY KEY (fecha, producto_id)
+        ) WITHOUT ROWID
+    """)
+    conexion.execute("""
+        CREATE TABLE IF NOT EXISTS ventas_seccion (
+            fecha TEXT NOT NULL,
+            seccion TEXT NOT NULL,
+            facturas INTEGER NOT NULL,
+            total REAL NOT NULL,
+            PRIMARY KEY (fecha, seccion)
+        ) WITHOUT ROWID
+    """)
+
+    if conexion.execute("SELECT 1 FROM ventas_dia LIMIT 1").fetchone() is None:
+        conexion.execute("""
+            INSERT INTO ventas_dia (fecha, facturas, total, impuesto)
+            SELECT date(fecha, 'localtime'), COUNT(*), ROUND(SUM(total), 2), ROUND(SUM(impuesto), 2)
+            FROM facturas
+            GROUP BY 1
+        """)
+        conexion.execute("""
+            INSERT INTO ventas_hora (fecha, hora, facturas, total)
+            SELECT date(fecha, 'localtime'), CAST(strftime('%H', fecha, 'localtime') AS INTEGER),
+                   COUNT(*), ROUND(SUM(total), 2)
+            FROM facturas
+            GROUP BY 1, 2
+        """)
+        conexion.execute("""
+            INSERT INTO ventas_producto (fecha, producto_id, nombre, cantidad, total)
+            SELECT date(f.fecha, 'localtime'), COALESCE(d.producto_id, 0), MAX(d.nombre),
+                   SUM(d.cantidad), ROUND(SUM(d.subtotal), 2)
+            FROM facturas f
+            JOIN factura_detalles d ON d.factura_id = f.id
+            GROUP BY 1, 2
+        """)
+        conexion.execute("""
+            INSERT INTO ventas_seccion (fecha, seccion, facturas, total)
+            SELECT date(f.fecha, 'localtime'), COALESCE(m.seccion, ''), COUNT(*), ROUND(SUM(f.total), 2)
+            FROM facturas f
+            LEFT JOIN ordenes o ON o.id = f.orden_id
+            LEFT JOIN mesas m ON m.id = o.mesa_id
+            GROUP BY 1, 2
+        """)
+
+# (número, descripción, función). Los números son consecutivos y nunca se
+# reutilizan: una migración publicada no se modifica, se agrega otra.
+MIGRACIONES = [
+    (1, "Esquema inicial", migracion_1),
+    (2, "Datos iniciales", migracion_2),
+    (3, "Índices de consultas frecuentes", migracion_3),
+    (4, "Varias órdenes por mesa", migracion_4),
+    (5, "Posiciones de mesas en el plano", migracion_5),
+    (6, "Contador de cambios por tabla", migracion_6),
+    (7, "Índice de órdenes por fecha", migracion_7),
+    (8, "Reservas de stock", migracion_8),
+    (9, "Numeración de facturas", migracion_9),
+    (10, "Detalle de facturas", migracion_10),
+    (11, "Comandas de cocina", migracion_11),
+    (12, "Índices del inventario", migracion_12),
+    (13, "Movimientos de stock", migracion_13),
+    (14, "Alertas de stock bajo", migracion_14),
+    (15, "Ajustes masivos", migracion_15),
+    (16, "Resúmenes de ventas", migracion_16),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+def version_actual(conexion):
+    return conexion.execute("PRAGMA user_version").fetchone()[0]
+
+def aplicar_migraciones(conexion, hasta=None, informar=print):
+    """Aplicar en una transacción las migraciones posteriores a user_version.
+
+    Devuelve una lista ``(numero, descripcion, segundos)`` con lo aplicado.
+    Si una migración falla se revierten todas las del lote.
+    """
+    objetivo = VERSION_ESQUEMA if hasta is None else hasta
+    version = version_actual(conexion)
+    pendientes = [m for m in MIGRACIONES if version < m[0] <= objetivo]
+    if not pendientes:
+        return []
+
+    tiempos = []
+    conexion.execute("BEGIN IMMEDIATE")
+    try:
+        for numero, descripcion, funcion in pendientes:
+            inicio = time.perf_counter()
+            funcion(conexion)
+            conexion.execute(f"PRAGMA user_version = {numero}")
+            duracion = time.perf_counter() - inicio
+            tiempos.append((numero, descripcion, duracion))
+            if informar:
+                informar(f"Migración {numero} ({descripcion}): {duracion:.3f} s")
+        conexion.commit()
+    except BaseException:
+        conexion.rollback()
+        raise
+    return tiempos
+
+def probar_migraciones(ruta, informar=print):
+    """Ensayar las migraciones pendientes sobre una copia de la base de datos"""
+    directorio = tempfile.mkdtemp(prefix="migracion_")
+    copia = os.path.join(directorio, os.path.basename(ruta))
+    try:
+        origen = sqlite3.connect(ruta)
+        destino = sqlite3.connect(copia)
+        try:
+            origen.backup(destino)
+        finally:
+            origen.close()
+        try:
+            return aplicar_migraciones(destino, informar=informar)
+        finally:
+            destino.close()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+def main(argumentos):
+    from database import RUTA_BD, crear_conexion
+
+    probar = "--probar" in argumentos
+    rutas = [a for a in argumentos if not a.startswith("--")]
+    ruta = rutas[0] if rutas else RUTA_BD
+
+    inicio = time.perf_counter()
+    if probar:
+        tiempos = probar_migraciones(ruta)
+    else:
+        conexion = crear_conexion(ruta)
+        try:
+            tiempos = aplicar_migraciones(conexion)
+        finally:
+            conexion.close()
+
+    if not tiempos:
+        print(f"{ruta}: esquema al día (versión {VERSION_ESQUEMA})")
+    else:
+        print(f"{len(tiempos)} migraciones en {time.perf_counter() - inicio:.3f} s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
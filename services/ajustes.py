@@ -0,0 +1,203 @@
+"""Ajustes masivos de precio o stock, sin dependencias de Qt.
+
+Un ajuste cambia el precio o el stock de todos los productos de una
+selección (comienzo del nombre, estación) en un porcentaje o una cantidad.
+Se calcula y se aplica en SQL, en una sola transacción: primero se guarda
+en ``ajustes_masivos_detalle`` el valor anterior y el nuevo de cada producto
+que cambia y después se actualizan todos juntos desde ese detalle. El
+detalle es el historial de auditoría y lo que usa ``deshacer``.
+"""
+from collections import namedtuple
+
+from database import obtener_pool
+from services.inventario import FIN_PREFIJO
+from services.movimientos import etiquetar_movimientos, ultimo_movimiento
+
+CAMPOS = ("precio", "stock")
+MODOS = ("porcentaje", "cantidad")
+
+# Valor nuevo de cada producto según (campo, modo); el parámetro es el valor
+# del ajuste. El precio no baja de 0.01 y el stock no baja de cero (el
+# trigger prevent_negative_stock rechazaría toda la sentencia).
+EXPRESIONES = {
+    ("precio", "porcentaje"): "MAX(0.01, ROUND(precio * (1 + ? / 100.0), 2))",
+    ("precio", "cantidad"): "MAX(0.01, ROUND(precio + ?, 2))",
+    ("stock", "porcentaje"): "MAX(0, CAST(ROUND(stock * (1 + ? / 100.0)) AS INTEGER))",
+    ("stock", "cantidad"): "MAX(0, stock + CAST(ROUND(?) AS INTEGER))",
+}
+
+# Filas de la vista previa
+FILAS_VISTA_PREVIA = 200
+
+# ``filtro``: comienzo del nombre ('' para todos); ``estacion``: None para todas
+Ajuste = namedtuple("Ajuste", "campo modo valor filtro estacion", defaults=("", None))
+Cambio = namedtuple("Cambio", "producto_id nombre anterior nuevo")
+SentenciasAjuste = namedtuple("SentenciasAjuste", "contar cambios detalle actualizar")
+VistaPrevia = namedtuple("VistaPrevia", "seleccionados cambian cambios")
+AjusteGuardado = namedtuple(
+    "AjusteGuardado", "id fecha usuario campo modo valor filtro estacion productos deshecho"
+)
+
+def validar(ajuste):
+    if ajuste.campo not in CAMPOS:
+        raise ValueError(f"Campo desconocido: {ajuste.campo}")
+    if ajuste.modo not in MODOS:
+        raise ValueError(f"Modo desconocido: {ajuste.modo}")
+    if ajuste.modo == "porcentaje" and ajuste.valor <= -100:
+        raise ValueError("Un porcentaje de -100 o menos deja todo en el mínimo")
+
+def seleccion(ajuste):
+    """(condición WHERE, parámetros) de los productos del ajuste; el
+    comienzo del nombre es un rango sobre el índice NOCASE, como en el
+    inventario"""
+    condiciones, parametros = [], []
+    if ajuste.filtro:
+        condiciones.append("nombre COLLATE NOCASE >= ? AND nombre COLLATE NOCASE < ?")
+        parametros += [ajuste.filtro, ajuste.filtro + FIN_PREFIJO]
+    if ajuste.estacion:
+        condiciones.append("estacion = ?")
+        parametros.append(ajuste.estacion)
+    return " AND ".join(condiciones) or "1", parametros
+
+def sentencias(ajuste):
+    """``SentenciasAjuste`` con el SQL del ajuste, armado con su campo, su
+    modo y su selección (``tools.verificar_planes`` revisa cada variante)"""
+    campo, nuevo = ajuste.campo, EXPRESIONES[ajuste.campo, ajuste.modo]
+    condicion, _ = seleccion(ajuste)
+    return SentenciasAjuste(
+        f"SELECT COUNT(*), COALESCE(SUM({nuevo} != {campo}), 0) FROM productos WHERE {condicion}",
+        f"""
+            SELECT id, nombre, {campo}, {nuevo} FROM productos
+            WHERE {condicion} AND {nuevo} != {campo}
+            ORDER BY nombre COLLATE NOCASE
+            LIMIT ?
+        """,
+        f"""
+            INSERT INTO ajustes_masivos_detalle (ajuste_id, producto_id, anterior, nuevo)
+            SELECT ?, id, {campo}, nuevo
+            FROM (SELECT id, {campo}, {nuevo} AS nuevo FROM productos WHERE {condicion})
+            WHERE nuevo != {campo}
+        """,
+        f"""
+            UPDATE productos
+            SET {campo} = (SELECT d.nuevo FROM ajustes_masivos_detalle d
+                           WHERE d.ajuste_id = ? AND d.producto_id = productos.id)
+            WHERE id IN (SELECT producto_id FROM ajustes_masivos_detalle WHERE ajuste_id = ?)
+        """,
+    )
+
+class AjustesService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def vista_previa(self, ajuste, limite=FILAS_VISTA_PREVIA):
+        """Cuántos productos se seleccionan y cuántos cambian, con los
+        primeros ``limite`` cambios por nombre"""
+        validar(ajuste)
+        sql = sentencias(ajuste)
+        _, parametros = seleccion(ajuste)
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN")
+            cursor = conexion.cursor()
+            cursor.execute(sql.contar, (ajuste.valor, *parametros))
+            seleccionados, cambian = cursor.fetchone()
+            cursor.execute(sql.cambios, (ajuste.valor, *parametros, ajuste.valor, limite))
+            cambios = [Cambio(*fila) for fila in cursor.fetchall()]
+            conexion.commit()
+        return VistaPrevia(seleccionados, cambian, cambios)
+
+    def aplicar(self, ajuste, usuario=None):
+        """Aplicar el ajuste en una transacción; devuelve (id del ajuste
+        guardado, productos que cambiaron), o None si no cambia ninguno"""
+        validar(ajuste)
+        campo, sql = ajuste.campo, sentencias(ajuste)
+        _, parametros = seleccion(ajuste)
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+            desde = ultimo_movimiento(cursor)
+            cursor.execute("""
+                INSERT INTO ajustes_masivos (usuario, campo, modo, valor, filtro, estacion)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (usuario, campo, ajuste.modo, ajuste.valor, ajuste.filtro, ajuste.estacion))
+            ajuste_id = cursor.lastrowid
+            cursor.execute(sql.detalle, (ajuste_id, ajuste.valor, *parametros))
+            productos = cursor.rowcount
+            if not productos:
+                conexion.rollback()
+                return None
+            cursor.execute(sql.actualizar, (ajuste_id, ajuste_id))
+            cursor.execute("UPDATE ajustes_masivos SET productos = ? WHERE id = ?", (productos, ajuste_id))
+            if campo == "stock":
+                etiquetar_movimientos(cursor, desde, "ajuste_masivo", ajuste_id)
+            conexion.commit()
+            return ajuste_id, productos
+
+    def deshacer(self, ajuste_id):
+        """Revertir un ajuste; devuelve cuántos productos se revirtieron.
+
+        El stock se revierte por diferencia (lo vendido después del ajuste
+        no vuelve), sin bajar de cero. El precio vuelve al anterior solo en
+        los productos que siguen con el precio que puso el ajuste.
+        """
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+            cursor.execute("SELECT campo, deshecho FROM ajustes_masivos WHERE id = ?", (ajuste_id,))
+            fila = cursor.fetchone()
+            if fila is None:
+                raise ValueError(f"No existe el ajuste {ajuste_id}")
+            campo, deshecho = fila
+            if deshecho is not None:
+                raise ValueError(f"El ajuste {ajuste_id} ya se deshizo el {deshecho}")
+            desde = ultimo_movimiento(cursor)
+            if campo == "stock":
+                cursor.execute("""
+                    UPDATE productos
+                    SET stock = MAX(0, stock - (SELECT CAST(d.nuevo - d.anterior AS INTEGER)
+                                                FROM ajustes_masivos_detalle d
+                                                WHERE d.ajuste_id = ? AND d.producto_id = productos.id))
+                    WHERE id IN (SELECT producto_id FROM ajustes_masivos_detalle WHERE ajuste_id = ?)
+                """, (ajuste_id, ajuste_id))
+            else:
+                cursor.execute("""
+                    UPDATE productos
+                    SET precio = (SELECT d.anterior FROM ajustes_masivos_detalle d
+                                  WHERE d.ajuste_id = ? AND d.producto_id = productos.id)
+                    WHERE id IN (SELECT producto_id FROM ajustes_masivos_detalle WHERE ajuste_id = ?)
+                      AND precio = (SELECT d.nuevo FROM ajustes_masivos_detalle d
+                                    WHERE d.ajuste_id = ? AND d.producto_id = productos.id)
+                """, (ajuste_id, ajuste_id, ajuste_id))
+            revertidos = cursor.rowcount
+            cursor.execute("UPDATE ajustes_masivos SET deshecho = CURRENT_TIMESTAMP WHERE id = ?", (ajuste_id,))
+            if campo == "stock":
+                etiquetar_movimientos(cursor, desde, "ajuste_masivo", ajuste_id)
+            conexion.commit()
+            return revertidos
+
+    def recientes(self, limite=20):
+        """Últimos ajustes, del más reciente al más antiguo"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT id, fecha, usuario, campo, modo, valor, filtro, estacion, productos, deshecho
+                FROM ajustes_masivos
+                ORDER BY id DESC
+                LIMIT ?
+            """, (limite,))
+            return [AjusteGuardado(*fila) for fila in cursor.fetchall()]
+
+    def detalle(self, ajuste_id):
+        """``Cambio`` de cada producto del ajuste (nombre None si se eliminó)"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT d.producto_id, p.nombre, d.anterior, d.nuevo
+                FROM ajustes_masivos_detalle d
+                LEFT JOIN productos p ON p.id = d.producto_id
+                WHERE d.ajuste_id = ?
+            """, (ajuste_id,))
+            return [Cambio(*fila) for fila in cursor.fetchall()]
@@ -0,0 +1,200 @@
+"""Búsqueda de productos mientras se escribe, sin dependencias de Qt.
+
+``IndiceProductos`` guarda cada palabra de los nombres en un trie de
+prefijos. Cada nodo tiene los ids de los productos que contienen una palabra
+con ese prefijo, ya ordenados por popularidad, así que las primeras
+coincidencias de una consulta salen de recorrer la palabra y tomar los
+primeros elementos de la lista. Si la consulta no encuentra nada se buscan
+palabras a una o dos ediciones de distancia ("tiramsu" -> "tiramisu").
+
+``IndiceFTS`` ofrece la misma interfaz sobre una tabla FTS5 en memoria, para
+catálogos demasiado grandes para el trie (si SQLite tiene FTS5).
+"""
+import heapq
+import re
+import sqlite3
+import unicodedata
+
+LIMITE_RESULTADOS = 10
+
+# A partir de este tamaño se usa FTS5 (si está disponible) en lugar del trie
+UMBRAL_FTS = 100_000
+
+def normalizar(texto):
+    """Minúsculas y sin tildes: "Café Especial" -> "cafe especial" """
+    descompuesto = unicodedata.normalize("NFD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+def palabras(texto):
+    return re.findall(r"\w+", normalizar(texto))
+
+class _Nodo:
+    __slots__ = ("hijos", "ids", "_conjunto")
+
+    def __init__(self):
+        self.hijos = {}
+        self.ids = []
+        self._conjunto = None
+
+    def conjunto(self):
+        """``ids`` como set, armado la primera vez que se necesita"""
+        if self._conjunto is None:
+            self._conjunto = set(self.ids)
+        return self._conjunto
+
+class IndiceProductos:
+    """Índice en memoria de ``productos`` (objetos con ``id`` y ``nombre``).
+
+    ``popularidad`` es {producto_id: unidades vendidas}; a igual popularidad
+    se respeta el orden en que llegan los productos.
+    """
+
+    def __init__(self, productos, popularidad=None):
+        popularidad = popularidad or {}
+        ordenados = sorted(productos, key=lambda p: -popularidad.get(p.id, 0))
+        self.productos = {producto.id: producto for producto in ordenados}
+        self.ranking = [producto.id for producto in ordenados]
+        self.posicion = {producto_id: i for i, producto_id in enumerate(self.ranking)}
+        self._raiz = _Nodo()
+
+        for producto in ordenados:
+            for token in set(palabras(producto.nombre)):
+                nodo = self._raiz
+                for caracter in token:
+                    nodo = nodo.hijos.setdefault(caracter, _Nodo())
+                    # Dos palabras del mismo producto pueden compartir prefijo
+                    if not nodo.ids or nodo.ids[-1] != producto.id:
+                        nodo.ids.append(producto.id)
+
+    def __len__(self):
+        return len(self.productos)
+
+    def _nodo(self, prefijo):
+        nodo = self._raiz
+        for caracter in prefijo:
+            nodo = nodo.hijos.get(caracter)
+            if nodo is None:
+                return None
+        return nodo
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS):
+        """Productos más populares cuyas palabras empiezan con las de ``texto``"""
+        consulta = palabras(texto)
+        if not consulta:
+            return [self.productos[i] for i in self.ranking[:limite]]
+
+        nodos = [self._nodo(token) for token in consulta]
+        if None in nodos:
+            return self._buscar_aproximado(consulta, nodos, limite)
+
+        # Recorrer la lista más corta (ya ordenada) y verificar las demás palabras
+        nodos.sort(key=lambda nodo: len(nodo.ids))
+        resto = [nodo.conjunto() for nodo in nodos[1:]]
+        resultados = []
+        for producto_id in nodos[0].ids:
+            if all(producto_id in ids for ids in resto):
+                resultados.append(self.productos[producto_id])
+                if len(resultados) >= limite:
+                    break
+        return resultados or self._buscar_aproximado(consulta, [None] * len(consulta), limite)
+
+    def _buscar_aproximado(self, consulta, nodos, limite):
+        """Permitir errores de tipeo en las palabras sin coincidencia exacta:
+        de 3 a 5 letras pueden estar a 1 edición (2 si son más largas) del
+        prefijo de una palabra del catálogo que empiece con la misma letra"""
+        if any(nodo is None and len(token) < 3 for token, nodo in zip(consulta, nodos)):
+            return []
+
+        por_token = []
+        for token, nodo in zip(consulta, nodos):
+            if nodo is not None:
+                por_token.append(nodo.conjunto())
+                continue
+            ids = set()
+            for parecido in self._parecidos(token, 1 if len(token) <= 5 else 2):
+                ids.update(parecido.conjunto())
+            if not ids:
+                return []
+            por_token.append(ids)
+
+        por_token.sort(key=len)
+        comunes = [i for i in por_token[0] if all(i in ids for ids in por_token[1:])]
+        return [self.productos[i] for i in heapq.nsmallest(limite, comunes, key=self.posicion.__getitem__)]
+
+    def _parecidos(self, token, distancia):
+        """Nodos del trie cuyo prefijo está a ``distancia`` ediciones o menos
+        de ``token`` (Levenshtein recorriendo el trie, podando ramas cuya
+        fila ya supera la distancia)."""
+        encontrados = []
+
+        def recorrer(nodo, fila):
+            for caracter, hijo in nodo.hijos.items():
+                nueva = [fila[0] + 1]
+                for columna in range(1, len(token) + 1):
+                    costo = 0 if token[columna - 1] == caracter else 1
+                    nueva.append(min(nueva[columna - 1] + 1, fila[columna] + 1, fila[columna - 1] + costo))
+                if nueva[-1] <= distancia:
+                    # El prefijo ya equivale a la palabra: todo el subárbol sirve
+                    encontrados.append(hijo)
+                elif min(nueva) <= distancia:
+                    recorrer(hijo, nueva)
+
+        # Los errores de tipeo casi nunca están en la primera letra: fijarla
+        # evita recorrer todo el trie
+        primero = self._raiz.hijos.get(token[0])
+        if primero is not None:
+            recorrer(primero, [1] + list(range(len(token))))
+        return encontrados
+
+def fts5_disponible():
+    try:
+        conexion = sqlite3.connect(":memory:")
+        conexion.execute("CREATE VIRTUAL TABLE prueba USING fts5(x)")
+        conexion.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+class IndiceFTS:
+    """Misma interfaz que ``IndiceProductos`` sobre FTS5 en memoria"""
+
+    def __init__(self, productos, popularidad=None):
+        popularidad = popularidad or {}
+        self.productos = {producto.id: producto for producto in productos}
+        self._conexion = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conexion.execute("""
+            CREATE VIRTUAL TABLE productos_fts USING fts5(
+                nombre, popularidad UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '1 2 3'
+            )
+        """)
+        self._conexion.executemany(
+            "INSERT INTO productos_fts (rowid, nombre, popularidad) VALUES (?, ?, ?)",
+            [(p.id, p.nombre, popularidad.get(p.id, 0)) for p in productos]
+        )
+        self._conexion.commit()
+
+    def __len__(self):
+        return len(self.productos)
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS):
+        consulta = " ".join(f'"{token}"*' for token in palabras(texto))
+        if consulta:
+            filas = self._conexion.execute("""
+                SELECT rowid FROM productos_fts
+                WHERE productos_fts MATCH ?
+                ORDER BY popularidad DESC
+                LIMIT ?
+            """, (consulta, limite))
+        else:
+            filas = self._conexion.execute(
+                "SELECT rowid FROM productos_fts ORDER BY popularidad DESC LIMIT ?", (limite,)
+            )
+        return [self.productos[fila[0]] for fila in filas]
+
+def crear_indice(productos, popularidad=None):
+    """Índice adecuado al tamaño del catálogo"""
+    if len(productos) >= UMBRAL_FTS and fts5_disponible():
+        return IndiceFTS(productos, popularidad)
+    return IndiceProductos(productos, popularidad)
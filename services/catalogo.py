@@ -0,0 +1,74 @@
+"""Catálogo de productos en memoria, sin dependencias de Qt"""
+import time
+
+from services.busqueda import LIMITE_RESULTADOS, crear_indice
+from services.inventario import InventarioService, Producto
+
+# Segundos que se reutilizan las ventas recientes antes de volver a sumarlas
+VIGENCIA_POPULARIDAD = 600
+
+class Catalogo:
+    """Copia en memoria de la tabla ``productos`` indexada por id.
+
+    ``leer`` solo consulta la base de datos y puede ejecutarse en otro hilo;
+    ``establecer`` reemplaza el contenido y se llama desde el hilo que usa el
+    catálogo, así las búsquedas nunca ven un estado a medio cargar.
+    """
+
+    def __init__(self, servicio=None):
+        self.servicio = servicio or InventarioService()
+        self._productos = {}
+        self.indice = None
+        self.cargado = False
+        self._popularidad = None
+        self._popularidad_leida = 0
+
+    def leer(self):
+        return [Producto(*fila) for fila in self.servicio.listar_productos()]
+
+    def popularidad(self):
+        """Ventas recientes por producto, sumadas a lo sumo cada ``VIGENCIA_POPULARIDAD``"""
+        if self._popularidad is None or time.monotonic() - self._popularidad_leida > VIGENCIA_POPULARIDAD:
+            self._popularidad = self.servicio.ventas_recientes()
+            self._popularidad_leida = time.monotonic()
+        return self._popularidad
+
+    def leer_con_indice(self):
+        """Productos y el índice de búsqueda de los disponibles (para otro hilo)"""
+        productos = self.leer()
+        disponibles = [producto for producto in productos if producto.stock > 0]
+        return productos, crear_indice(disponibles, self.popularidad())
+
+    def establecer(self, productos, indice=None):
+        self._productos = {producto.id: producto for producto in productos}
+        if indice is not None:
+            self.indice = indice
+        self.cargado = True
+
+    def cargar(self):
+        self.establecer(*self.leer_con_indice())
+
+    def buscar(self, texto, limite=LIMITE_RESULTADOS):
+        """Productos disponibles que coinciden con ``texto``, más vendidos primero"""
+        return self.indice.buscar(texto, limite) if self.indice else []
+
+    def producto(self, producto_id):
+        return self._productos.get(producto_id)
+
+    def precio(self, producto_id):
+        producto = self._productos.get(producto_id)
+        return producto.precio if producto else None
+
+    def stock(self, producto_id):
+        producto = self._productos.get(producto_id)
+        return producto.stock if producto else 0
+
+    def disponibles(self):
+        """Productos con stock, en el mismo orden que la tabla"""
+        return [producto for producto in self._productos.values() if producto.stock > 0]
+
+    def __len__(self):
+        return len(self._productos)
+
+    def __contains__(self, producto_id):
+        return producto_id in self._productos
@@ -0,0 +1,126 @@
+"""Comandas para cocina y barra, sin dependencias de Qt.
+
+Cada confirmación de una orden que cambia cantidades genera una comanda con
+solo la diferencia: ``+2 Pizza`` si se agregaron, ``-1 Café`` si se quitaron.
+Se escribe en la misma transacción que la confirmación (``registrar_comanda``),
+así la cocina nunca ve una comanda de algo que no se confirmó.
+
+Las líneas se reparten por la estación de su producto (``productos.estacion``)
+y cada estación lleva su propio estado de preparación. Cada cambio de estado
+toma una ``secuencia`` mayor que todas las anteriores: ``novedades(desde)``
+devuelve solo lo que cambió después de ``desde``, sin releer las demás.
+"""
+from collections import namedtuple
+
+from database import obtener_pool
+
+ESTACION_PREDETERMINADA = "Cocina"
+ESTACIONES = ("Cocina", "Barra", "Postres")
+
+# Estados en el orden en que avanzan; "entregada" sale de la pantalla
+ESTADOS = ("pendiente", "preparando", "lista", "entregada")
+SIGUIENTE_ESTADO = dict(zip(ESTADOS, ESTADOS[1:]))
+
+Comanda = namedtuple("Comanda", "comanda_id estacion mesa creada estado secuencia lineas")
+LineaComanda = namedtuple("LineaComanda", "nombre cantidad")
+
+def registrar_comanda(cursor, orden_id, mesa, cambios):
+    """Guardar en la transacción de ``cursor`` la comanda con ``cambios``
+    [(producto_id, diferencia)]; devuelve su id, o None si no hay cambios"""
+    cambios = [(producto_id, diferencia) for producto_id, diferencia in cambios if diferencia]
+    if not cambios:
+        return None
+    cursor.execute("INSERT INTO comandas (orden_id, mesa) VALUES (?, ?)", (orden_id, mesa))
+    comanda_id = cursor.lastrowid
+    cursor.executemany("""
+        INSERT INTO comanda_lineas (comanda_id, linea, producto_id, nombre, estacion, cantidad)
+        SELECT ?, ?, id, nombre, estacion, ? FROM productos WHERE id = ?
+    """, [(comanda_id, linea, diferencia, producto_id)
+          for linea, (producto_id, diferencia) in enumerate(cambios, 1)])
+    cursor.execute(
+        "SELECT DISTINCT estacion FROM comanda_lineas WHERE comanda_id = ? ORDER BY estacion", (comanda_id,)
+    )
+    estaciones = [fila[0] for fila in cursor.fetchall()]
+    cursor.execute("SELECT COALESCE(MAX(secuencia), 0) FROM comanda_estaciones")
+    ultima = cursor.fetchone()[0]
+    cursor.executemany(
+        "INSERT INTO comanda_estaciones (comanda_id, estacion, secuencia) VALUES (?, ?, ?)",
+        [(comanda_id, estacion, ultima + i) for i, estacion in enumerate(estaciones, 1)]
+    )
+    return comanda_id
+
+def _agrupar(filas):
+    """Comandas a partir de filas (comanda, estación, mesa, creada, estado,
+    secuencia, nombre, cantidad) ordenadas por comanda"""
+    comandas = {}
+    for *cabecera, nombre, cantidad in filas:
+        clave = (cabecera[0], cabecera[1])
+        comanda = comandas.get(clave)
+        if comanda is None:
+            comanda = comandas[clave] = Comanda(*cabecera, [])
+        comanda.lineas.append(LineaComanda(nombre, cantidad))
+    return list(comandas.values())
+
+class ComandasService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def activas(self):
+        """(secuencia, comandas sin entregar); lo que cambie después de leerlas
+        se obtiene con ``novedades(secuencia)``"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT COALESCE(MAX(secuencia), 0) FROM comanda_estaciones")
+            secuencia = cursor.fetchone()[0]
+            cursor.execute("""
+                SELECT e.comanda_id, e.estacion, c.mesa, c.creada, e.estado, e.secuencia,
+                       l.nombre, l.cantidad
+                FROM comanda_estaciones e
+                JOIN comandas c ON c.id = e.comanda_id
+                JOIN comanda_lineas l ON l.comanda_id = e.comanda_id AND l.estacion = e.estacion
+                WHERE e.estado IN ('pendiente', 'preparando', 'lista')
+                ORDER BY e.comanda_id, e.estacion, l.linea
+            """)
+            return secuencia, _agrupar(cursor.fetchall())
+
+    def novedades(self, desde):
+        """Comandas nuevas o que cambiaron de estado después de la secuencia
+        ``desde``, en el orden en que cambiaron"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT e.comanda_id, e.estacion, c.mesa, c.creada, e.estado, e.secuencia,
+                       l.nombre, l.cantidad
+                FROM comanda_estaciones e
+                JOIN comandas c ON c.id = e.comanda_id
+                JOIN comanda_lineas l ON l.comanda_id = e.comanda_id AND l.estacion = e.estacion
+                WHERE e.secuencia > ?
+                ORDER BY e.secuencia, l.linea
+            """, (desde,))
+            return _agrupar(cursor.fetchall())
+
+    def cambiar_estado(self, comanda_id, estacion, estado):
+        """Pasar la comanda de la estación a ``estado``; devuelve si cambió"""
+        if estado not in ESTADOS:
+            raise ValueError(f"Estado desconocido: {estado}")
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+            cursor.execute("""
+                UPDATE comanda_estaciones
+                SET estado = ?, actualizado = CURRENT_TIMESTAMP,
+                    secuencia = (SELECT MAX(secuencia) FROM comanda_estaciones) + 1
+                WHERE comanda_id = ? AND estacion = ? AND estado != ?
+            """, (estado, comanda_id, estacion, estado))
+            conexion.commit()
+            return cursor.rowcount > 0
+
+    def avanzar(self, comanda):
+        """Pasar ``comanda`` al estado siguiente; devuelve el nuevo estado o None"""
+        estado = SIGUIENTE_ESTADO.get(comanda.estado)
+        if estado is None or not self.cambiar_estado(comanda.comanda_id, comanda.estacion, estado):
+            return None
+        return estado
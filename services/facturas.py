@@ -0,0 +1,67 @@
+"""Facturas emitidas y su detalle, sin dependencias de Qt.
+
+Al facturar, cada línea se copia a ``factura_detalles`` con el nombre, el
+precio y el impuesto de ese momento, en la misma transacción que la factura.
+Reimprimir una factura lee solo esa copia (una consulta por el índice único
+de ``numero_factura``), así muestra lo que se cobró aunque después cambien
+los productos.
+"""
+import datetime
+import os
+from collections import namedtuple
+
+from database import obtener_pool
+
+# Tasa de impuesto incluida en los precios (0.16 = 16 %)
+TASA_IMPUESTO = float(os.environ.get("RESTAURANTE_IMPUESTO", "0"))
+
+Factura = namedtuple("Factura", "numero fecha cliente mesa total impuesto lineas")
+LineaFactura = namedtuple("LineaFactura", "producto_id nombre precio cantidad subtotal impuesto")
+
+def impuesto_incluido(monto, tasa=TASA_IMPUESTO):
+    """Parte de ``monto`` (con impuesto incluido) que corresponde al impuesto"""
+    return round(monto * tasa / (1 + tasa), 2)
+
+def fecha_local(fecha):
+    """Fecha de SQLite (UTC, "YYYY-MM-DD HH:MM:SS") como dd/mm/YYYY HH:MM local"""
+    try:
+        momento = datetime.datetime.strptime(fecha, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        return fecha or ""
+    return momento.replace(tzinfo=datetime.timezone.utc).astimezone().strftime("%d/%m/%Y %H:%M")
+
+def detalles_factura(lineas, tasa=TASA_IMPUESTO):
+    """Filas de ``factura_detalles`` (sin ``factura_id``) para las líneas de una
+    ``Orden``: (linea, producto_id, nombre, precio, cantidad, subtotal, tasa, impuesto)"""
+    return [
+        (numero, linea['id'], linea['nombre'], linea['precio'], linea['cantidad'],
+         linea['subtotal'], tasa, impuesto_incluido(linea['subtotal'], tasa))
+        for numero, linea in enumerate(lineas, 1)
+    ]
+
+class FacturasService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def obtener(self, numero_factura):
+        """Factura con sus líneas tal como se cobraron, o None si no existe"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT f.numero_factura, f.fecha, f.cliente_nombre, m.numero, f.total, f.impuesto,
+                       d.producto_id, d.nombre, d.precio_unitario, d.cantidad, d.subtotal, d.impuesto
+                FROM facturas f
+                LEFT JOIN factura_detalles d ON d.factura_id = f.id
+                LEFT JOIN ordenes o ON o.id = f.orden_id
+                LEFT JOIN mesas m ON m.id = o.mesa_id
+                WHERE f.numero_factura = ?
+                ORDER BY d.linea
+            """, (numero_factura,))
+            filas = cursor.fetchall()
+        if not filas:
+            return None
+        lineas = [LineaFactura(*fila[6:]) for fila in filas if fila[7] is not None]
+        return Factura(*filas[0][:6], lineas)
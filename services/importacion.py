@@ -0,0 +1,316 @@
+"""Importación y exportación masiva de tablas en CSV o JSON Lines, sin Qt.
+
+La importación lee el archivo con un generador (una fila a la vez), valida
+cada fila y guarda las válidas por lotes: un ``executemany`` de UPSERT por
+lote, cada uno en su propia transacción corta, así las demás terminales
+siguen trabajando durante una importación larga. Una fila inválida no
+detiene la importación; queda en la lista de errores con su número de línea.
+La exportación recorre la tabla con ``fetchmany`` y escribe a medida que
+lee: la memoria no crece con el tamaño de la tabla.
+
+Cada tabla importable se describe en ``TABLAS`` con sus campos, la sentencia
+UPSERT (por su clave natural) y las consultas de exportación.
+"""
+import csv
+import json
+import math
+import os
+import unicodedata
+from collections import namedtuple
+
+import database
+from database import obtener_pool
+from services.cocina import ESTACION_PREDETERMINADA
+from services.movimientos import etiquetar_movimientos, ultimo_movimiento
+
+# Filas por transacción al importar y por lectura al exportar
+LOTE_IMPORTACION = 5000
+
+# Mayor entero que guarda una columna INTEGER de SQLite
+MAXIMO_ENTERO = 2 ** 63 - 1
+
+Campo = namedtuple("Campo", "nombre convertir obligatorio")
+Tabla = namedtuple("Tabla", "nombre campos upsert exportar contar")
+ErrorImportacion = namedtuple("ErrorImportacion", "linea campo mensaje")
+ResultadoImportacion = namedtuple("ResultadoImportacion", "leidas guardadas errores cancelada")
+
+def texto(valor):
+    valor = str(valor).strip()
+    if not valor:
+        raise ValueError("no puede estar vacío")
+    return valor
+
+def texto_opcional(valor):
+    return str(valor).strip() or None
+
+def _numero(valor):
+    """Número finito desde JSON o desde texto ("$ 1.234,50", "12,5", "7");
+    "inf", "nan" o "1e400" dan ``ValueError``"""
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        numero = valor
+    else:
+        valor = str(valor).strip().lstrip("$").strip()
+        if "," in valor:
+            # Coma decimal, con o sin punto de miles
+            valor = valor.replace(".", "").replace(",", ".")
+        numero = float(valor)
+    # Un entero de JSON demasiado grande para float da OverflowError
+    if not math.isfinite(numero):
+        raise ValueError(f"no es un número finito: {valor!r}")
+    return numero
+
+def decimal_positivo(valor):
+    try:
+        numero = round(float(_numero(valor)), 2)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"no es un número: {valor!r}")
+    if numero <= 0:
+        raise ValueError("debe ser mayor que cero")
+    return numero
+
+def _entero(valor):
+    try:
+        numero = _numero(valor)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"no es un número entero: {valor!r}")
+    if numero != int(numero):
+        raise ValueError(f"no es un número entero: {valor!r}")
+    if abs(numero) > MAXIMO_ENTERO:
+        raise ValueError(f"fuera de rango: {valor!r}")
+    return int(numero)
+
+def entero_no_negativo(valor):
+    numero = _entero(valor)
+    if numero < 0:
+        raise ValueError("no puede ser negativo")
+    return numero
+
+def entero_positivo(valor):
+    numero = _entero(valor)
+    if numero <= 0:
+        raise ValueError("debe ser mayor que cero")
+    return numero
+
+TABLAS = {
+    "productos": Tabla(
+        "productos",
+        (
+            Campo("nombre", texto, True),
+            Campo("precio", decimal_positivo, True),
+            Campo("stock", entero_no_negativo, True),
+            Campo("estacion", texto_opcional, False),
+            Campo("stock_minimo", entero_no_negativo, False),
+        ),
+        # Sin estación o stock mínimo en el archivo: los predeterminados al
+        # crear, los que ya tenía al actualizar
+        f"""
+            INSERT INTO productos (nombre, precio, stock, estacion, stock_minimo)
+            VALUES (:nombre, :precio, :stock, COALESCE(:estacion, '{ESTACION_PREDETERMINADA}'),
+                    COALESCE(:stock_minimo, 0))
+            ON CONFLICT (nombre) DO UPDATE SET
+                precio = excluded.precio,
+                stock = excluded.stock,
+                estacion = COALESCE(:estacion, estacion),
+                stock_minimo = COALESCE(:stock_minimo, stock_minimo)
+        """,
+        "SELECT id, nombre, precio, stock, estacion, stock_minimo FROM productos ORDER BY id",
+        "SELECT COUNT(*) FROM productos",
+    ),
+    "mesas": Tabla(
+        "mesas",
+        (
+            Campo("numero", entero_positivo, True),
+            Campo("seccion", texto_opcional, False),
+        ),
+        """
+            INSERT INTO mesas (numero, seccion)
+            VALUES (:numero, COALESCE(:seccion, 'Principal'))
+            ON CONFLICT (numero) DO UPDATE SET seccion = COALESCE(:seccion, seccion)
+        """,
+        "SELECT id, numero, seccion, estado, pos_x, pos_y FROM mesas ORDER BY id",
+        "SELECT COUNT(*) FROM mesas",
+    ),
+}
+
+def formato_archivo(ruta):
+    """"csv" o "jsonl" según la extensión de ``ruta``"""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"Formato no soportado: {extension or ruta} (use .csv o .jsonl)")
+
+def _normalizar(encabezado):
+    """"Estación " -> "estacion\""""
+    sin_tildes = unicodedata.normalize("NFKD", encabezado or "").encode("ascii", "ignore").decode()
+    return sin_tildes.strip().lower()
+
+def leer_csv(archivo):
+    """(línea, dict) por cada fila de un CSV con encabezado; acepta ``,`` o ``;``"""
+    muestra = archivo.read(4096)
+    archivo.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    lector = csv.reader(archivo, dialecto)
+    encabezado = [_normalizar(columna) for columna in next(lector, [])]
+    for fila in lector:
+        if any(valor.strip() for valor in fila):
+            yield lector.line_num, dict(zip(encabezado, fila))
+
+def leer_jsonl(archivo):
+    """(línea, dict) por cada objeto JSON; una línea inválida da (línea, ValueError)"""
+    for linea, contenido in enumerate(archivo, 1):
+        contenido = contenido.strip()
+        if not contenido:
+            continue
+        try:
+            datos = json.loads(contenido)
+        except ValueError as e:
+            yield linea, ValueError(f"JSON inválido: {e}")
+            continue
+        if not isinstance(datos, dict):
+            yield linea, ValueError("se esperaba un objeto JSON")
+            continue
+        yield linea, {_normalizar(clave): valor for clave, valor in datos.items()}
+
+def validar(tabla, datos):
+    """(fila lista para el UPSERT, [(campo, mensaje)])"""
+    fila, errores = {}, []
+    for campo in tabla.campos:
+        valor = datos.get(campo.nombre)
+        if valor is None or (isinstance(valor, str) and not valor.strip()):
+            if campo.obligatorio:
+                errores.append((campo.nombre, "falta el valor"))
+            fila[campo.nombre] = None
+            continue
+        try:
+            fila[campo.nombre] = campo.convertir(valor)
+        except ValueError as e:
+            errores.append((campo.nombre, str(e)))
+    return fila, errores
+
+def escribir_errores(errores, ruta):
+    """Guardar el reporte de errores de una importación como CSV"""
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(("linea", "campo", "error"))
+        escritor.writerows(errores)
+
+class ImportacionService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def importar(self, tabla, ruta, formato=None, lote=LOTE_IMPORTACION, progreso=None, cancelado=None):
+        """Importar ``ruta`` a ``tabla`` (nombre en ``TABLAS``).
+
+        ``progreso(bytes_leidos, bytes_totales)`` se llama después de cada
+        lote y ``cancelado()``, si devuelve True, detiene la importación al
+        terminar el lote en curso (lo ya guardado queda guardado).
+        """
+        tabla = TABLAS[tabla]
+        formato = formato or formato_archivo(ruta)
+        total = os.path.getsize(ruta)
+        leidas, guardadas, errores, pendientes = 0, 0, [], []
+
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo, self._conexion() as conexion:
+            filas = leer_csv(archivo) if formato == "csv" else leer_jsonl(archivo)
+            for linea, datos in filas:
+                leidas += 1
+                if isinstance(datos, Exception):
+                    errores.append(ErrorImportacion(linea, "", str(datos)))
+                    continue
+                fila, problemas = validar(tabla, datos)
+                if problemas:
+                    errores.extend(ErrorImportacion(linea, campo, mensaje) for campo, mensaje in problemas)
+                    continue
+                pendientes.append((linea, fila))
+                if len(pendientes) >= lote:
+                    guardadas += self._guardar(conexion, tabla, pendientes, errores)
+                    pendientes = []
+                    if progreso:
+                        # Posición del búfer de lectura: aproximada, suficiente para avanzar la barra
+                        progreso(archivo.buffer.tell(), total)
+                    if cancelado and cancelado():
+                        return ResultadoImportacion(leidas, guardadas, errores, True)
+            if pendientes:
+                guardadas += self._guardar(conexion, tabla, pendientes, errores)
+        if progreso:
+            progreso(total, total)
+        return ResultadoImportacion(leidas, guardadas, errores, False)
+
+    def _guardar(self, conexion, tabla, lote, errores):
+        """Guardar un lote [(línea, fila)]; devuelve cuántas filas se guardaron.
+
+        Si la base de datos rechaza alguna fila (una restricción o un
+        trigger), el lote se repite de a una fila para guardar las demás y
+        reportar la rechazada.
+        """
+        cursor = conexion.cursor()
+        conexion.execute("BEGIN IMMEDIATE")
+        desde = ultimo_movimiento(cursor)
+        try:
+            cursor.executemany(tabla.upsert, [fila for _, fila in lote])
+            guardadas = len(lote)
+        except database.Error:
+            conexion.rollback()
+            conexion.execute("BEGIN IMMEDIATE")
+            guardadas = 0
+            for linea, fila in lote:
+                # Cada sentencia fallida se revierte sola sin tocar el resto
+                try:
+                    cursor.execute(tabla.upsert, fila)
+                    guardadas += 1
+                except database.Error as e:
+                    errores.append(ErrorImportacion(linea, "", str(e)))
+        # Los cambios de stock que anotaron los triggers
+        etiquetar_movimientos(cursor, desde, "importacion")
+        conexion.commit()
+        return guardadas
+
+    def exportar(self, tabla, ruta, formato=None, lote=LOTE_IMPORTACION, progreso=None):
+        """Exportar ``tabla`` a ``ruta``; devuelve la cantidad de filas.
+
+        Se escribe a un archivo temporal que reemplaza a ``ruta`` al final:
+        si algo falla no queda un archivo a medias.
+        """
+        tabla = TABLAS[tabla]
+        formato = formato or formato_archivo(ruta)
+        temporal = ruta + ".tmp"
+        escritas = 0
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(tabla.contar)
+            total = cursor.fetchone()[0]
+            cursor.execute(tabla.exportar)
+            columnas = [descripcion[0] for descripcion in cursor.description]
+            try:
+                with open(temporal, "w", newline="", encoding="utf-8") as archivo:
+                    if formato == "csv":
+                        escritor = csv.writer(archivo)
+                        escritor.writerow(columnas)
+                        escribir = escritor.writerows
+                    else:
+                        def escribir(filas):
+                            archivo.writelines(
+                                json.dumps(dict(zip(columnas, fila)), ensure_ascii=False) + "\n" for fila in filas
+                            )
+                    while True:
+                        filas = cursor.fetchmany(lote)
+                        if not filas:
+                            break
+                        escribir(filas)
+                        escritas += len(filas)
+                        if progreso:
+                            progreso(escritas, total)
+                os.replace(temporal, ruta)
+            except BaseException:
+                if os.path.exists(temporal):
+                    os.remove(temporal)
+                raise
+        return escritas
@@ -0,0 +1,176 @@
+"""Operaciones sobre el catálogo de productos, sin dependencias de Qt"""
+import datetime
+from collections import namedtuple
+
+from database import obtener_pool
+from services.cocina import ESTACION_PREDETERMINADA
+
+DIAS_POPULARIDAD = 30
+
+Producto = namedtuple("Producto", "id nombre precio stock estacion stock_minimo",
+                      defaults=(ESTACION_PREDETERMINADA, 0))
+
+# Producto en el stock mínimo o por debajo (tabla ``alertas_stock``)
+Alerta = namedtuple("Alerta", "producto_id nombre stock stock_minimo desde")
+
+# Filas por página del inventario
+PAGINA_PRODUCTOS = 200
+
+# Columnas por las que se puede ordenar el inventario, todas con índice
+# (migraciones 12 y 14); el nombre se compara sin distinguir mayúsculas
+ORDENES_PRODUCTOS = {
+    "id": "id",
+    "nombre": "nombre COLLATE NOCASE",
+    "precio": "precio",
+    "stock": "stock",
+    "estacion": "estacion",
+    "stock_minimo": "stock_minimo",
+}
+
+# Mayor que cualquier carácter que pueda seguir a un prefijo
+FIN_PREFIJO = "\U0010ffff"
+
+def consultas_pagina(orden="nombre", descendente=False, filtro="", despues=None):
+    """Consultas [(sql, parámetros)] de una página del inventario, sin el
+    parámetro final de LIMIT; se ejecutan en orden hasta completar la página.
+
+    Paginación por clave: después de (valor, id) de la última fila leída van
+    primero las filas con el mismo valor y mayor id, y después las de valores
+    siguientes. Cada consulta es una búsqueda en el índice de la columna
+    (SQLite no busca con ``(columna, id) > (?, ?)`` en un índice de una
+    columna, recorrería desde el comienzo del valor).
+    """
+    columna = ORDENES_PRODUCTOS[orden]
+    direccion = "DESC" if descendente else "ASC"
+    mayor = "<" if descendente else ">"
+    condiciones, parametros = [], []
+    if filtro:
+        # Prefijo del nombre como rango sobre el índice NOCASE
+        condiciones.append("nombre COLLATE NOCASE >= ? AND nombre COLLATE NOCASE < ?")
+        parametros += [filtro, filtro + FIN_PREFIJO]
+    tramos = []
+    if despues is None:
+        tramos.append((condiciones, parametros))
+    else:
+        valor, producto_id = despues
+        tramos.append((condiciones + [f"{columna} = ?", f"id {mayor} ?"], parametros + [valor, producto_id]))
+        tramos.append((condiciones + [f"{columna} {mayor} ?"], parametros + [valor]))
+    return [
+        (f"SELECT id, nombre, precio, stock, estacion, stock_minimo FROM productos WHERE {' AND '.join(c) or '1'} "
+         f"ORDER BY {columna} {direccion}, id {direccion} LIMIT ?", p)
+        for c, p in tramos
+    ]
+
+class InventarioService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def listar_productos(self):
+        """Productos como tuplas (id, nombre, precio, stock, estacion, stock_minimo)"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT id, nombre, precio, stock, estacion, stock_minimo FROM productos")
+            return cursor.fetchall()
+
+    def pagina_productos(self, orden="nombre", descendente=False, filtro="", despues=None,
+                         limite=PAGINA_PRODUCTOS):
+        """Hasta ``limite`` ``Producto`` ordenados por ``orden`` (y por id),
+        cuyo nombre empieza con ``filtro``, a partir de la clave ``despues``
+        (valor de ``orden``, id) de la última fila ya leída"""
+        filas = []
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            for sql, parametros in consultas_pagina(orden, descendente, filtro, despues):
+                cursor.execute(sql, (*parametros, limite - len(filas)))
+                filas.extend(Producto(*fila) for fila in cursor.fetchall())
+                if len(filas) >= limite:
+                    break
+        return filas
+
+    def contar_productos(self, filtro=""):
+        """Cantidad de productos cuyo nombre empieza con ``filtro``"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            if filtro:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM productos WHERE nombre COLLATE NOCASE >= ? AND nombre COLLATE NOCASE < ?",
+                    (filtro, filtro + FIN_PREFIJO)
+                )
+            else:
+                cursor.execute("SELECT COUNT(*) FROM productos")
+            return cursor.fetchone()[0]
+
+    def productos_disponibles(self):
+        """Productos con stock como tuplas (id, nombre, precio)"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT id, nombre, precio FROM productos WHERE stock > 0")
+            return cursor.fetchall()
+
+    def ventas_recientes(self, dias=DIAS_POPULARIDAD):
+        """Unidades vendidas por producto en los últimos ``dias``: {id: cantidad}"""
+        desde = (datetime.datetime.utcnow() - datetime.timedelta(days=dias)).strftime("%Y-%m-%d %H:%M:%S")
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT d.producto_id, SUM(d.cantidad)
+                FROM ordenes o
+                JOIN orden_detalles d ON d.orden_id = o.id
+                WHERE o.fecha >= ?
+                GROUP BY d.producto_id
+            """, (desde,))
+            return dict(cursor.fetchall())
+
+    def consultar_stock(self, producto_id):
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT stock FROM productos WHERE id = ?", (producto_id,))
+            resultado = cursor.fetchone()
+            return resultado[0] if resultado else 0
+
+    def agregar_producto(self, nombre, precio, stock, estacion=ESTACION_PREDETERMINADA, stock_minimo=0):
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(
+                "INSERT INTO productos (nombre, precio, stock, estacion, stock_minimo) VALUES (?, ?, ?, ?, ?)",
+                (nombre, precio, stock, estacion, stock_minimo)
+            )
+            conexion.commit()
+            return cursor.lastrowid
+
+    def actualizar_producto(self, producto_id, nombre, precio, stock, estacion=None, stock_minimo=None):
+        """Sin ``estacion`` o ``stock_minimo`` el producto conserva los suyos"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                UPDATE productos
+                SET nombre = ?, precio = ?, stock = ?, estacion = COALESCE(?, estacion),
+                    stock_minimo = COALESCE(?, stock_minimo)
+                WHERE id = ?
+            """, (nombre, precio, stock, estacion, stock_minimo, producto_id))
+            conexion.commit()
+
+    def eliminar_producto(self, producto_id):
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
+            conexion.commit()
+
+    def alertas_stock(self):
+        """Productos en su stock mínimo o por debajo, los de menos stock primero.
+
+        Lee solo ``alertas_stock``, que los triggers mantienen con los
+        productos en alerta: no depende del tamaño del catálogo.
+        """
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT a.producto_id, p.nombre, p.stock, p.stock_minimo, a.desde
+                FROM alertas_stock a
+                JOIN productos p ON p.id = a.producto_id
+                ORDER BY p.stock, p.nombre
+            """)
+            return [Alerta(*fila) for fila in cursor.fetchall()]
@@ -0,0 +1,81 @@
+"""Operaciones sobre las mesas, sin dependencias de Qt"""
+from database import obtener_pool
+
+class MesasService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def listar_secciones(self):
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT DISTINCT seccion FROM mesas ORDER BY seccion")
+            return [fila[0] for fila in cursor.fetchall()]
+
+    def listar_mesas(self, seccion=None):
+        """Mesas como tuplas (id, numero, seccion, estado)"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            if seccion:
+                cursor.execute("""
+                    SELECT id, numero, seccion, estado
+                    FROM mesas
+                    WHERE seccion = ?
+                    ORDER BY numero
+                """, (seccion,))
+            else:
+                cursor.execute("SELECT id, numero, seccion, estado FROM mesas ORDER BY seccion, numero")
+            return cursor.fetchall()
+
+    def listar_plano(self):
+        """Mesas con su posición: (id, numero, seccion, estado, pos_x, pos_y)"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT id, numero, seccion, estado, pos_x, pos_y
+                FROM mesas
+                ORDER BY seccion, numero
+            """)
+            return cursor.fetchall()
+
+    def mover_mesa(self, mesa_id, pos_x, pos_y):
+        with self._conexion() as conexion:
+            conexion.execute(
+                "UPDATE mesas SET pos_x = ?, pos_y = ? WHERE id = ?",
+                (pos_x, pos_y, mesa_id)
+            )
+            conexion.commit()
+
+    def obtener_mesa(self, mesa_id):
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT id, numero, seccion, estado FROM mesas WHERE id = ?", (mesa_id,))
+            return cursor.fetchone()
+
+    def agregar_mesa(self, numero, seccion="Principal"):
+        """Devuelve False si ya existe una mesa con ese número"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+
+            # Verificar si la mesa ya existe
+            cursor.execute("SELECT COUNT(*) FROM mesas WHERE numero = ?", (numero,))
+            if cursor.fetchone()[0] > 0:
+                return False
+
+            # Insertar nueva mesa
+            cursor.execute(
+                "INSERT INTO mesas (numero, seccion) VALUES (?, ?)",
+                (numero, seccion)
+            )
+            conexion.commit()
+            return True
+
+    def eliminar_mesa(self, mesa_id):
+        """Devuelve False si la mesa está ocupada"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("DELETE FROM mesas WHERE id = ? AND estado != 'ocupada'", (mesa_id,))
+            conexion.commit()
+            return cursor.rowcount > 0
@@ -0,0 +1,242 @@
+"""Libro de movimientos de stock (kardex), sin dependencias de Qt.
+
+Cada cambio de ``productos.stock`` queda en ``movimientos_stock`` con su
+diferencia. Los anotan los triggers de la migración 13, así que ningún
+camino que cambie el stock puede olvidarlo; el que sabe por qué cambió (una
+venta, una importación) lo completa con ``etiquetar_movimientos`` dentro de
+su transacción.
+
+Una instantánea guarda el stock de todos los productos y el último
+movimiento que incluye. El stock de un producto en una fecha es el saldo de
+la última instantánea anterior más los movimientos entre esa instantánea y
+la siguiente que no pasen de la fecha: una búsqueda por clave y un rango
+corto del índice, sin recorrer la historia desde el principio.
+"""
+import datetime
+from collections import namedtuple
+
+from database import obtener_pool
+
+# Se toma una instantánea nueva cuando hay al menos estos movimientos desde la anterior
+MOVIMIENTOS_POR_INSTANTANEA = 5000
+
+MOTIVOS = ("inicial", "alta", "ajuste", "venta", "devolucion", "importacion", "baja", "ajuste_masivo")
+
+Movimiento = namedtuple("Movimiento", "id producto_id fecha cantidad motivo referencia")
+# ``instantanea`` es None cuando lo que no coincide con el libro es ``productos.stock``
+Descuadre = namedtuple("Descuadre", "producto_id libro stock instantanea")
+
+def texto_fecha(fecha):
+    """``fecha`` (datetime o texto) como la guarda CURRENT_TIMESTAMP, en UTC"""
+    if isinstance(fecha, datetime.datetime):
+        if fecha.tzinfo is not None:
+            fecha = fecha.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return fecha.strftime("%Y-%m-%d %H:%M:%S")
+    return fecha
+
+def ultimo_movimiento(cursor):
+    cursor.execute("SELECT COALESCE(MAX(id), 0) FROM movimientos_stock")
+    return cursor.fetchone()[0]
+
+def etiquetar_movimientos(cursor, desde, motivo, referencia=None):
+    """Poner ``motivo`` y ``referencia`` a los movimientos posteriores a
+    ``desde``, un ``ultimo_movimiento`` leído en la misma transacción de
+    escritura (con ``BEGIN IMMEDIATE`` esos movimientos son todos propios)"""
+    if motivo not in MOTIVOS:
+        raise ValueError(f"Motivo desconocido: {motivo}")
+    cursor.execute(
+        "UPDATE movimientos_stock SET motivo = ?, referencia = ? WHERE id > ?",
+        (motivo, referencia, desde)
+    )
+
+class MovimientosService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def historial(self, producto_id, limite=100):
+        """Últimos movimientos del producto, del más reciente al más antiguo"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT id, producto_id, fecha, cantidad, motivo, referencia
+                FROM movimientos_stock
+                WHERE producto_id = ?
+                ORDER BY id DESC
+                LIMIT ?
+            """, (producto_id, limite))
+            return [Movimiento(*fila) for fila in cursor.fetchall()]
+
+    def tomar_instantanea(self, minimo=1):
+        """Guardar el stock actual si hubo al menos ``minimo`` movimientos
+        desde la última instantánea; devuelve su id o None"""
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+            ultimo = ultimo_movimiento(cursor)
+            cursor.execute(
+                "SELECT movimiento FROM instantaneas_stock WHERE id = (SELECT MAX(id) FROM instantaneas_stock)"
+            )
+            anterior = cursor.fetchone()
+            if anterior is not None and ultimo - anterior[0] < minimo:
+                conexion.rollback()
+                return None
+            cursor.execute("INSERT INTO instantaneas_stock (movimiento) VALUES (?)", (ultimo,))
+            instantanea_id = cursor.lastrowid
+            # Con la escritura bloqueada, el stock de ``productos`` es exactamente
+            # la suma de los movimientos hasta ``ultimo``
+            cursor.execute("""
+                INSERT INTO saldos_stock (instantanea_id, producto_id, stock)
+                SELECT ?, id, stock FROM productos WHERE stock != 0
+            """, (instantanea_id,))
+            conexion.commit()
+            return instantanea_id
+
+    def _tramo(self, cursor, fecha):
+        """(instantánea, primer movimiento excluido, último incluido) para
+        calcular el stock en ``fecha``"""
+        cursor.execute("""
+            SELECT id, movimiento FROM instantaneas_stock
+            WHERE fecha <= ?
+            ORDER BY fecha DESC, id DESC
+            LIMIT 1
+        """, (fecha,))
+        instantanea = cursor.fetchone() or (None, 0)
+        cursor.execute("""
+            SELECT movimiento FROM instantaneas_stock
+            WHERE fecha > ?
+            ORDER BY fecha, id
+            LIMIT 1
+        """, (fecha,))
+        siguiente = cursor.fetchone()
+        hasta = siguiente[0] if siguiente else ultimo_movimiento(cursor)
+        return instantanea[0], instantanea[1], hasta
+
+    def stock_al(self, producto_id, fecha):
+        """Stock del producto en ``fecha`` (datetime o texto UTC)"""
+        fecha = texto_fecha(fecha)
+        with self._conexion() as conexion:
+            # Una sola lectura: una instantánea nueva no cambia el tramo a mitad
+            conexion.execute("BEGIN")
+            cursor = conexion.cursor()
+            instantanea_id, desde, hasta = self._tramo(cursor, fecha)
+            saldo = 0
+            if instantanea_id is not None:
+                cursor.execute(
+                    "SELECT stock FROM saldos_stock WHERE instantanea_id = ? AND producto_id = ?",
+                    (instantanea_id, producto_id)
+                )
+                fila = cursor.fetchone()
+                saldo = fila[0] if fila else 0
+            cursor.execute("""
+                SELECT COALESCE(SUM(cantidad), 0) FROM movimientos_stock
+                WHERE producto_id = ? AND id > ? AND id <= ? AND fecha <= ?
+            """, (producto_id, desde, hasta, fecha))
+            saldo += cursor.fetchone()[0]
+            conexion.commit()
+            return saldo
+
+    def stock_total_al(self, fecha):
+        """Stock de todos los productos en ``fecha``: {producto_id: stock},
+        sin los que tenían stock cero"""
+        fecha = texto_fecha(fecha)
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN")
+            cursor = conexion.cursor()
+            instantanea_id, desde, hasta = self._tramo(cursor, fecha)
+            saldos = {}
+            if instantanea_id is not None:
+                cursor.execute(
+                    "SELECT producto_id, stock FROM saldos_stock WHERE instantanea_id = ?", (instantanea_id,)
+                )
+                saldos = dict(cursor.fetchall())
+            cursor.execute("""
+                SELECT producto_id, SUM(cantidad) FROM movimientos_stock
+                WHERE id > ? AND id <= ? AND fecha <= ?
+                GROUP BY producto_id
+            """, (desde, hasta, fecha))
+            for producto_id, cantidad in cursor.fetchall():
+                saldos[producto_id] = saldos.get(producto_id, 0) + cantidad
+            conexion.commit()
+            return {producto_id: stock for producto_id, stock in saldos.items() if stock}
+
+    def verificar(self, completo=False):
+        """Comparar el libro con ``productos.stock``; devuelve los ``Descuadre``.
+
+        Sin ``completo`` se parte de la última instantánea. Con ``completo``
+        se suma el libro desde el principio y se revisan también todas las
+        instantáneas.
+        """
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN")
+            cursor = conexion.cursor()
+            if completo:
+                libro, descuadres = self._recorrer_libro(cursor)
+            else:
+                libro, descuadres = self._desde_instantanea(cursor), []
+            cursor.execute("SELECT id, stock FROM productos WHERE stock != 0")
+            stock = dict(cursor.fetchall())
+            conexion.commit()
+        for producto_id in sorted(libro.keys() | stock.keys()):
+            esperado, actual = libro.get(producto_id, 0), stock.get(producto_id, 0)
+            if esperado != actual:
+                descuadres.append(Descuadre(producto_id, esperado, actual, None))
+        return descuadres
+
+    def _desde_instantanea(self, cursor):
+        cursor.execute(
+            "SELECT id, movimiento FROM instantaneas_stock WHERE id = (SELECT MAX(id) FROM instantaneas_stock)"
+        )
+        instantanea_id, desde = cursor.fetchone() or (None, 0)
+        hasta = ultimo_movimiento(cursor)
+        libro = {}
+        if instantanea_id is not None:
+            cursor.execute(
+                "SELECT producto_id, stock FROM saldos_stock WHERE instantanea_id = ?", (instantanea_id,)
+            )
+            libro = dict(cursor.fetchall())
+        cursor.execute("""
+            SELECT producto_id, SUM(cantidad) FROM movimientos_stock
+            WHERE id > ? AND id <= ?
+            GROUP BY producto_id
+        """, (desde, hasta))
+        for producto_id, cantidad in cursor.fetchall():
+            libro[producto_id] = libro.get(producto_id, 0) + cantidad
+        return libro
+
+    def _recorrer_libro(self, cursor):
+        """Sumar el libro completo en orden, comparando cada instantánea al
+        llegar a su último movimiento"""
+        cursor.execute("SELECT id, movimiento FROM instantaneas_stock ORDER BY id")
+        instantaneas = cursor.fetchall()
+        libro, descuadres = {}, []
+
+        def comparar(instantanea_id):
+            lectura = cursor.connection.cursor()
+            lectura.execute(
+                "SELECT producto_id, stock FROM saldos_stock WHERE instantanea_id = ?", (instantanea_id,)
+            )
+            saldos = dict(lectura.fetchall())
+            for producto_id in sorted(saldos.keys() | {p for p, s in libro.items() if s}):
+                esperado, guardado = libro.get(producto_id, 0), saldos.get(producto_id, 0)
+                if esperado != guardado:
+                    descuadres.append(Descuadre(producto_id, esperado, guardado, instantanea_id))
+
+        pendientes = iter(instantaneas)
+        siguiente = next(pendientes, None)
+        cursor.execute("SELECT id, producto_id, cantidad FROM movimientos_stock ORDER BY id")
+        while True:
+            filas = cursor.fetchmany(5000)
+            for movimiento_id, producto_id, cantidad in filas:
+                while siguiente is not None and siguiente[1] < movimiento_id:
+                    comparar(siguiente[0])
+                    siguiente = next(pendientes, None)
+                libro[producto_id] = libro.get(producto_id, 0) + cantidad
+            if not filas:
+                break
+        while siguiente is not None:
+            comparar(siguiente[0])
+            siguiente = next(pendientes, None)
+        return libro, descuadres
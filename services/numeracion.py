@@ -0,0 +1,128 @@
+"""Números de factura consecutivos por caja y por día, sin dependencias de Qt.
+
+El último número entregado a cada (caja, fecha) se guarda en
+``secuencias_factura``. ``siguiente_numero`` lo avanza dentro de la misma
+transacción que inserta la factura: si la factura se revierte el número
+también, así la secuencia queda sin huecos ni repetidos aunque varias
+terminales facturen a la vez. Cada caja tiene su propia fila, de modo que las
+terminales no compiten por un mismo contador.
+
+``NumeradorFacturas`` reserva bloques de números de una vez y los entrega
+desde memoria, para facturar en ráfagas sin una escritura por número.
+"""
+import datetime
+import heapq
+import os
+import threading
+
+from database import obtener_pool
+
+# Caja (punto de venta) de esta terminal; cada terminal debería tener la suya
+CAJA = os.environ.get("RESTAURANTE_CAJA", "01")
+
+# Números que reserva cada ida a la base de datos de ``NumeradorFacturas``
+BLOQUE_NUMEROS = 50
+
+def fecha_hoy():
+    return datetime.date.today().strftime("%Y%m%d")
+
+def formatear(caja, fecha, numero):
+    return f"FACT-{fecha}-{caja}-{numero:06d}"
+
+def avanzar(cursor, caja, fecha, cantidad=1):
+    """Sumar ``cantidad`` a la secuencia dentro de la transacción de ``cursor``;
+    devuelve el último número reservado"""
+    cursor.execute("""
+        INSERT INTO secuencias_factura (caja, fecha, ultimo) VALUES (?, ?, ?)
+        ON CONFLICT (caja, fecha) DO UPDATE SET ultimo = ultimo + excluded.ultimo
+        RETURNING ultimo
+    """, (caja, fecha, cantidad))
+    return cursor.fetchall()[0][0]
+
+def siguiente_numero(cursor, caja=CAJA, fecha=None):
+    """Siguiente número de factura de la caja, tomado dentro de la transacción
+    de ``cursor`` (se descarta si esa transacción se revierte)"""
+    fecha = fecha or fecha_hoy()
+    return formatear(caja, fecha, avanzar(cursor, caja, fecha))
+
+class NumeradorFacturas:
+    """Entrega los números de una caja reservándolos por bloques.
+
+    Cada bloque se reserva en una transacción corta y sus números se entregan
+    desde memoria (es seguro usarlo desde varios hilos). El número de una
+    factura que no se pudo guardar se devuelve con ``devolver`` y es el
+    próximo en entregarse. ``cerrar`` devuelve a la base de datos lo que quedó
+    sin usar al final del bloque, así la secuencia sigue sin huecos.
+
+    Solo una terminal debe usar cada caja: si se cae con un bloque a medio
+    usar, quedan huecos al final de ese bloque.
+    """
+
+    def __init__(self, caja=CAJA, bloque=BLOQUE_NUMEROS, pool=None):
+        self.caja = caja
+        self.bloque = bloque
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._fecha = None
+        self._siguiente = 1
+        self._fin = 0
+        self._devueltos = []
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def tomar(self, fecha=None):
+        fecha = fecha or fecha_hoy()
+        with self._lock:
+            if fecha != self._fecha:
+                self._cerrar_bloque()
+                self._fecha = fecha
+            if self._devueltos:
+                numero = heapq.heappop(self._devueltos)
+            else:
+                if self._siguiente > self._fin:
+                    self._reservar_bloque()
+                numero = self._siguiente
+                self._siguiente += 1
+        return formatear(self.caja, fecha, numero)
+
+    def devolver(self, numero_factura):
+        """Volver a ofrecer un número cuya factura no se guardó"""
+        prefijo, numero = numero_factura.rsplit("-", 1)
+        with self._lock:
+            if prefijo == f"FACT-{self._fecha}-{self.caja}":
+                heapq.heappush(self._devueltos, int(numero))
+
+    def cerrar(self):
+        with self._lock:
+            self._cerrar_bloque()
+
+    def _reservar_bloque(self):
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            fin = avanzar(conexion.cursor(), self.caja, self._fecha, self.bloque)
+            conexion.commit()
+        self._siguiente = fin - self.bloque + 1
+        self._fin = fin
+
+    def _cerrar_bloque(self):
+        if self._fecha is None:
+            return
+        # Números sin usar al final del bloque (incluidos los devueltos)
+        sin_usar = set(self._devueltos)
+        sin_usar.update(range(self._siguiente, self._fin + 1))
+        ultimo = self._fin
+        while ultimo in sin_usar:
+            ultimo -= 1
+        if ultimo < self._fin:
+            with self._conexion() as conexion:
+                # Solo si nadie reservó después (la caja no se comparte)
+                conexion.execute("""
+                    UPDATE secuencias_factura SET ultimo = ?
+                    WHERE caja = ? AND fecha = ? AND ultimo = ?
+                """, (ultimo, self.caja, self._fecha, self._fin))
+                conexion.commit()
+        self._fecha = None
+        self._siguiente = 1
+        self._fin = 0
+        self._devueltos = []
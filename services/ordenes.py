@@ -0,0 +1,401 @@
+"""Ciclo de vida de las órdenes (abrir, agregar, confirmar, facturar) sin Qt"""
+import time
+import uuid
+
+from database import obtener_pool
+from services.cocina import registrar_comanda
+from services.facturas import detalles_factura
+from services.movimientos import etiquetar_movimientos, ultimo_movimiento
+from services.numeracion import CAJA, siguiente_numero
+from services.reportes import acumular_factura
+from services.reservas import ReservasService, StockInsuficiente, stock_disponible
+
+class Orden:
+    """Estado en memoria de la orden de una mesa.
+
+    Las líneas se guardan en un dict por id de producto (que conserva el
+    orden en que se agregaron); cada línea es un dict con ``id``, ``nombre``,
+    ``precio``, ``cantidad`` y ``subtotal``. El total se mantiene al agregar y
+    quitar, sin volver a sumar las líneas. ``originales`` guarda la cantidad
+    ya confirmada en la base de datos por producto, para calcular el
+    movimiento de stock al confirmar. ``sesion`` identifica las reservas de
+    stock de esta orden mientras se edita (ver ``services.reservas``).
+    """
+
+    def __init__(self, mesa):
+        self.mesa = mesa
+        self.sesion = uuid.uuid4().hex
+        self.orden_id = None
+        self.cliente = ""
+        self._lineas = {}
+        self._total = 0.0
+        self.originales = {}
+
+    @property
+    def lineas(self):
+        """Líneas en el orden en que se agregaron"""
+        return self._lineas.values()
+
+    @property
+    def total(self):
+        return self._total
+
+    def linea(self, producto_id):
+        return self._lineas.get(producto_id)
+
+    def cantidad(self, producto_id):
+        linea = self._lineas.get(producto_id)
+        return linea['cantidad'] if linea else 0
+
+    def agregar(self, producto_id, nombre, precio, cantidad):
+        """Sumar ``cantidad`` a la línea del producto (creándola si no existe);
+        devuelve la línea existente o None si es nueva"""
+        linea = self._lineas.get(producto_id)
+        if linea:
+            linea['cantidad'] += cantidad
+            subtotal = linea['cantidad'] * linea['precio']
+            self._total += subtotal - linea['subtotal']
+            linea['subtotal'] = subtotal
+        else:
+            self._lineas[producto_id] = {
+                'id': producto_id,
+                'nombre': nombre,
+                'precio': precio,
+                'cantidad': cantidad,
+                'subtotal': precio * cantidad
+            }
+            self._total += precio * cantidad
+        return linea
+
+    def cargar(self, producto_id, nombre, precio, cantidad, subtotal):
+        """Agregar una línea ya confirmada en la base de datos"""
+        self._lineas[producto_id] = {
+            'id': producto_id,
+            'nombre': nombre,
+            'precio': precio,
+            'cantidad': cantidad,
+            'subtotal': subtotal
+        }
+        self._total += subtotal
+        self.originales[producto_id] = cantidad
+
+    def quitar(self, producto_id):
+        linea = self._lineas.pop(producto_id, None)
+        if linea:
+            # Sin líneas el total es exactamente cero, sin residuos de redondeo
+            self._total = self._total - linea['subtotal'] if self._lineas else 0.0
+        return linea
+
+    def pendiente(self, producto_id, cantidad=0):
+        """Unidades a reservar para sumar ``cantidad`` a la línea del
+        producto: lo que la orden pide por encima de lo ya confirmado
+        (``originales``), que es lo que descontará ``confirmar``"""
+        return self.cantidad(producto_id) + cantidad - self.originales.get(producto_id, 0)
+
+    def cambios_stock(self):
+        """Diferencia de cantidades respecto a lo confirmado: {producto_id: delta}"""
+        cambios = {}
+        for linea in self.lineas:
+            cambios[linea['id']] = linea['cantidad'] - self.originales.get(linea['id'], 0)
+        for producto_id, cantidad in self.originales.items():
+            if producto_id not in cambios:
+                cambios[producto_id] = -cantidad
+        return cambios
+
+    def copia(self):
+        orden = Orden(self.mesa)
+        orden.sesion = self.sesion
+        orden.orden_id = self.orden_id
+        orden.cliente = self.cliente
+        orden._lineas = {producto_id: dict(linea) for producto_id, linea in self._lineas.items()}
+        orden._total = self._total
+        orden.originales = dict(self.originales)
+        return orden
+
+    def limpiar(self):
+        self.orden_id = None
+        self.cliente = ""
+        self._lineas = {}
+        self._total = 0.0
+        self.originales = {}
+
+class OrdenService:
+    """Operaciones sobre las órdenes de la caja ``caja``.
+
+    Con ``numerador`` (un ``NumeradorFacturas``) los números de factura salen
+    de bloques reservados de antemano; sin él, cada factura toma el suyo
+    dentro de su propia transacción.
+    """
+
+    def __init__(self, pool=None, caja=CAJA, numerador=None):
+        self._pool = pool
+        self.caja = caja
+        self.numerador = numerador
+        self.reservas = ReservasService(pool)
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def abrir(self, mesa):
+        """Orden de la mesa, cargando la abierta en la base de datos si existe"""
+        orden = Orden(mesa)
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT id, cliente_nombre
+                FROM ordenes
+                WHERE mesa_id = ? AND estado = 'abierta'
+            """, (mesa[0],))
+            fila = cursor.fetchone()
+            if not fila:
+                return orden
+
+            orden.orden_id, orden.cliente = fila
+
+            # Obtener productos de la orden
+            cursor.execute("""
+                SELECT p.id, p.nombre, p.precio, d.cantidad, d.subtotal
+                FROM orden_detalles d
+                JOIN productos p ON d.producto_id = p.id
+                WHERE d.orden_id = ?
+            """, (orden.orden_id,))
+            for fila in cursor.fetchall():
+                orden.cargar(*fila)
+        return orden
+
+    def reservar(self, sesion, producto_id, pendiente):
+        """Dejar reservadas para ``sesion`` ``pendiente`` unidades del
+        producto (el total, ver ``Orden.pendiente``); con 0 o menos se libera.
+
+        Recibe solo valores: el total se calcula donde vive la ``Orden``
+        (en las vistas, el hilo de la interfaz), no en el hilo que reserva.
+        Lanza ``StockInsuficiente`` si no alcanza.
+        """
+        self.reservas.reservar(sesion, producto_id, pendiente)
+
+    def liberar_reservas(self, orden):
+        self.reservas.liberar(orden.sesion)
+
+    def agregar_linea(self, orden, producto_id, nombre, precio, cantidad):
+        self.reservar(orden.sesion, producto_id, orden.pendiente(producto_id, cantidad))
+        orden.agregar(producto_id, nombre, precio, cantidad)
+
+    def confirmar(self, orden):
+        """Registrar o actualizar la orden abierta de la mesa; devuelve su id.
+
+        Solo se escriben las diferencias con lo guardado: las líneas nuevas,
+        las que cambiaron y las quitadas, y el stock de los productos cuya
+        cantidad cambió, cada grupo en un ``executemany`` y todo dentro de
+        una transacción ``BEGIN IMMEDIATE``. Las diferencias se calculan
+        contra la base de datos (no contra ``originales``), así que también
+        son correctas si otra terminal modificó la orden.
+
+        Las cantidades que cambiaron van a cocina como una comanda
+        (``services.cocina``) en la misma transacción.
+
+        El stock que se descuenta no puede tocar lo reservado por otras
+        sesiones; las reservas propias de los productos confirmados se
+        convierten en el descuento y se borran en la misma transacción (las
+        de otros productos, agregados mientras tanto, siguen vigentes).
+
+        Al terminar, ``orden.originales`` refleja lo confirmado.
+        """
+        mesa_id = orden.mesa[0]
+        total = orden.total
+        ahora = time.time()
+        with self._conexion() as conexion:
+            # Tomar el bloqueo de escritura desde el principio: lo leído abajo
+            # no puede cambiar antes de escribir
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+
+            # Verificar si ya existe una orden para esta mesa
+            cursor.execute("SELECT id FROM ordenes WHERE mesa_id = ? AND estado = 'abierta'", (mesa_id,))
+            orden_existente = cursor.fetchone()
+
+            if orden_existente:
+                # Actualizar orden existente (si cambió algo)
+                orden_id = orden_existente[0]
+                cursor.execute("""
+                    UPDATE ordenes
+                    SET cliente_nombre = ?, total = ?
+                    WHERE id = ? AND (cliente_nombre IS NOT ? OR total IS NOT ?)
+                """, (orden.cliente, total, orden_id, orden.cliente, total))
+            else:
+                # Crear nueva orden
+                cursor.execute("""
+                    INSERT INTO ordenes (mesa_id, cliente_nombre, estado, total)
+                    VALUES (?, ?, ?, ?)
+                """, (mesa_id, orden.cliente, 'abierta', total))
+                orden_id = cursor.lastrowid
+
+            # Actualizar estado de la mesa
+            cursor.execute("""
+                UPDATE mesas SET estado = 'ocupada' WHERE id = ? AND estado != 'ocupada'
+            """, (mesa_id,))
+
+            # Líneas guardadas: {producto_id: (cantidad, subtotal)}
+            cursor.execute("""
+                SELECT producto_id, cantidad, subtotal
+                FROM orden_detalles
+                WHERE orden_id = ?
+            """, (orden_id,))
+            guardadas = {producto_id: (cantidad, subtotal) for producto_id, cantidad, subtotal in cursor.fetchall()}
+
+            insertar, modificar, descontar, devolver, comanda = [], [], [], [], []
+            for linea in orden.lineas:
+                producto_id = linea['id']
+                anterior = guardadas.pop(producto_id, None)
+                if anterior is None:
+                    insertar.append((orden_id, producto_id, linea['cantidad'], linea['subtotal']))
+                elif anterior != (linea['cantidad'], linea['subtotal']):
+                    modificar.append((linea['cantidad'], linea['subtotal'], orden_id, producto_id))
+
+                diferencia = linea['cantidad'] - (anterior[0] if anterior else 0)
+                comanda.append((producto_id, diferencia))
+                if diferencia > 0:
+                    descontar.append((diferencia, producto_id, producto_id, ahora, orden.sesion, diferencia))
+                elif diferencia < 0:
+                    devolver.append((-diferencia, producto_id))
+
+            # Lo que queda en ``guardadas`` se quitó de la orden
+            eliminar = [(orden_id, producto_id) for producto_id in guardadas]
+            devolver.extend((cantidad, producto_id) for producto_id, (cantidad, _) in guardadas.items())
+            comanda.extend((producto_id, -cantidad) for producto_id, (cantidad, _) in guardadas.items())
+
+            # Los triggers anotan cada cambio de stock; aquí se les pone el motivo
+            desde = ultimo_movimiento(cursor)
+
+            # Descontar stock solo donde alcanza sin tocar lo reservado por
+            # otras sesiones; si falta en alguno se revierte todo
+            if descontar:
+                cursor.executemany("""
+                    UPDATE productos
+                    SET stock = stock - ?
+                    WHERE id = ? AND stock - (
+                        SELECT COALESCE(SUM(cantidad), 0) FROM reservas_stock
+                        WHERE producto_id = ? AND expira > ? AND sesion != ?
+                    ) >= ?
+                """, descontar)
+                if cursor.rowcount < len(descontar):
+                    conexion.rollback()
+                    raise self._stock_faltante(conexion, descontar, orden.sesion, ahora)
+                etiquetar_movimientos(cursor, desde, "venta", orden_id)
+                desde = ultimo_movimiento(cursor)
+            if devolver:
+                cursor.executemany("UPDATE productos SET stock = stock + ? WHERE id = ?", devolver)
+                etiquetar_movimientos(cursor, desde, "devolucion", orden_id)
+
+            if eliminar:
+                cursor.executemany("DELETE FROM orden_detalles WHERE orden_id = ? AND producto_id = ?", eliminar)
+            if modificar:
+                cursor.executemany("""
+                    UPDATE orden_detalles
+                    SET cantidad = ?, subtotal = ?
+                    WHERE orden_id = ? AND producto_id = ?
+                """, modificar)
+            if insertar:
+                cursor.executemany("""
+                    INSERT INTO orden_detalles (orden_id, producto_id, cantidad, subtotal)
+                    VALUES (?, ?, ?, ?)
+                """, insertar)
+
+            # La cocina recibe solo lo que cambió
+            registrar_comanda(cursor, orden_id, orden.mesa[1], comanda)
+
+            cursor.executemany(
+                "DELETE FROM reservas_stock WHERE sesion = ? AND producto_id = ?",
+                [(orden.sesion, producto_id) for producto_id, _ in comanda]
+            )
+            conexion.commit()
+
+        orden.orden_id = orden_id
+        orden.originales = {linea['id']: linea['cantidad'] for linea in orden.lineas}
+        return orden_id
+
+    def _stock_faltante(self, conexion, descontar, sesion, ahora):
+        """``StockInsuficiente`` del primer producto que no alcanza"""
+        cursor = conexion.cursor()
+        for diferencia, producto_id, *_ in descontar:
+            nombre, disponible = stock_disponible(cursor, producto_id, sesion, ahora)
+            if disponible < diferencia:
+                return StockInsuficiente(nombre or f"producto {producto_id}", disponible)
+        return StockInsuficiente("", 0)
+
+    def facturar(self, orden, numero_factura=None):
+        """Facturar lo confirmado de la orden y liberar la mesa; devuelve
+        (numero_factura, total).
+
+        La factura sale de ``orden_detalles``, no de las líneas en memoria:
+        lo que no se confirmó no descontó stock y no se cobra. Lanza
+        ``ValueError`` si la orden no tiene nada confirmado.
+        """
+        tomado = None
+        if numero_factura is None and self.numerador is not None:
+            numero_factura = tomado = self.numerador.tomar()
+        try:
+            with self._conexion() as conexion:
+                # Las líneas leídas no pueden cambiar antes de facturarlas
+                conexion.execute("BEGIN IMMEDIATE")
+                cursor = conexion.cursor()
+                if numero_factura is None:
+                    numero_factura = siguiente_numero(cursor, self.caja)
+                total = self._registrar_factura(cursor, orden, numero_factura)
+                conexion.commit()
+        except BaseException:
+            # El número no se usó: que lo tome la próxima factura
+            if tomado is not None:
+                self.numerador.devolver(tomado)
+            raise
+        return numero_factura, total
+
+    def _registrar_factura(self, cursor, orden, numero_factura):
+        """Registrar la factura de las líneas confirmadas; devuelve el total"""
+        # Como en la migración 10: el precio unitario sale del subtotal cobrado
+        cursor.execute("""
+            SELECT d.producto_id, COALESCE(p.nombre, 'Producto ' || d.producto_id), d.cantidad, d.subtotal
+            FROM orden_detalles d
+            LEFT JOIN productos p ON p.id = d.producto_id
+            WHERE d.orden_id = ?
+            ORDER BY d.id
+        """, (orden.orden_id,))
+        lineas = [
+            {'id': producto_id, 'nombre': nombre, 'cantidad': cantidad, 'subtotal': subtotal,
+             'precio': subtotal / cantidad if cantidad else 0.0}
+            for producto_id, nombre, cantidad, subtotal in cursor.fetchall()
+        ]
+        if not lineas:
+            raise ValueError("La orden no tiene productos confirmados")
+        total = sum(linea['subtotal'] for linea in lineas)
+        detalles = detalles_factura(lineas)
+        impuesto = round(sum(detalle[-1] for detalle in detalles), 2)
+
+        # Crear factura con la copia de sus líneas tal como se cobran
+        cursor.execute("""
+            INSERT INTO facturas (orden_id, numero_factura, cliente_nombre, total, impuesto)
+            VALUES (?, ?, ?, ?, ?)
+        """, (orden.orden_id, numero_factura, orden.cliente, total, impuesto))
+        factura_id = cursor.lastrowid
+        cursor.executemany("""
+            INSERT INTO factura_detalles
+                (factura_id, linea, producto_id, nombre, precio_unitario, cantidad, subtotal, tasa_impuesto, impuesto)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(factura_id, *detalle) for detalle in detalles])
+
+        # Los reportes leen los resúmenes, que se actualizan con la factura
+        acumular_factura(cursor, factura_id)
+
+        # Actualizar estado de la orden
+        cursor.execute("""
+            UPDATE ordenes SET estado = 'facturada'
+            WHERE id = ?
+        """, (orden.orden_id,))
+
+        # Liberar mesa
+        cursor.execute("""
+            UPDATE mesas SET estado = 'libre'
+            WHERE id = ?
+        """, (orden.mesa[0],))
+
+        cursor.execute("DELETE FROM reservas_stock WHERE sesion = ?", (orden.sesion,))
+        return total
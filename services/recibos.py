@@ -0,0 +1,142 @@
+"""Recibos de factura en texto de ancho fijo, sin dependencias de Qt.
+
+La plantilla es texto con un renglón por línea del recibo:
+
+- ``^texto`` centrado, ``>texto`` alineado a la derecha, ``*texto`` título
+  (centrado, en negrita y a doble tamaño); sin prefijo va a la izquierda.
+- ``---`` separador del ancho del recibo.
+- ``@lineas`` las líneas de la factura (cantidad, nombre y subtotal).
+- ``?campo renglón`` el renglón solo si ``campo`` no está vacío ni es cero.
+- Los campos (``{numero}``, ``{total:.2f}``...) se reemplazan con
+  ``datos_factura``.
+
+``PlantillaRecibo`` la analiza una sola vez y guarda los renglones ya
+preparados; ``obtener_plantilla`` la mantiene en caché (y la vuelve a leer si
+cambia el archivo). Con los renglones se arma el recibo en texto plano
+(``a_texto``) o en bytes ESC/POS para impresoras térmicas (``a_escpos``).
+"""
+import os
+import string
+import threading
+
+from services.facturas import fecha_local
+
+# Caracteres por renglón: 48 en papel de 80 mm, 32 en papel de 58 mm
+ANCHO_RECIBO = int(os.environ.get("RESTAURANTE_ANCHO_RECIBO", "42"))
+
+PLANTILLA_RECIBO = """\
+*RESTAURANTE
+^Factura {numero}
+---
+Fecha: {fecha}
+Mesa: {mesa}
+Cliente: {cliente}
+---
+@lineas
+---
+?impuesto >Impuesto incluido: ${impuesto:.2f}
+*TOTAL ${total:.2f}
+---
+^¡Gracias por su visita!
+"""
+
+PREFIJOS = {"^": "centro", ">": "derecha", "*": "titulo"}
+
+def datos_factura(factura):
+    """Campos de una ``services.facturas.Factura`` para la plantilla"""
+    return {
+        "numero": factura.numero,
+        "fecha": fecha_local(factura.fecha),
+        "mesa": factura.mesa if factura.mesa is not None else "-",
+        "cliente": factura.cliente,
+        "total": factura.total,
+        "impuesto": factura.impuesto or 0.0,
+        "lineas": factura.lineas,
+    }
+
+class PlantillaRecibo:
+    """Plantilla analizada: una lista de pasos que producen (texto, estilo)"""
+
+    def __init__(self, texto=PLANTILLA_RECIBO, ancho=ANCHO_RECIBO):
+        self.ancho = ancho
+        self._pasos = [self._compilar(renglon) for renglon in texto.splitlines()]
+
+    def _compilar(self, renglon):
+        if renglon.startswith("?"):
+            campo, _, resto = renglon[1:].partition(" ")
+            paso = self._compilar(resto)
+            return lambda datos: paso(datos) if datos.get(campo) else ()
+        if renglon.strip() == "---":
+            separador = ("-" * self.ancho, "izquierda")
+            return lambda datos: (separador,)
+        if renglon.strip() == "@lineas":
+            return self._lineas
+        estilo = PREFIJOS.get(renglon[:1])
+        formato = renglon[1:] if estilo else renglon
+        campos = [campo for _, campo, _, _ in string.Formatter().parse(formato) if campo]
+        if not campos:
+            fijo = ((formato, estilo or "izquierda"),)
+            return lambda datos: fijo
+        formatear = formato.format_map
+        estilo = estilo or "izquierda"
+        return lambda datos: ((formatear(datos), estilo),)
+
+    def _lineas(self, datos):
+        renglones = []
+        for linea in datos["lineas"]:
+            derecha = f" ${linea.subtotal:.2f}"
+            izquierda = f"{linea.cantidad} x {linea.nombre}"
+            espacio = self.ancho - len(derecha)
+            renglones.append((izquierda[:espacio].ljust(espacio) + derecha, "izquierda"))
+        return renglones
+
+    def renderizar(self, datos):
+        """Renglones (texto, estilo) del recibo para ``datos``"""
+        renglones = []
+        for paso in self._pasos:
+            renglones.extend(paso(datos))
+        return renglones
+
+_plantillas = {}
+_lock_plantillas = threading.Lock()
+
+def obtener_plantilla(ruta=None, ancho=ANCHO_RECIBO):
+    """Plantilla de ``ruta`` (o la incluida) ya analizada, desde la caché"""
+    modificado = os.path.getmtime(ruta) if ruta else None
+    clave = (ruta, ancho)
+    with _lock_plantillas:
+        guardada = _plantillas.get(clave)
+        if guardada is None or guardada[0] != modificado:
+            if ruta:
+                with open(ruta, encoding="utf-8") as archivo:
+                    texto = archivo.read()
+            else:
+                texto = PLANTILLA_RECIBO
+            guardada = (modificado, PlantillaRecibo(texto, ancho))
+            _plantillas[clave] = guardada
+        return guardada[1]
+
+def a_texto(renglones, ancho=ANCHO_RECIBO):
+    alinear = {"izquierda": str.ljust, "centro": str.center, "titulo": str.center, "derecha": str.rjust}
+    return "\n".join(alinear[estilo](texto, ancho).rstrip() for texto, estilo in renglones) + "\n"
+
+# Comandos ESC/POS
+ESC_INICIAR = b"\x1b@"
+ESC_CODIGO_PC850 = b"\x1bt\x02"
+ESC_ALINEAR = {"izquierda": b"\x1ba\x00", "centro": b"\x1ba\x01", "titulo": b"\x1ba\x01", "derecha": b"\x1ba\x02"}
+ESC_TITULO = b"\x1bE\x01\x1d!\x11"
+ESC_NORMAL = b"\x1bE\x00\x1d!\x00"
+ESC_CORTAR = b"\x1bd\x04\x1dV\x01"
+
+def a_escpos(renglones):
+    """Bytes ESC/POS del recibo, en la página de códigos PC850"""
+    partes = [ESC_INICIAR, ESC_CODIGO_PC850]
+    for texto, estilo in renglones:
+        partes.append(ESC_ALINEAR[estilo])
+        contenido = texto.encode("cp850", "replace") + b"\n"
+        if estilo == "titulo":
+            partes += (ESC_TITULO, contenido, ESC_NORMAL)
+        else:
+            partes.append(contenido)
+    partes.append(ESC_CORTAR)
+    return b"".join(partes)
@@ -0,0 +1,201 @@
+"""Reportes de ventas sobre resúmenes precalculados, sin dependencias de Qt.
+
+Cada factura se suma al facturar, en la misma transacción, a los resúmenes
+por día, hora, producto y sección de la migración 16 (``acumular_factura``).
+Los reportes leen solo esos resúmenes: un mes son unos cientos de filas
+aunque el historial de ``facturas`` y ``factura_detalles`` tenga millones.
+
+Las fechas de los resúmenes son locales (``date(fecha, 'localtime')``).
+``reconstruir_resumenes`` los vuelve a calcular desde las facturas, para
+bases cargadas sin pasar por la facturación o si se cambia la zona horaria.
+"""
+import datetime
+from collections import namedtuple
+
+from database import obtener_pool
+
+PERIODOS = ("Hoy", "Últimos 7 días", "Este mes", "Mes anterior")
+
+# Productos en el ranking del tablero
+PRODUCTOS_TABLERO = 10
+
+# Resúmenes por día local, con la sentencia que borra sus filas desde un día
+BORRAR_RESUMENES = {
+    tabla: f"DELETE FROM {tabla} WHERE fecha >= ?"
+    for tabla in ("ventas_dia", "ventas_hora", "ventas_producto", "ventas_seccion")
+}
+
+Resumen = namedtuple("Resumen", "facturas total impuesto")
+VentaDia = namedtuple("VentaDia", "fecha facturas total")
+VentaHora = namedtuple("VentaHora", "hora facturas total")
+VentaProducto = namedtuple("VentaProducto", "producto_id nombre cantidad total")
+VentaSeccion = namedtuple("VentaSeccion", "seccion facturas total")
+Tablero = namedtuple("Tablero", "desde hasta resumen dias horas productos secciones")
+
+def texto_dia(dia):
+    """``dia`` (date o texto) como se guarda en los resúmenes: YYYY-MM-DD"""
+    return dia.isoformat() if isinstance(dia, datetime.date) else dia
+
+def rango_periodo(periodo, hoy=None):
+    """(desde, hasta) inclusive de uno de ``PERIODOS``"""
+    hoy = hoy or datetime.date.today()
+    if periodo == "Hoy":
+        return hoy, hoy
+    if periodo == "Últimos 7 días":
+        return hoy - datetime.timedelta(days=6), hoy
+    if periodo == "Este mes":
+        return hoy.replace(day=1), hoy
+    if periodo == "Mes anterior":
+        fin = hoy.replace(day=1) - datetime.timedelta(days=1)
+        return fin.replace(day=1), fin
+    raise ValueError(f"Período desconocido: {periodo}")
+
+def acumular_factura(cursor, factura_id):
+    """Sumar la factura (ya insertada, con su detalle) a los resúmenes; va
+    en la transacción que la registra"""
+    cursor.execute("""
+        INSERT INTO ventas_dia (fecha, facturas, total, impuesto)
+        SELECT date(fecha, 'localtime'), 1, total, impuesto FROM facturas WHERE id = ?
+        ON CONFLICT (fecha) DO UPDATE SET
+            facturas = facturas + excluded.facturas,
+            total = ROUND(total + excluded.total, 2),
+            impuesto = ROUND(impuesto + excluded.impuesto, 2)
+    """, (factura_id,))
+    cursor.execute("""
+        INSERT INTO ventas_hora (fecha, hora, facturas, total)
+        SELECT date(fecha, 'localtime'), CAST(strftime('%H', fecha, 'localtime') AS INTEGER), 1, total
+        FROM facturas WHERE id = ?
+        ON CONFLICT (fecha, hora) DO UPDATE SET
+            facturas = facturas + excluded.facturas,
+            total = ROUND(total + excluded.total, 2)
+    """, (factura_id,))
+    cursor.execute("""
+        INSERT INTO ventas_producto (fecha, producto_id, nombre, cantidad, total)
+        SELECT date(f.fecha, 'localtime'), COALESCE(d.producto_id, 0), d.nombre, d.cantidad, d.subtotal
+        FROM factura_detalles d
+        JOIN facturas f ON f.id = d.factura_id
+        WHERE d.factura_id = ?
+        ON CONFLICT (fecha, producto_id) DO UPDATE SET
+            nombre = excluded.nombre,
+            cantidad = cantidad + excluded.cantidad,
+            total = ROUND(total + excluded.total, 2)
+    """, (factura_id,))
+    cursor.execute("""
+        INSERT INTO ventas_seccion (fecha, seccion, facturas, total)
+        SELECT date(f.fecha, 'localtime'), COALESCE(m.seccion, ''), 1, f.total
+        FROM facturas f
+        LEFT JOIN ordenes o ON o.id = f.orden_id
+        LEFT JOIN mesas m ON m.id = o.mesa_id
+        WHERE f.id = ?
+        ON CONFLICT (fecha, seccion) DO UPDATE SET
+            facturas = facturas + excluded.facturas,
+            total = ROUND(total + excluded.total, 2)
+    """, (factura_id,))
+
+def reconstruir_resumenes(cursor, desde=None):
+    """Recalcular los resúmenes desde las facturas, todos o a partir del
+    día local ``desde``; devuelve las filas de ``ventas_dia`` escritas"""
+    dia, inicio = "", ""
+    if desde is not None:
+        dia = texto_dia(desde)
+        # Medianoche local del día, en UTC como ``facturas.fecha``: el rango
+        # usa el índice de la fecha
+        medianoche = datetime.datetime.combine(datetime.date.fromisoformat(dia), datetime.time())
+        inicio = medianoche.astimezone(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    for sql in BORRAR_RESUMENES.values():
+        cursor.execute(sql, (dia,))
+    cursor.execute("""
+        INSERT INTO ventas_dia (fecha, facturas, total, impuesto)
+        SELECT date(fecha, 'localtime'), COUNT(*), ROUND(SUM(total), 2), ROUND(SUM(impuesto), 2)
+        FROM facturas
+        WHERE fecha >= ?
+        GROUP BY 1
+    """, (inicio,))
+    dias = cursor.rowcount
+    cursor.execute("""
+        INSERT INTO ventas_hora (fecha, hora, facturas, total)
+        SELECT date(fecha, 'localtime'), CAST(strftime('%H', fecha, 'localtime') AS INTEGER),
+               COUNT(*), ROUND(SUM(total), 2)
+        FROM facturas
+        WHERE fecha >= ?
+        GROUP BY 1, 2
+    """, (inicio,))
+    cursor.execute("""
+        INSERT INTO ventas_producto (fecha, producto_id, nombre, cantidad, total)
+        SELECT date(f.fecha, 'localtime'), COALESCE(d.producto_id, 0), MAX(d.nombre),
+               SUM(d.cantidad), ROUND(SUM(d.subtotal), 2)
+        FROM facturas f
+        JOIN factura_detalles d ON d.factura_id = f.id
+        WHERE f.fecha >= ?
+        GROUP BY 1, 2
+    """, (inicio,))
+    cursor.execute("""
+        INSERT INTO ventas_seccion (fecha, seccion, facturas, total)
+        SELECT date(f.fecha, 'localtime'), COALESCE(m.seccion, ''), COUNT(*), ROUND(SUM(f.total), 2)
+        FROM facturas f
+        LEFT JOIN ordenes o ON o.id = f.orden_id
+        LEFT JOIN mesas m ON m.id = o.mesa_id
+        WHERE f.fecha >= ?
+        GROUP BY 1, 2
+    """, (inicio,))
+    return dias
+
+class ReportesService:
+    def __init__(self, pool=None):
+        self._pool = pool
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def tablero(self, desde, hasta, productos=PRODUCTOS_TABLERO):
+        """``Tablero`` de ventas entre los días locales ``desde`` y ``hasta``
+        (inclusive), leído de los resúmenes en una sola lectura"""
+        rango = (texto_dia(desde), texto_dia(hasta))
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN")
+            cursor = conexion.cursor()
+            cursor.execute("""
+                SELECT fecha, facturas, total FROM ventas_dia
+                WHERE fecha >= ? AND fecha <= ?
+                ORDER BY fecha
+            """, rango)
+            dias = [VentaDia(*fila) for fila in cursor.fetchall()]
+            cursor.execute("""
+                SELECT COALESCE(SUM(facturas), 0), ROUND(COALESCE(SUM(total), 0), 2),
+                       ROUND(COALESCE(SUM(impuesto), 0), 2)
+                FROM ventas_dia
+                WHERE fecha >= ? AND fecha <= ?
+            """, rango)
+            resumen = Resumen(*cursor.fetchone())
+            cursor.execute("""
+                SELECT hora, SUM(facturas), ROUND(SUM(total), 2) FROM ventas_hora
+                WHERE fecha >= ? AND fecha <= ?
+                GROUP BY hora
+                ORDER BY hora
+            """, rango)
+            horas = [VentaHora(*fila) for fila in cursor.fetchall()]
+            cursor.execute("""
+                SELECT producto_id, MAX(nombre), SUM(cantidad), ROUND(SUM(total), 2) FROM ventas_producto
+                WHERE fecha >= ? AND fecha <= ?
+                GROUP BY producto_id
+                ORDER BY 4 DESC
+                LIMIT ?
+            """, (*rango, productos))
+            mas_vendidos = [VentaProducto(*fila) for fila in cursor.fetchall()]
+            cursor.execute("""
+                SELECT seccion, SUM(facturas), ROUND(SUM(total), 2) FROM ventas_seccion
+                WHERE fecha >= ? AND fecha <= ?
+                GROUP BY seccion
+                ORDER BY 3 DESC
+            """, rango)
+            secciones = [VentaSeccion(*fila) for fila in cursor.fetchall()]
+            conexion.commit()
+        return Tablero(*rango, resumen, dias, horas, mas_vendidos, secciones)
+
+    def reconstruir(self, desde=None):
+        """Recalcular los resúmenes en una transacción; devuelve los días escritos"""
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            dias = reconstruir_resumenes(conexion.cursor(), desde)
+            conexion.commit()
+            return dias
@@ -0,0 +1,129 @@
+"""Reservas temporales de stock de las órdenes en edición, sin dependencias de Qt.
+
+Cada orden abierta en una terminal tiene una ``sesion``. Al agregar una línea
+se reserva lo que la orden pide por encima de lo ya confirmado, así otra
+terminal no puede vender esas unidades antes de que se confirme. El stock
+disponible para una sesión es ``productos.stock`` menos las reservas vigentes
+de las demás; la reserva se hace con un único ``INSERT ... SELECT``
+condicionado a ese disponible, dentro de ``BEGIN IMMEDIATE``.
+
+Las reservas vencen a los ``DURACION_RESERVA`` segundos: si una terminal se
+cierra sin liberarlas el stock vuelve a quedar disponible solo. Mientras la
+orden sigue abierta, la terminal las renueva.
+"""
+import time
+
+from database import obtener_pool
+
+DURACION_RESERVA = 15 * 60  # segundos
+
+class StockInsuficiente(Exception):
+    """No hay stock para cubrir la cantidad pedida de un producto"""
+
+    def __init__(self, nombre, disponible):
+        super().__init__(f"No hay suficiente stock de {nombre}")
+        self.nombre = nombre
+        self.disponible = disponible
+
+def stock_disponible(cursor, producto_id, sesion, ahora):
+    """(nombre, disponible) de un producto descontando las reservas vigentes
+    de otras sesiones; (None, 0) si el producto no existe"""
+    cursor.execute("""
+        SELECT nombre, stock - (
+            SELECT COALESCE(SUM(cantidad), 0) FROM reservas_stock
+            WHERE producto_id = ? AND expira > ? AND sesion != ?
+        )
+        FROM productos
+        WHERE id = ?
+    """, (producto_id, ahora, sesion, producto_id))
+    fila = cursor.fetchone()
+    return (fila[0], max(fila[1], 0)) if fila else (None, 0)
+
+class ReservasService:
+    def __init__(self, pool=None, duracion=DURACION_RESERVA):
+        self._pool = pool
+        self.duracion = duracion
+
+    def _conexion(self):
+        return (self._pool or obtener_pool()).conexion()
+
+    def reservar(self, sesion, producto_id, cantidad, ahora=None):
+        """Dejar reservadas ``cantidad`` unidades (el total, no un incremento)
+        de ``producto_id`` para ``sesion``.
+
+        Lanza ``StockInsuficiente`` si el stock menos lo reservado por otras
+        sesiones no alcanza; en ese caso la reserva anterior queda como estaba.
+        """
+        if cantidad <= 0:
+            self.liberar(sesion, producto_id)
+            return
+        ahora = time.time() if ahora is None else ahora
+        with self._conexion() as conexion:
+            conexion.execute("BEGIN IMMEDIATE")
+            cursor = conexion.cursor()
+            cursor.execute("DELETE FROM reservas_stock WHERE expira <= ?", (ahora,))
+            cursor.execute("""
+                INSERT INTO reservas_stock (sesion, producto_id, cantidad, expira)
+                SELECT ?, id, ?, ? FROM productos
+                WHERE id = ? AND stock - (
+                    SELECT COALESCE(SUM(cantidad), 0) FROM reservas_stock
+                    WHERE producto_id = ? AND expira > ? AND sesion != ?
+                ) >= ?
+                ON CONFLICT (sesion, producto_id)
+                DO UPDATE SET cantidad = excluded.cantidad, expira = excluded.expira
+            """, (sesion, cantidad, ahora + self.duracion, producto_id, producto_id, ahora, sesion, cantidad))
+            if cursor.rowcount == 0:
+                nombre, disponible = stock_disponible(cursor, producto_id, sesion, ahora)
+                conexion.rollback()
+                raise StockInsuficiente(nombre or f"producto {producto_id}", disponible)
+            conexion.commit()
+
+    def liberar(self, sesion, producto_id=None):
+        """Quitar las reservas de la sesión (o solo la de un producto)"""
+        with self._conexion() as conexion:
+            if producto_id is None:
+                conexion.execute("DELETE FROM reservas_stock WHERE sesion = ?", (sesion,))
+            else:
+                conexion.execute(
+                    "DELETE FROM reservas_stock WHERE sesion = ? AND producto_id = ?",
+                    (sesion, producto_id)
+                )
+            conexion.commit()
+
+    def renovar(self, sesion, ahora=None):
+        """Extender las reservas vigentes de la sesión; las vencidas no se
+        recuperan porque otra terminal pudo haber tomado ese stock"""
+        ahora = time.time() if ahora is None else ahora
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(
+                "UPDATE reservas_stock SET expira = ? WHERE sesion = ? AND expira > ?",
+                (ahora + self.duracion, sesion, ahora)
+            )
+            conexion.commit()
+            return cursor.rowcount
+
+    def disponible(self, producto_id, sesion="", ahora=None):
+        """Stock que ``sesion`` todavía puede reservar de ``producto_id``"""
+        ahora = time.time() if ahora is None else ahora
+        with self._conexion() as conexion:
+            return stock_disponible(conexion.cursor(), producto_id, sesion, ahora)[1]
+
+    def reservado(self, sesion):
+        """Reservas vigentes de la sesión: {producto_id: cantidad}"""
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute(
+                "SELECT producto_id, cantidad FROM reservas_stock WHERE sesion = ? AND expira > ?",
+                (sesion, time.time())
+            )
+            return dict(cursor.fetchall())
+
+    def purgar(self, ahora=None):
+        """Borrar las reservas vencidas; devuelve cuántas había"""
+        ahora = time.time() if ahora is None else ahora
+        with self._conexion() as conexion:
+            cursor = conexion.cursor()
+            cursor.execute("DELETE FROM reservas_stock WHERE expira <= ?", (ahora,))
+            conexion.commit()
+            return cursor.rowcount
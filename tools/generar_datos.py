@@ -0,0 +1,247 @@
+"""Generador de bases de datos sintéticas para medir rendimiento.
+
+Crea una base con el esquema real (``migraciones``) y la llena con un
+restaurante ficticio a la escala pedida: mesas repartidas en secciones, un
+menú con popularidad tipo Zipf y un historial de órdenes facturadas con picos
+de almuerzo y cena. Con la misma semilla el resultado es siempre el mismo.
+
+Uso::
+
+    python -m tools.generar_datos destino.db --escala restaurante
+    python -m tools.generar_datos destino.db --mesas 2000 --dias 30
+"""
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sys
+import time
+
+from database import crear_conexion
+from migraciones import aplicar_migraciones
+from services.reportes import reconstruir_resumenes
+
+ESCALAS = {
+    "pequena": dict(mesas=20, productos=200, dias=30, ordenes_dia=120, lineas=4),
+    "mediana": dict(mesas=100, productos=1000, dias=90, ordenes_dia=600, lineas=4),
+    # Objetivo de producción: 300 mesas, 4.000 productos, millones de líneas
+    "restaurante": dict(mesas=300, productos=4000, dias=365, ordenes_dia=1500, lineas=5),
+}
+
+SECCIONES = [
+    ("Principal", 0.35), ("Terraza", 0.25), ("Salón", 0.2),
+    ("Banquetes", 0.1), ("VIP", 0.05), ("Barra", 0.05),
+]
+
+# Estación que prepara cada categoría (el resto va a cocina)
+ESTACIONES_MENU = {"Bebidas": "Barra", "Vinos": "Barra", "Postres": "Postres"}
+
+# categoría: (platos base, rango de precio)
+MENU = {
+    "Bebidas": (["Café", "Té", "Jugo", "Limonada", "Gaseosa", "Agua", "Batido"], (1.5, 6)),
+    "Vinos": (["Tinto", "Blanco", "Rosado", "Espumante"], (18, 90)),
+    "Entradas": (["Empanada", "Ensalada", "Sopa", "Ceviche", "Croquetas", "Bruschetta"], (5, 14)),
+    "Platos fuertes": (["Lomo", "Pollo", "Salmón", "Risotto", "Pasta", "Hamburguesa",
+                        "Pizza", "Costillas"], (12, 38)),
+    "Postres": (["Flan", "Helado", "Tiramisú", "Brownie", "Cheesecake"], (4, 10)),
+}
+VARIANTES = ["de la casa", "clásico", "especial", "al grill", "tradicional", "gourmet",
+             "mediterráneo", "picante", "de temporada", "del chef"]
+
+# Peso relativo de cada hora de apertura: picos de almuerzo y cena
+PESO_HORAS = {
+    11: 2, 12: 9, 13: 14, 14: 10, 15: 4, 16: 2, 17: 2,
+    18: 3, 19: 6, 20: 12, 21: 14, 22: 8, 23: 3,
+}
+
+CLIENTES = ["Ana", "Luis", "María", "Carlos", "Sofía", "Jorge", "Lucía", "Pedro",
+            "Elena", "Diego", "Valeria", "Andrés", "Camila", "Javier", "Paula"]
+
+def _acumulados(pesos):
+    return list(itertools.accumulate(pesos))
+
+def generar_mesas(escala, rng):
+    nombres = [s for s, _ in SECCIONES]
+    acumulados = _acumulados([p for _, p in SECCIONES])
+    return [
+        (numero, rng.choices(nombres, cum_weights=acumulados)[0])
+        for numero in range(1, escala["mesas"] + 1)
+    ]
+
+def generar_productos(escala, rng):
+    """Filas (nombre, precio, stock, estacion, stock_minimo) con nombres únicos"""
+    categorias = list(MENU.items())
+    productos = []
+    for i in range(escala["productos"]):
+        categoria, (bases, (minimo, maximo)) = categorias[i % len(categorias)]
+        base = bases[(i // len(categorias)) % len(bases)]
+        variante = VARIANTES[(i // (len(categorias) * len(bases))) % len(VARIANTES)]
+        nombre = f"{base} {variante}"
+        ronda = i // (len(categorias) * len(bases) * len(VARIANTES))
+        if ronda:
+            nombre = f"{nombre} {ronda + 1}"
+        # Algunos productos agotados, la mayoría con existencias
+        stock = 0 if rng.random() < 0.03 else rng.randint(20, 5000)
+        productos.append((nombre, round(rng.uniform(minimo, maximo), 2), stock,
+                          ESTACIONES_MENU.get(categoria, "Cocina"), (i % 4) * 10))
+    return productos
+
+def generar_base_datos(ruta, escala=None, semilla=42, informar=print, **ajustes):
+    """Crear ``ruta`` con datos sintéticos; devuelve el conteo de filas por tabla"""
+    escala = dict(ESCALAS["pequena"] if escala is None else ESCALAS.get(escala, escala))
+    escala.update({k: v for k, v in ajustes.items() if v is not None})
+    rng = random.Random(semilla)
+
+    if os.path.exists(ruta):
+        raise FileExistsError(f"{ruta} ya existe")
+
+    conexion = crear_conexion(ruta)
+    aplicar_migraciones(conexion, informar=None)
+    # Carga masiva: la durabilidad no importa hasta el final
+    conexion.execute("PRAGMA synchronous = OFF")
+
+    inicio = time.perf_counter()
+    cursor = conexion.cursor()
+    cursor.execute("DELETE FROM mesas")
+    cursor.executemany("INSERT INTO mesas (numero, seccion) VALUES (?, ?)",
+                       generar_mesas(escala, rng))
+    cursor.executemany(
+        "INSERT INTO productos (nombre, precio, stock, estacion, stock_minimo) VALUES (?, ?, ?, ?, ?)",
+        generar_productos(escala, rng)
+    )
+    conexion.commit()
+
+    mesas = [fila[0] for fila in cursor.execute("SELECT id FROM mesas ORDER BY id")]
+    productos = cursor.execute("SELECT id, precio FROM productos ORDER BY id").fetchall()
+    nombres = dict(cursor.execute("SELECT id, nombre FROM productos"))
+
+    # Popularidad Zipf sobre un orden aleatorio del menú
+    populares = productos[:]
+    rng.shuffle(populares)
+    acumulados_productos = _acumulados([1 / (rango + 1) ** 1.1 for rango in range(len(populares))])
+    horas = list(PESO_HORAS)
+    acumulados_horas = _acumulados(PESO_HORAS.values())
+
+    orden_id = 0
+    factura_id = 0
+    lineas_totales = 0
+    hoy = datetime.date.today()
+    dias = escala["dias"]
+
+    for dia in range(dias, -1, -1):
+        fecha = hoy - datetime.timedelta(days=dia)
+        # Fines de semana con más movimiento
+        volumen = escala["ordenes_dia"] * (1.3 if fecha.weekday() >= 4 else 1.0)
+        # El día actual solo tiene las órdenes abiertas del turno
+        cantidad_ordenes = int(rng.gauss(volumen, volumen * 0.1)) if dia else 0
+
+        ordenes = []
+        detalles = []
+        facturas = []
+        detalles_facturas = []
+        for _ in range(max(cantidad_ordenes, 0)):
+            orden_id += 1
+            hora = rng.choices(horas, cum_weights=acumulados_horas)[0]
+            momento = datetime.datetime.combine(fecha, datetime.time(hora, rng.randrange(60), rng.randrange(60)))
+            marca = momento.strftime("%Y-%m-%d %H:%M:%S")
+            elegidos = {}
+            for _ in range(max(1, int(rng.expovariate(1 / escala["lineas"])))):
+                producto_id, precio = rng.choices(populares, cum_weights=acumulados_productos)[0]
+                cantidad = elegidos.get(producto_id, (0, precio))[0] + rng.choice((1, 1, 1, 2, 2, 3))
+                elegidos[producto_id] = (cantidad, precio)
+            total = 0.0
+            factura_id += 1
+            for linea, (producto_id, (cantidad, precio)) in enumerate(elegidos.items(), 1):
+                subtotal = round(cantidad * precio, 2)
+                total += subtotal
+                detalles.append((orden_id, producto_id, cantidad, subtotal))
+                detalles_facturas.append((factura_id, linea, producto_id, nombres[producto_id],
+                                          precio, cantidad, subtotal))
+            cliente = rng.choice(CLIENTES)
+            ordenes.append((orden_id, rng.choice(mesas), cliente, "facturada", round(total, 2), marca))
+            facturas.append((factura_id, orden_id, f"SIM-{fecha:%Y%m%d}-{factura_id:08d}",
+                             marca, cliente, round(total, 2)))
+
+        cursor.executemany(
+            "INSERT INTO ordenes (id, mesa_id, cliente_nombre, estado, total, fecha) VALUES (?, ?, ?, ?, ?, ?)",
+            ordenes
+        )
+        cursor.executemany(
+            "INSERT INTO orden_detalles (orden_id, producto_id, cantidad, subtotal) VALUES (?, ?, ?, ?)",
+            detalles
+        )
+        cursor.executemany(
+            "INSERT INTO facturas (id, orden_id, numero_factura, fecha, cliente_nombre, total) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            facturas
+        )
+        cursor.executemany(
+            "INSERT INTO factura_detalles (factura_id, linea, producto_id, nombre, precio_unitario, cantidad, subtotal) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            detalles_facturas
+        )
+        lineas_totales += len(detalles)
+        if dia % 30 == 0:
+            conexion.commit()
+            if informar:
+                informar(f"  {fecha}: {orden_id} órdenes, {lineas_totales} líneas "
+                         f"({time.perf_counter() - inicio:.1f} s)")
+
+    # Turno en curso: 40 % de las mesas ocupadas con una orden abierta
+    ahora = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ocupadas = rng.sample(mesas, int(len(mesas) * 0.4))
+    abiertas = []
+    detalles = []
+    for mesa_id in ocupadas:
+        orden_id += 1
+        total = 0.0
+        for producto_id, precio in {p[0]: p for p in rng.choices(
+                populares, cum_weights=acumulados_productos, k=escala["lineas"])}.values():
+            detalles.append((orden_id, producto_id, 1, precio))
+            total += precio
+        abiertas.append((orden_id, mesa_id, rng.choice(CLIENTES), "abierta", round(total, 2), ahora))
+    cursor.executemany(
+        "INSERT INTO ordenes (id, mesa_id, cliente_nombre, estado, total, fecha) VALUES (?, ?, ?, ?, ?, ?)",
+        abiertas
+    )
+    cursor.executemany(
+        "INSERT INTO orden_detalles (orden_id, producto_id, cantidad, subtotal) VALUES (?, ?, ?, ?)",
+        detalles
+    )
+    cursor.executemany("UPDATE mesas SET estado = 'ocupada' WHERE id = ?", [(m,) for m in ocupadas])
+    # Las facturas se cargaron sin pasar por la facturación
+    reconstruir_resumenes(cursor)
+    conexion.commit()
+
+    conexion.execute("PRAGMA synchronous = NORMAL")
+    conexion.execute("ANALYZE")
+    conteo = {
+        tabla: conexion.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+        for tabla in ("mesas", "productos", "ordenes", "orden_detalles", "facturas", "factura_detalles")
+    }
+    conexion.close()
+    if informar:
+        informar(f"Generado {ruta} en {time.perf_counter() - inicio:.1f} s: {conteo}")
+    return conteo
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Generar una base de datos sintética")
+    parser.add_argument("destino")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="pequena")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--mesas", type=int)
+    parser.add_argument("--productos", type=int)
+    parser.add_argument("--dias", type=int)
+    parser.add_argument("--ordenes-dia", dest="ordenes_dia", type=int)
+    parser.add_argument("--lineas", type=int)
+    args = parser.parse_args(argumentos)
+
+    generar_base_datos(
+        args.destino, args.escala, args.semilla,
+        mesas=args.mesas, productos=args.productos, dias=args.dias,
+        ordenes_dia=args.ordenes_dia, lineas=args.lineas
+    )
+
+if __name__ == "__main__":
+    sys.exit(main())
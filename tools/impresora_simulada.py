@@ -0,0 +1,76 @@
+"""Impresora de red simulada para probar la impresión de recibos sin hardware.
+
+Escucha en el puerto de las impresoras térmicas (9100), guarda cada trabajo
+recibido en una carpeta y muestra el texto del recibo sin los comandos
+ESC/POS. Para usarla con la aplicación::
+
+    python -m tools.impresora_simulada --puerto 9100 --carpeta impresos
+    RESTAURANTE_IMPRESORA=tcp:localhost:9100 RESTAURANTE_FORMATO_RECIBO=escpos python main.py
+"""
+import argparse
+import itertools
+import os
+import re
+import socketserver
+import threading
+
+# Comandos ESC/POS que usa ``services.recibos`` (con sus argumentos)
+COMANDOS = re.compile(rb"\x1b[@]|\x1b[taEd].|\x1d[!V].")
+
+def texto_escpos(datos):
+    """Texto legible de un trabajo ESC/POS"""
+    return COMANDOS.sub(b"", datos).decode("cp850", "replace")
+
+class ImpresoraSimulada(socketserver.ThreadingTCPServer):
+    """Servidor que acepta trabajos en crudo; ``trabajos`` guarda los bytes recibidos"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self, host="localhost", puerto=9100, carpeta=None, mostrar=False):
+        super().__init__((host, puerto), _Trabajo)
+        self.carpeta = carpeta
+        self.mostrar = mostrar
+        self.trabajos = []
+        self._contador = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def recibir(self, datos):
+        with self._lock:
+            numero = next(self._contador)
+            self.trabajos.append(datos)
+        if self.carpeta:
+            os.makedirs(self.carpeta, exist_ok=True)
+            with open(os.path.join(self.carpeta, f"trabajo_{numero:05d}.bin"), "wb") as archivo:
+                archivo.write(datos)
+        if self.mostrar:
+            print(f"--- trabajo {numero} ({len(datos)} bytes) ---")
+            print(texto_escpos(datos) if not datos.startswith(b"%PDF") else "(PDF)")
+
+class _Trabajo(socketserver.BaseRequestHandler):
+    def handle(self):
+        partes = []
+        while True:
+            parte = self.request.recv(65536)
+            if not parte:
+                break
+            partes.append(parte)
+        self.server.recibir(b"".join(partes))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--puerto", type=int, default=9100)
+    parser.add_argument("--carpeta", help="guardar cada trabajo recibido en esta carpeta")
+    args = parser.parse_args()
+
+    with ImpresoraSimulada(args.host, args.puerto, args.carpeta, mostrar=True) as servidor:
+        print(f"Impresora simulada en {args.host}:{args.puerto}")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
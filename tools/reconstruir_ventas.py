@@ -0,0 +1,42 @@
+"""Reconstruir los resúmenes de ventas desde las facturas.
+
+La facturación los mantiene al día; esto hace falta después de cargar
+facturas por otro camino o de cambiar la zona horaria del equipo (los
+resúmenes usan fechas locales). Con ``--desde AAAA-MM-DD`` se recalculan solo
+los días a partir de esa fecha.
+
+Uso::
+
+    python -m tools.reconstruir_ventas [ruta.db] [--desde AAAA-MM-DD]
+"""
+import argparse
+import datetime
+import sys
+import time
+
+import database
+from migraciones import version_actual
+from services.reportes import ReportesService
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Reconstruir los resúmenes de ventas")
+    parser.add_argument("ruta", nargs="?", default=database.RUTA_BD)
+    parser.add_argument("--desde", type=datetime.date.fromisoformat)
+    args = parser.parse_args(argumentos)
+
+    conexion = database.crear_conexion(args.ruta)
+    version = version_actual(conexion)
+    conexion.close()
+    if version < 16:
+        print(f"{args.ruta}: esquema en la versión {version}, sin resúmenes de ventas "
+              f"(aplicar antes: python migraciones.py {args.ruta})")
+        return 1
+
+    database.configurar_base_datos(args.ruta)
+    inicio = time.perf_counter()
+    dias = ReportesService().reconstruir(args.desde)
+    print(f"{dias} días de ventas resumidos en {time.perf_counter() - inicio:.2f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
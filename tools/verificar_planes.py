@@ -0,0 +1,151 @@
+"""Regresión de planes de consulta.
+
+Recorre el código de la aplicación, extrae cada sentencia SQL literal pasada a
+``execute``/``executemany`` y ejecuta ``EXPLAIN QUERY PLAN`` sobre una base de
+datos temporal con el esquema actual. Las sentencias que se arman en tiempo de
+ejecución se revisan en cada variante, pidiéndolas a las mismas funciones que
+las arman (``sentencias_generadas``). Falla (código de salida 1) si alguna
+sentencia recorre una tabla completa sin estar en ``ESCANEOS_PERMITIDOS``.
+
+Uso::
+
+    python -m tools.verificar_planes [-v]
+"""
+import ast
+import glob
+import itertools
+import os
+import re
+import sqlite3
+import sys
+
+from migraciones import aplicar_migraciones
+from services.ajustes import CAMPOS, MODOS, Ajuste, sentencias
+from services.importacion import TABLAS
+from services.inventario import ORDENES_PRODUCTOS, consultas_pagina
+from services.reportes import BORRAR_RESUMENES
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Archivos cuyo SQL se verifica
+ARCHIVOS = ["views/*.py", "services/*.py"]
+
+# Archivos cuyo SQL va a bases en memoria propias y no al esquema de la aplicación
+EXCLUIDOS = {"services/busqueda.py"}
+
+# Listados que por diseño devuelven la tabla completa (o todo un índice)
+ESCANEOS_PERMITIDOS = {
+    "SELECT DISTINCT seccion FROM mesas ORDER BY seccion",
+    "SELECT id, nombre, precio, stock, estacion, stock_minimo FROM productos",
+    "SELECT COUNT(*) FROM productos",
+    "SELECT id, nombre, precio FROM productos WHERE stock > 0",
+    "SELECT id, usuario, clave, rol FROM usuarios",
+    "SELECT id, numero, seccion, estado FROM mesas ORDER BY seccion, numero",
+    "SELECT id, numero, seccion, estado, pos_x, pos_y FROM mesas ORDER BY seccion, numero",
+    # Exportación de tablas completas (``services.importacion``)
+    "SELECT id, nombre, precio, stock, estacion, stock_minimo FROM productos ORDER BY id",
+    "SELECT id, numero, seccion, estado, pos_x, pos_y FROM mesas ORDER BY id",
+    "SELECT COUNT(*) FROM mesas",
+    # Solo tiene los productos en alerta (migración 14)
+    "SELECT a.producto_id, p.nombre, p.stock, p.stock_minimo, a.desde FROM alertas_stock a "
+    "JOIN productos p ON p.id = a.producto_id ORDER BY p.stock, p.nombre",
+    # Últimos ajustes masivos: recorre la tabla desde el final hasta el límite
+    "SELECT id, fecha, usuario, campo, modo, valor, filtro, estacion, productos, deshecho "
+    "FROM ajustes_masivos ORDER BY id DESC LIMIT ?",
+    # Instantáneas y verificación del libro de movimientos de stock
+    "INSERT INTO saldos_stock (instantanea_id, producto_id, stock) SELECT ?, id, stock FROM productos WHERE stock != 0",
+    "SELECT id, stock FROM productos WHERE stock != 0",
+    "SELECT id, movimiento FROM instantaneas_stock ORDER BY id",
+    "SELECT id, producto_id, cantidad FROM movimientos_stock ORDER BY id",
+}
+
+def normalizar(sql):
+    return re.sub(r"\s+", " ", sql).strip().rstrip(";")
+
+def extraer_sentencias(ruta):
+    """Sentencias SQL literales usadas en un archivo: [(linea, sql)]"""
+    with open(ruta, encoding="utf-8") as archivo:
+        arbol = ast.parse(archivo.read(), ruta)
+    sentencias = []
+    for nodo in ast.walk(arbol):
+        if (isinstance(nodo, ast.Call)
+                and isinstance(nodo.func, ast.Attribute)
+                and nodo.func.attr in ("execute", "executemany")
+                and nodo.args
+                and isinstance(nodo.args[0], ast.Constant)
+                and isinstance(nodo.args[0].value, str)):
+            sentencias.append((nodo.lineno, normalizar(nodo.args[0].value)))
+    return sentencias
+
+def sentencias_generadas():
+    """Sentencias armadas en tiempo de ejecución, una por variante:
+    [(origen, sql, completa)]; ``completa`` marca las variantes que por
+    diseño abarcan toda la tabla y pueden recorrerla"""
+    sentencias_ = []
+    # Páginas del inventario por cada columna, dirección, filtro y posición.
+    # La primera página sin filtro recorre el índice de la columna solo
+    # hasta el LIMIT
+    for orden, descendente, filtro, despues in itertools.product(
+            ORDENES_PRODUCTOS, (False, True), ("", "a"), (None, (0, 0))):
+        origen = f"consultas_pagina({orden!r}, descendente={descendente}, filtro={filtro!r}, despues={despues})"
+        completa = not filtro and despues is None
+        sentencias_.extend((origen, sql, completa) for sql, _ in consultas_pagina(orden, descendente, filtro, despues))
+    # Ajustes masivos por campo, modo y selección; sin filtro ni estación
+    # el ajuste es de todo el catálogo
+    for campo, modo, filtro, estacion in itertools.product(CAMPOS, MODOS, ("", "a"), (None, "Barra")):
+        ajuste = Ajuste(campo, modo, 1, filtro, estacion)
+        completa = not filtro and not estacion
+        sentencias_.extend((f"ajustes.{nombre} {ajuste}", sql, completa)
+                           for nombre, sql in sentencias(ajuste)._asdict().items())
+    sentencias_.extend((f"reconstruir_resumenes {tabla}", sql, False) for tabla, sql in BORRAR_RESUMENES.items())
+    for tabla in TABLAS.values():
+        sentencias_.extend((f"importacion {tabla.nombre}", sql, False)
+                           for sql in (tabla.upsert, tabla.exportar, tabla.contar))
+    return [(origen, normalizar(sql), completa) for origen, sql, completa in sentencias_]
+
+def escaneos(conexion, sql):
+    """Pasos del plan que recorren una tabla completa"""
+    nombres = re.findall(r":(\w+)", sql)
+    parametros = dict.fromkeys(nombres) if nombres else (None,) * sql.count("?")
+    plan = conexion.execute(f"EXPLAIN QUERY PLAN {sql}", parametros).fetchall()
+    return [fila[3] for fila in plan if fila[3].startswith("SCAN ")], plan
+
+def verificar(detallado=False):
+    conexion = sqlite3.connect(":memory:")
+    aplicar_migraciones(conexion, informar=None)
+
+    sentencias_ = []
+    for patron in ARCHIVOS:
+        for ruta in sorted(glob.glob(os.path.join(RAIZ, patron))):
+            relativa = os.path.relpath(ruta, RAIZ)
+            if relativa.replace(os.sep, "/") in EXCLUIDOS:
+                continue
+            sentencias_.extend((f"{relativa}:{linea}", sql, False) for linea, sql in extraer_sentencias(ruta))
+    sentencias_.extend(sentencias_generadas())
+
+    fallos = 0
+    revisadas = 0
+    for origen, sql, completa in sentencias_:
+        if not re.match(r"(SELECT|INSERT|UPDATE|DELETE|WITH)\b", sql, re.I):
+            continue
+        revisadas += 1
+        try:
+            recorridos, plan = escaneos(conexion, sql)
+        except sqlite3.Error as e:
+            print(f"ERROR {origen}: {e}\n    {sql}")
+            fallos += 1
+            continue
+        if recorridos and not completa and sql not in ESCANEOS_PERMITIDOS:
+            fallos += 1
+            print(f"SCAN  {origen}: {', '.join(recorridos)}\n    {sql}")
+        elif detallado:
+            print(f"OK    {origen}: {sql}")
+            for fila in plan:
+                print(f"        {fila[3]}")
+
+    conexion.close()
+    print(f"\n{revisadas} sentencias revisadas, {fallos} con recorrido completo")
+    return fallos == 0
+
+if __name__ == "__main__":
+    sys.exit(0 if verificar("-v" in sys.argv) else 1)
@@ -0,0 +1,51 @@
+"""Verificar el libro de movimientos de stock contra ``productos.stock``.
+
+Sin opciones parte de la última instantánea (rápido); con ``--completo``
+suma el libro desde el principio y revisa también cada instantánea. Con
+``--instantanea`` toma una instantánea nueva si la verificación no encontró
+descuadres. Sale con código 1 si hay descuadres.
+
+Uso::
+
+    python -m tools.verificar_stock [ruta.db] [--completo] [--instantanea]
+"""
+import sys
+import time
+
+import database
+from migraciones import version_actual
+from services.movimientos import MovimientosService
+
+def main(argumentos):
+    rutas = [argumento for argumento in argumentos if not argumento.startswith("--")]
+    ruta = rutas[0] if rutas else database.RUTA_BD
+
+    conexion = database.crear_conexion(ruta)
+    version = version_actual(conexion)
+    conexion.close()
+    if version < 13:
+        print(f"{ruta}: esquema en la versión {version}, sin libro de movimientos "
+              f"(aplicar antes: python migraciones.py {ruta})")
+        return 1
+
+    database.configurar_base_datos(ruta)
+    servicio = MovimientosService()
+    inicio = time.perf_counter()
+    descuadres = servicio.verificar(completo="--completo" in argumentos)
+    segundos = time.perf_counter() - inicio
+
+    for descuadre in descuadres:
+        donde = f"instantánea {descuadre.instantanea}" if descuadre.instantanea else "productos.stock"
+        print(f"producto {descuadre.producto_id}: el libro suma {descuadre.libro}, "
+              f"{donde} tiene {descuadre.stock}")
+    print(f"{len(descuadres)} descuadres ({segundos * 1000:.0f} ms)")
+
+    if descuadres:
+        return 1
+    if "--instantanea" in argumentos:
+        instantanea = servicio.tomar_instantanea()
+        print(f"instantánea {instantanea}" if instantanea else "sin movimientos desde la última instantánea")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,261 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QComboBox,
+    QDoubleSpinBox, QLineEdit, QPushButton, QLabel, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import Qt
+from ejecutor_bd import obtener_ejecutor
+from services.ajustes import FILAS_VISTA_PREVIA, Ajuste, AjustesService
+from services.cocina import ESTACIONES
+
+TODAS_ESTACIONES = "Todas"
+
+def describir(ajuste):
+    """Texto corto del ajuste: 'Precio +8 %', 'Stock -20'"""
+    valor = f"{ajuste.valor:+g}"
+    return f"{ajuste.campo.capitalize()} {valor}" + (" %" if ajuste.modo == "porcentaje" else "")
+
+def describir_seleccion(filtro, estacion):
+    partes = []
+    if filtro:
+        partes.append(f"nombre «{filtro}...»")
+    if estacion:
+        partes.append(estacion)
+    return ", ".join(partes) or "todos"
+
+def formatear(campo, valor):
+    return f"$ {valor:.2f}" if campo == "precio" else str(int(valor))
+
+class AjusteMasivoDialog(QDialog):
+    """Ajuste de precio o stock de todos los productos de una selección.
+
+    La vista previa y el ajuste se calculan en la base (``AjustesService``);
+    ``al_modificar`` se llama una vez por ajuste aplicado o deshecho.
+    """
+
+    def __init__(self, filtro="", usuario=None, al_modificar=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Ajuste masivo")
+        self.resize(720, 640)
+        self.servicio = AjustesService()
+        self.usuario = usuario
+        self.al_modificar = al_modificar
+        # Ajuste de la vista previa mostrada; None si cambió algún parámetro
+        self.previsto = None
+        self.ajustes = []
+        self.setup_ui(filtro)
+        self.cargar_historial()
+
+    def setup_ui(self, filtro):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
+
+        form = QFormLayout()
+        self.input_campo = QComboBox()
+        self.input_campo.addItem("Precio", "precio")
+        self.input_campo.addItem("Stock", "stock")
+        form.addRow("Ajustar:", self.input_campo)
+
+        self.input_modo = QComboBox()
+        self.input_modo.addItem("Porcentaje (%)", "porcentaje")
+        self.input_modo.addItem("Cantidad", "cantidad")
+        form.addRow("Modo:", self.input_modo)
+
+        self.input_valor = QDoubleSpinBox()
+        self.input_valor.setRange(-10000, 10000)
+        self.input_valor.setDecimals(2)
+        form.addRow("Valor (negativo para bajar):", self.input_valor)
+
+        self.input_filtro = QLineEdit(filtro)
+        self.input_filtro.setPlaceholderText("Todos los productos")
+        form.addRow("Nombre comienza con:", self.input_filtro)
+
+        self.input_estacion = QComboBox()
+        self.input_estacion.setEditable(True)
+        self.input_estacion.addItem(TODAS_ESTACIONES)
+        self.input_estacion.addItems(ESTACIONES)
+        form.addRow("Estación:", self.input_estacion)
+        layout.addLayout(form)
+
+        for senal in (self.input_campo.currentIndexChanged, self.input_modo.currentIndexChanged,
+                      self.input_valor.valueChanged, self.input_filtro.textChanged,
+                      self.input_estacion.currentTextChanged):
+            senal.connect(self.invalidar)
+
+        botones = QHBoxLayout()
+        self.btn_vista_previa = QPushButton("Vista previa")
+        self.btn_vista_previa.clicked.connect(self.vista_previa)
+        self.btn_aplicar = QPushButton("Aplicar")
+        self.btn_aplicar.setEnabled(False)
+        self.btn_aplicar.clicked.connect(self.aplicar)
+        botones.addWidget(self.btn_vista_previa)
+        botones.addWidget(self.btn_aplicar)
+        layout.addLayout(botones)
+
+        self.label_resumen = QLabel("Elija el ajuste y revise la vista previa antes de aplicarlo")
+        layout.addWidget(self.label_resumen)
+
+        self.tabla_cambios = self.crear_tabla(["Producto", "Actual", "Nuevo"])
+        layout.addWidget(self.tabla_cambios, 2)
+
+        layout.addWidget(QLabel("Ajustes recientes:"))
+        self.tabla_historial = self.crear_tabla(["Fecha", "Usuario", "Ajuste", "Productos", "Cantidad", "Estado"])
+        layout.addWidget(self.tabla_historial, 1)
+
+        self.btn_deshacer = QPushButton("Deshacer ajuste")
+        self.btn_deshacer.setToolTip("Revertir el ajuste seleccionado en la lista")
+        self.btn_deshacer.clicked.connect(self.deshacer)
+        layout.addWidget(self.btn_deshacer, 0, Qt.AlignRight)
+
+        self.setLayout(layout)
+
+    def crear_tabla(self, columnas):
+        tabla = QTableWidget(0, len(columnas))
+        tabla.setHorizontalHeaderLabels(columnas)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        tabla.verticalHeader().setVisible(False)
+        tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tabla.setSelectionMode(QAbstractItemView.SingleSelection)
+        return tabla
+
+    def ajuste(self):
+        estacion = self.input_estacion.currentText().strip()
+        return Ajuste(
+            self.input_campo.currentData(),
+            self.input_modo.currentData(),
+            self.input_valor.value(),
+            self.input_filtro.text().strip(),
+            None if estacion in ("", TODAS_ESTACIONES) else estacion
+        )
+
+    def invalidar(self):
+        self.previsto = None
+        self.btn_aplicar.setEnabled(False)
+
+    def vista_previa(self):
+        ajuste = self.ajuste()
+        self.btn_vista_previa.setEnabled(False)
+
+        def mostrar(vista):
+            self.btn_vista_previa.setEnabled(True)
+            self.tabla_cambios.setRowCount(len(vista.cambios))
+            for fila, cambio in enumerate(vista.cambios):
+                celdas = [cambio.nombre, formatear(ajuste.campo, cambio.anterior),
+                          formatear(ajuste.campo, cambio.nuevo)]
+                for columna, texto in enumerate(celdas):
+                    item = QTableWidgetItem(texto)
+                    if columna:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.tabla_cambios.setItem(fila, columna, item)
+            resumen = f"{describir(ajuste)}: cambian {vista.cambian} de {vista.seleccionados} productos seleccionados"
+            if vista.cambian > FILAS_VISTA_PREVIA:
+                resumen += f" (se muestran los primeros {FILAS_VISTA_PREVIA})"
+            self.label_resumen.setText(resumen)
+            # Un parámetro cambiado mientras se calculaba deja la vista vieja sin aplicar
+            if ajuste == self.ajuste() and vista.cambian:
+                self.previsto = (ajuste, vista.cambian)
+                self.btn_aplicar.setEnabled(True)
+
+        def fallar(error):
+            self.btn_vista_previa.setEnabled(True)
+            QMessageBox.critical(self, "Error", f"Error en la vista previa: {str(error)}")
+
+        obtener_ejecutor().enviar(
+            self.servicio.vista_previa, ajuste,
+            al_terminar=mostrar, al_fallar=fallar, clave=("ajuste-vista-previa", id(self))
+        )
+
+    def aplicar(self):
+        if self.previsto is None:
+            return
+        ajuste, cambian = self.previsto
+        respuesta = QMessageBox.question(
+            self,
+            "Confirmar ajuste",
+            f"¿Aplicar «{describir(ajuste)}» a {cambian} productos?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if respuesta != QMessageBox.Yes:
+            return
+        self.invalidar()
+        self.btn_vista_previa.setEnabled(False)
+
+        def al_terminar(resultado):
+            self.btn_vista_previa.setEnabled(True)
+            self.tabla_cambios.setRowCount(0)
+            if resultado is None:
+                self.label_resumen.setText("Ningún producto cambia con ese ajuste")
+                return
+            _, productos = resultado
+            self.label_resumen.setText(f"{describir(ajuste)} aplicado a {productos} productos")
+            self.cargar_historial()
+            if self.al_modificar:
+                self.al_modificar()
+
+        def al_fallar(error):
+            self.btn_vista_previa.setEnabled(True)
+            QMessageBox.critical(self, "Error", f"Error al aplicar el ajuste: {str(error)}")
+
+        obtener_ejecutor().enviar(
+            self.servicio.aplicar, ajuste, self.usuario,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+
+    def cargar_historial(self):
+        obtener_ejecutor().enviar(
+            self.servicio.recientes,
+            al_terminar=self.mostrar_historial,
+            al_fallar=lambda e: print(f"Error cargando ajustes masivos: {e}"),
+            clave=("ajustes-recientes", id(self))
+        )
+
+    def mostrar_historial(self, ajustes):
+        self.ajustes = ajustes
+        self.tabla_historial.setRowCount(len(ajustes))
+        for fila, ajuste in enumerate(ajustes):
+            celdas = [
+                ajuste.fecha,
+                ajuste.usuario or "",
+                describir(ajuste),
+                describir_seleccion(ajuste.filtro, ajuste.estacion),
+                str(ajuste.productos),
+                f"Deshecho {ajuste.deshecho}" if ajuste.deshecho else "Aplicado",
+            ]
+            for columna, texto in enumerate(celdas):
+                self.tabla_historial.setItem(fila, columna, QTableWidgetItem(texto))
+
+    def deshacer(self):
+        fila = self.tabla_historial.currentRow()
+        if not 0 <= fila < len(self.ajustes):
+            QMessageBox.warning(self, "Error", "Seleccione un ajuste para deshacer")
+            return
+        ajuste = self.ajustes[fila]
+        if ajuste.deshecho:
+            QMessageBox.warning(self, "Error", "Ese ajuste ya se deshizo")
+            return
+        detalle = ("El stock vuelve por diferencia: lo vendido desde el ajuste no se repone."
+                   if ajuste.campo == "stock" else
+                   "Solo vuelven al precio anterior los productos que no cambiaron de precio después.")
+        respuesta = QMessageBox.question(
+            self,
+            "Deshacer ajuste",
+            f"¿Deshacer «{describir(ajuste)}» ({ajuste.productos} productos)?\n{detalle}",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if respuesta != QMessageBox.Yes:
+            return
+
+        def al_terminar(revertidos):
+            self.cargar_historial()
+            self.invalidar()
+            if self.al_modificar:
+                self.al_modificar()
+            QMessageBox.information(self, "Éxito", f"Se revirtieron {revertidos} de {ajuste.productos} productos")
+
+        obtener_ejecutor().enviar(
+            self.servicio.deshacer, ajuste.id,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al deshacer el ajuste: {str(e)}")
+        )
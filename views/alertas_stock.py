@@ -0,0 +1,84 @@
+from PySide6.QtWidgets import QLabel
+from PySide6.QtCore import QObject, Signal
+from ejecutor_bd import obtener_ejecutor
+from services.inventario import InventarioService
+from vigilante_bd import obtener_vigilante
+
+# Productos que se nombran en el aviso; todos van en la descripción emergente
+NOMBRES_AVISO = 3
+LINEAS_DESCRIPCION = 30
+
+class AlertasCompartidas(QObject):
+    """Alertas de stock bajo leídas una vez por cambio para todas las pantallas.
+
+    Solo se lee ``alertas_stock`` (los productos en alerta, que mantienen los
+    triggers), así que releerla en cada cambio de ``productos`` no depende
+    del tamaño del catálogo.
+    """
+
+    actualizadas = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.servicio = InventarioService()
+        self.alertas = []
+        self.cargadas = False
+        obtener_vigilante().productos_cambiados.connect(self.recargar)
+        self.recargar()
+
+    def recargar(self):
+        obtener_ejecutor().enviar(
+            self.servicio.alertas_stock,
+            al_terminar=self.aplicar,
+            al_fallar=lambda e: print(f"Error cargando alertas de stock: {e}"),
+            clave=("alertas-stock", id(self))
+        )
+
+    def aplicar(self, alertas):
+        self.alertas = alertas
+        self.cargadas = True
+        self.actualizadas.emit(alertas)
+
+_alertas = None
+
+def obtener_alertas():
+    """Alertas compartidas por todas las pantallas (requiere QApplication)"""
+    global _alertas
+    if _alertas is None:
+        _alertas = AlertasCompartidas()
+    return _alertas
+
+class AvisoStockBajo(QLabel):
+    """Aviso con los productos en alerta; oculto mientras no haya ninguno"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: #ffcdd2;
+                color: #800020;
+                font-weight: bold;
+                border-radius: 5px;
+                padding: 6px;
+            }
+        """)
+        self.hide()
+        alertas = obtener_alertas()
+        alertas.actualizadas.connect(self.mostrar)
+        if alertas.cargadas:
+            self.mostrar(alertas.alertas)
+
+    def mostrar(self, alertas):
+        if not alertas:
+            self.hide()
+            return
+        nombres = ", ".join(f"{alerta.nombre} ({alerta.stock})" for alerta in alertas[:NOMBRES_AVISO])
+        resto = len(alertas) - NOMBRES_AVISO
+        self.setText(f"Stock bajo: {nombres}" + (f" y {resto} más" if resto > 0 else ""))
+        lineas = [f"{alerta.nombre}: {alerta.stock} (mínimo {alerta.stock_minimo})"
+                  for alerta in alertas[:LINEAS_DESCRIPCION]]
+        if len(alertas) > LINEAS_DESCRIPCION:
+            lineas.append(f"... y {len(alertas) - LINEAS_DESCRIPCION} más")
+        self.setToolTip("\n".join(lineas))
+        self.show()
@@ -0,0 +1,142 @@
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, Signal
+from PySide6.QtGui import QColor
+from ejecutor_bd import obtener_ejecutor
+from services.catalogo import Catalogo
+from vigilante_bd import obtener_vigilante
+
+COLOR_STOCK_BAJO = QColor("#c0392b")
+
+def stock_bajo(producto):
+    """Si el producto está en alerta (la condición de ``alertas_stock``)"""
+    return bool(producto.stock_minimo) and producto.stock <= producto.stock_minimo
+
+class ModeloCatalogo(QAbstractListModel):
+    """Productos disponibles como "nombre - $precio"; el id va en ``Qt.UserRole``.
+
+    Los que tienen stock bajo se muestran en rojo con lo que queda.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        producto = self._filas[index.row()]
+        if role == Qt.DisplayRole:
+            if stock_bajo(producto):
+                return f"{producto.nombre} - ${producto.precio:.2f} (quedan {producto.stock})"
+            return f"{producto.nombre} - ${producto.precio:.2f}"
+        if role == Qt.UserRole:
+            return producto.id
+        if role == Qt.ForegroundRole and stock_bajo(producto):
+            return COLOR_STOCK_BAJO
+        return None
+
+    def producto(self, fila):
+        return self._filas[fila] if 0 <= fila < len(self._filas) else None
+
+    def establecer(self, productos):
+        """Aplicar la lista nueva como eliminaciones, inserciones y cambios de
+        filas (nunca un reset), para que los combos conserven su selección.
+
+        Si lo que queda de la lista anterior no aparece en el mismo orden en
+        la nueva (p. ej. resultados de búsqueda reordenados) se hace un reset.
+        """
+        nuevos = {producto.id for producto in productos}
+        anteriores = {producto.id for producto in self._filas}
+        if ([p.id for p in self._filas if p.id in nuevos]
+                != [p.id for p in productos if p.id in anteriores]):
+            self.beginResetModel()
+            self._filas = list(productos)
+            self.endResetModel()
+            return
+
+        # Quitar, de abajo hacia arriba y por tramos, lo que ya no está
+        fila = len(self._filas) - 1
+        while fila >= 0:
+            if self._filas[fila].id in nuevos:
+                fila -= 1
+                continue
+            fin = fila
+            while fila >= 0 and self._filas[fila].id not in nuevos:
+                fila -= 1
+            self.beginRemoveRows(QModelIndex(), fila + 1, fin)
+            del self._filas[fila + 1:fin + 1]
+            self.endRemoveRows()
+
+        # Insertar lo nuevo en su lugar y actualizar lo que cambió
+        fila = 0
+        indice = 0
+        cambiadas = []
+        while indice < len(productos):
+            producto = productos[indice]
+            if fila < len(self._filas) and self._filas[fila].id == producto.id:
+                anterior = self._filas[fila]
+                if ((anterior.nombre, anterior.precio, stock_bajo(anterior) and anterior.stock)
+                        != (producto.nombre, producto.precio, stock_bajo(producto) and producto.stock)):
+                    cambiadas.append(fila)
+                self._filas[fila] = producto
+                fila += 1
+                indice += 1
+                continue
+            inicio = indice
+            siguiente = self._filas[fila].id if fila < len(self._filas) else None
+            while indice < len(productos) and productos[indice].id != siguiente:
+                indice += 1
+            self.beginInsertRows(QModelIndex(), fila, fila + indice - inicio - 1)
+            self._filas[fila:fila] = productos[inicio:indice]
+            self.endInsertRows()
+            fila += indice - inicio
+
+        if cambiadas:
+            self.dataChanged.emit(self.index(cambiadas[0]), self.index(cambiadas[-1]))
+
+class CatalogoCompartido(QObject):
+    """Catálogo cargado una vez por proceso y el modelo que lo muestra.
+
+    Se recarga en segundo plano (junto con el índice de búsqueda) cuando el
+    vigilante detecta cambios en ``productos`` o cuando el inventario avisa de
+    una edición.
+    """
+
+    actualizado = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.catalogo = Catalogo()
+        self.modelo = ModeloCatalogo(self)
+        obtener_vigilante().productos_cambiados.connect(self.recargar)
+        self.recargar()
+
+    def recargar(self):
+        obtener_ejecutor().enviar(
+            self.catalogo.leer_con_indice,
+            al_terminar=self.aplicar,
+            al_fallar=lambda e: print(f"Error cargando catálogo: {e}"),
+            clave=("catalogo", id(self))
+        )
+
+    def aplicar(self, resultado):
+        self.catalogo.establecer(*resultado)
+        self.modelo.establecer(self.catalogo.disponibles())
+        self.actualizado.emit()
+
+    def producto(self, producto_id):
+        return self.catalogo.producto(producto_id)
+
+    def buscar(self, texto):
+        return self.catalogo.buscar(texto)
+
+_catalogo = None
+
+def obtener_catalogo():
+    """Catálogo compartido por todas las órdenes (requiere QApplication)"""
+    global _catalogo
+    if _catalogo is None:
+        _catalogo = CatalogoCompartido()
+    return _catalogo
@@ -0,0 +1,310 @@
+import bisect
+import calendar
+import time
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+    QPushButton, QTableView, QHeaderView, QAbstractItemView, QMessageBox
+)
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide6.QtGui import QColor, QFont
+from ejecutor_bd import obtener_ejecutor
+from services.cocina import ESTACIONES, ComandasService
+from vigilante_bd import obtener_vigilante
+
+# Minutos de espera desde los que una comanda pendiente se marca como demorada
+MINUTOS_DEMORA = 15
+INTERVALO_ESPERA = 30000  # milisegundos entre actualizaciones de la columna "Espera"
+
+COLORES_ESTADO = {
+    "pendiente": QColor("#fff8e1"),
+    "preparando": QColor("#e3f2fd"),
+    "lista": QColor("#e8f5e9"),
+}
+COLOR_DEMORADA = QColor("#ffcdd2")
+
+def _segundos(creada):
+    """Marca de tiempo de SQLite (UTC) en segundos desde la época"""
+    try:
+        return calendar.timegm(time.strptime(creada, "%Y-%m-%d %H:%M:%S"))
+    except (TypeError, ValueError):
+        return time.time()
+
+class ModeloComandas(QAbstractTableModel):
+    """Comandas sin entregar, una fila por comanda y estación.
+
+    Se carga una vez con ``establecer`` y después recibe solo las novedades
+    (``aplicar``): una comanda nueva inserta su fila, un cambio de estado
+    actualiza esa fila y una comanda entregada la quita. ``secuencia`` es la
+    última secuencia vista, desde donde se piden las próximas novedades.
+    """
+
+    COLUMNAS = ("Comanda", "Mesa", "Estación", "Productos", "Estado", "Espera")
+    COLUMNA_ESPERA = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.estacion = None  # None: todas
+        self.secuencia = None
+        self._claves = []     # (comanda_id, estacion) ordenadas
+        self._comandas = {}
+        self._creadas = {}
+        self._filas = {}
+
+    def _indexar(self, desde=0):
+        for fila in range(desde, len(self._claves)):
+            self._filas[self._claves[fila]] = fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._claves)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if orientacion == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNAS[seccion]
+        return super().headerData(seccion, orientacion, role)
+
+    def minutos(self, clave):
+        return int((time.time() - self._creadas[clave]) // 60)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        clave = self._claves[index.row()]
+        comanda = self._comandas[clave]
+        if role == Qt.BackgroundRole:
+            if comanda.estado == "pendiente" and self.minutos(clave) >= MINUTOS_DEMORA:
+                return COLOR_DEMORADA
+            return COLORES_ESTADO.get(comanda.estado)
+        if role != Qt.DisplayRole:
+            return None
+        columna = index.column()
+        if columna == 0:
+            return f"#{comanda.comanda_id}"
+        if columna == 1:
+            return str(comanda.mesa) if comanda.mesa is not None else "-"
+        if columna == 2:
+            return comanda.estacion
+        if columna == 3:
+            return "\n".join(
+                f"{linea.cantidad} x {linea.nombre}" if linea.cantidad > 0
+                else f"ANULAR {-linea.cantidad} x {linea.nombre}"
+                for linea in comanda.lineas
+            )
+        if columna == 4:
+            return comanda.estado.capitalize()
+        if columna == 5:
+            return f"{self.minutos(clave)} min"
+        return None
+
+    def comanda(self, fila):
+        return self._comandas[self._claves[fila]] if 0 <= fila < len(self._claves) else None
+
+    def _visible(self, comanda):
+        return comanda.estado != "entregada" and self.estacion in (None, comanda.estacion)
+
+    def establecer(self, secuencia, comandas):
+        self.beginResetModel()
+        self.secuencia = secuencia
+        visibles = sorted(((c.comanda_id, c.estacion), c) for c in comandas if self._visible(c))
+        self._claves = [clave for clave, _ in visibles]
+        self._comandas = dict(visibles)
+        self._creadas = {clave: _segundos(c.creada) for clave, c in visibles}
+        self._filas = {}
+        self._indexar()
+        self.endResetModel()
+
+    def aplicar(self, comandas):
+        """Incorporar las novedades (ordenadas por secuencia)"""
+        for comanda in comandas:
+            self.secuencia = max(self.secuencia or 0, comanda.secuencia)
+            clave = (comanda.comanda_id, comanda.estacion)
+            fila = self._filas.get(clave)
+            if fila is not None and self._comandas[clave].secuencia >= comanda.secuencia:
+                continue
+            if not self._visible(comanda):
+                if fila is not None:
+                    self.beginRemoveRows(QModelIndex(), fila, fila)
+                    del self._claves[fila]
+                    del self._comandas[clave], self._creadas[clave], self._filas[clave]
+                    self._indexar(fila)
+                    self.endRemoveRows()
+            elif fila is not None:
+                self._comandas[clave] = comanda
+                self.dataChanged.emit(self.index(fila, 0), self.index(fila, len(self.COLUMNAS) - 1))
+            else:
+                fila = bisect.bisect(self._claves, clave)
+                self.beginInsertRows(QModelIndex(), fila, fila)
+                self._claves.insert(fila, clave)
+                self._comandas[clave] = comanda
+                self._creadas[clave] = _segundos(comanda.creada)
+                self._indexar(fila)
+                self.endInsertRows()
+
+    def refrescar_espera(self):
+        """Avisar que pasó el tiempo (columna "Espera" y color de demora)"""
+        if self._claves:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._claves) - 1, len(self.COLUMNAS) - 1),
+                                  [Qt.DisplayRole, Qt.BackgroundRole])
+
+class CocinaView(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.servicio = ComandasService()
+        self.modelo = ModeloComandas(self)
+        self.setup_ui()
+        obtener_vigilante().comandas_cambiadas.connect(self.comandas_cambiadas)
+
+        self.timer_espera = QTimer(self)
+        self.timer_espera.setInterval(INTERVALO_ESPERA)
+        self.timer_espera.timeout.connect(self.modelo.refrescar_espera)
+        self.timer_espera.start()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        titulo = QLabel("COMANDAS")
+        titulo.setObjectName("titulo")
+        titulo.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        titulo.setAlignment(Qt.AlignCenter)
+        layout.addWidget(titulo)
+
+        filtro_layout = QHBoxLayout()
+        filtro_layout.addWidget(QLabel("Estación:"))
+        self.combo_estacion = QComboBox()
+        self.combo_estacion.addItem("Todas", None)
+        for estacion in ESTACIONES:
+            self.combo_estacion.addItem(estacion, estacion)
+        self.combo_estacion.setMinimumHeight(35)
+        self.combo_estacion.currentIndexChanged.connect(self.cambiar_estacion)
+        filtro_layout.addWidget(self.combo_estacion)
+        filtro_layout.addStretch()
+        layout.addLayout(filtro_layout)
+
+        self.tabla = QTableView()
+        self.tabla.setModel(self.modelo)
+        self.tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tabla.setWordWrap(True)
+        self.tabla.verticalHeader().setVisible(False)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tabla.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.tabla.doubleClicked.connect(self.avanzar)
+        # Solo se ajusta la altura de las filas nuevas o modificadas
+        self.modelo.rowsInserted.connect(lambda _, inicio, fin: self._ajustar_filas(inicio, fin))
+        self.modelo.dataChanged.connect(lambda a, b, roles=(): self._ajustar_filas(a.row(), b.row()) if not roles else None)
+        self.modelo.modelReset.connect(lambda: self._ajustar_filas(0, self.modelo.rowCount() - 1))
+        self.tabla.setStyleSheet("""
+            QTableView {
+                background-color: white;
+                border: 1px solid #800020;
+                border-radius: 5px;
+            }
+            QHeaderView::section {
+                background-color: #800020;
+                color: white;
+                font-weight: bold;
+            }
+        """)
+        layout.addWidget(self.tabla)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.setAlignment(Qt.AlignCenter)
+        btn_layout.setSpacing(30)
+
+        btn_avanzar = QPushButton("Siguiente Estado")
+        btn_avanzar.setMinimumHeight(45)
+        btn_avanzar.setStyleSheet("""
+            QPushButton {
+                background-color: #27ae60;
+                color: #333333;
+                font-weight: bold;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #219653;
+            }
+        """)
+        btn_avanzar.clicked.connect(self.avanzar)
+
+        btn_entregar = QPushButton("Entregada")
+        btn_entregar.setMinimumHeight(45)
+        btn_entregar.setStyleSheet("""
+            QPushButton {
+                background-color: #3498db;
+                color: #333333;
+                font-weight: bold;
+                border-radius: 5px;
+                padding: 10px;
+            }
+            QPushButton:hover {
+                background-color: #2980b9;
+            }
+        """)
+        btn_entregar.clicked.connect(self.entregar)
+
+        btn_layout.addWidget(btn_avanzar)
+        btn_layout.addWidget(btn_entregar)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+    def _ajustar_filas(self, inicio, fin):
+        for fila in range(max(inicio, 0), fin + 1):
+            self.tabla.resizeRowToContents(fila)
+
+    def actualizar(self):
+        """Traer las comandas: todas la primera vez, después solo las novedades"""
+        if self.modelo.secuencia is None:
+            obtener_ejecutor().enviar(
+                self.servicio.activas,
+                al_terminar=lambda resultado: self.modelo.establecer(*resultado),
+                al_fallar=lambda e: print(f"Error cargando comandas: {e}"),
+                clave=("comandas", id(self))
+            )
+        else:
+            obtener_ejecutor().enviar(
+                self.servicio.novedades, self.modelo.secuencia,
+                al_terminar=self.modelo.aplicar,
+                al_fallar=lambda e: print(f"Error cargando comandas: {e}"),
+                clave=("comandas", id(self))
+            )
+
+    def comandas_cambiadas(self):
+        # MainWindow actualiza la vista al mostrarla
+        if self.isVisible():
+            self.actualizar()
+
+    def cambiar_estacion(self):
+        self.modelo.estacion = self.combo_estacion.currentData()
+        self.modelo.secuencia = None
+        self.actualizar()
+
+    def _seleccionada(self):
+        fila = self.tabla.currentIndex().row()
+        comanda = self.modelo.comanda(fila)
+        if comanda is None:
+            QMessageBox.warning(self, "Error", "Seleccione una comanda")
+        return comanda
+
+    def _cambiar_estado(self, funcion, *args):
+        obtener_ejecutor().enviar(
+            funcion, *args,
+            al_terminar=lambda _: self.actualizar(),
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al actualizar comanda: {str(e)}")
+        )
+
+    def avanzar(self, *_):
+        comanda = self._seleccionada()
+        if comanda is not None:
+            self._cambiar_estado(self.servicio.avanzar, comanda)
+
+    def entregar(self):
+        comanda = self._seleccionada()
+        if comanda is not None:
+            self._cambiar_estado(self.servicio.cambiar_estado, comanda.comanda_id, comanda.estacion, "entregada")
@@ -0,0 +1,38 @@
+from PySide6.QtWidgets import QMessageBox
+from PySide6.QtCore import Qt
+from services.facturas import fecha_local
+
+def resumen_factura(factura, titulo="FACTURA GENERADA"):
+    """HTML de una ``services.facturas.Factura`` con sus líneas"""
+    mensaje = f"<b>{titulo}</b><br><br>"
+    mensaje += f"<b>Número:</b> {factura.numero}<br>"
+    mensaje += f"<b>Fecha:</b> {fecha_local(factura.fecha)}<br>"
+    if factura.mesa is not None:
+        mensaje += f"<b>Mesa:</b> {factura.mesa}<br>"
+    mensaje += f"<b>Cliente:</b> {factura.cliente}<br><br>"
+
+    mensaje += "<b>Detalle de productos:</b><br>"
+    mensaje += "<table border='1' style='border-collapse: collapse; width: 100%;'>"
+    mensaje += "<tr><th>Producto</th><th>Precio</th><th>Cantidad</th><th>Subtotal</th></tr>"
+
+    for linea in factura.lineas:
+        mensaje += f"<tr><td>{linea.nombre}</td>"
+        mensaje += f"<td>${linea.precio:.2f}</td>"
+        mensaje += f"<td>{linea.cantidad}</td>"
+        mensaje += f"<td>${linea.subtotal:.2f}</td></tr>"
+
+    if factura.impuesto:
+        mensaje += f"<tr><td colspan='3' align='right'>Impuesto incluido:</td>"
+        mensaje += f"<td>${factura.impuesto:.2f}</td></tr>"
+    mensaje += f"<tr><td colspan='3' align='right'><b>Total:</b></td>"
+    mensaje += f"<td><b>${factura.total:.2f}</b></td></tr>"
+    mensaje += "</table>"
+    return mensaje
+
+def mostrar_factura(parent, factura, titulo="FACTURA GENERADA", titulo_ventana="Factura Generada"):
+    msg_box = QMessageBox(parent)
+    msg_box.setWindowTitle(titulo_ventana)
+    msg_box.setTextFormat(Qt.RichText)
+    msg_box.setText(resumen_factura(factura, titulo))
+    msg_box.setStandardButtons(QMessageBox.Ok)
+    msg_box.exec()
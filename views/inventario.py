@@ -1,12 +1,20 @@
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, 
-    QTableWidgetItem, QHeaderView, QPushButton, 
+    QWidget, QVBoxLayout, QHBoxLayout, QTableView, 
+    QAbstractItemView, QHeaderView, QPushButton, 
     QLineEdit, QDoubleSpinBox, QSpinBox, QMessageBox,
-    QDialog, QDialogButtonBox, QFormLayout, QLabel
+    QDialog, QDialogButtonBox, QFormLayout, QLabel, QComboBox
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
-from database import crear_conexion, sqlite3
+from ejecutor_bd import obtener_ejecutor
+from services.cocina import ESTACIONES
+from services.inventario import InventarioService
+from views.ajuste_masivo import AjusteMasivoDialog
+from views.alertas_stock import AvisoStockBajo, obtener_alertas
+from views.catalogo import obtener_catalogo
+from views.modelo_inventario import ModeloInventario
+from views.transferencia import exportar_tabla, importar_tabla
+from vigilante_bd import obtener_vigilante
 
 class EditarProductoDialog(QDialog):
     def __init__(self, producto, parent=None):
@@ -26,21 +34,38 @@ class EditarProductoDialog(QDialog):
         self.input_nombre.setMinimumHeight(40)
         form.addRow("Nombre:", self.input_nombre)
         
+        # El rango va antes del valor: el máximo predeterminado (99) lo recortaría
         self.input_precio = QDoubleSpinBox()
-        self.input_precio.setValue(self.producto[2])
         self.input_precio.setPrefix("$ ")
         self.input_precio.setMinimum(0.01)
         self.input_precio.setMaximum(10000)
+        self.input_precio.setValue(self.producto[2])
         self.input_precio.setMinimumHeight(40)
         form.addRow("Precio:", self.input_precio)
         
         self.input_stock = QSpinBox()
-        self.input_stock.setValue(self.producto[3])
         self.input_stock.setMinimum(0)
         self.input_stock.setMaximum(10000)
+        self.input_stock.setValue(self.producto[3])
         self.input_stock.setMinimumHeight(40)
         form.addRow("Stock:", self.input_stock)
         
+        # Con stock en el mínimo o por debajo el producto aparece en las alertas (0: sin alerta)
+        self.input_minimo = QSpinBox()
+        self.input_minimo.setMinimum(0)
+        self.input_minimo.setMaximum(10000)
+        self.input_minimo.setValue(self.producto.stock_minimo)
+        self.input_minimo.setMinimumHeight(40)
+        form.addRow("Stock mínimo:", self.input_minimo)
+        
+        # Estación de cocina que prepara el producto (se puede escribir otra)
+        self.input_estacion = QComboBox()
+        self.input_estacion.setEditable(True)
+        self.input_estacion.addItems(ESTACIONES)
+        self.input_estacion.setCurrentText(self.producto[4])
+        self.input_estacion.setMinimumHeight(40)
+        form.addRow("Estación:", self.input_estacion)
+        
         layout.addLayout(form)
         
         # Botones
@@ -62,15 +87,24 @@ class EditarProductoDialog(QDialog):
         return (
             self.input_nombre.text().strip(),
             self.input_precio.value(),
-            self.input_stock.value()
+            self.input_stock.value(),
+            self.input_estacion.currentText().strip() or None,
+            self.input_minimo.value()
         )
 
 class InventarioView(QWidget):
-    def __init__(self, es_admin=False):
+    def __init__(self, es_admin=False, usuario=None):
         super().__init__()
         print(f"Creando InventarioView con es_admin={es_admin}")  # Para depuración
         self.es_admin = es_admin
+        # Nombre del usuario, para el historial de ajustes masivos
+        self.usuario = usuario
+        self.servicio = InventarioService()
+        self.modelo = ModeloInventario(self.servicio, parent=self)
+        # Cambios en productos mientras la vista estaba oculta
+        self.desactualizado = False
         self.setup_ui()
+        obtener_vigilante().productos_cambiados.connect(self.productos_cambiados)
         
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -133,15 +167,39 @@ class InventarioView(QWidget):
             
             layout.addLayout(form_layout)
         
+        # Búsqueda por el comienzo del nombre
+        busqueda_layout = QHBoxLayout()
+        self.input_buscar = QLineEdit()
+        self.input_buscar.setPlaceholderText("Buscar producto por nombre")
+        self.input_buscar.setMinimumHeight(35)
+        self.input_buscar.setClearButtonEnabled(True)
+        self.timer_buscar = QTimer(self)
+        self.timer_buscar.setSingleShot(True)
+        self.timer_buscar.setInterval(200)
+        self.timer_buscar.timeout.connect(lambda: self.modelo.filtrar(self.input_buscar.text()))
+        self.input_buscar.textChanged.connect(self.timer_buscar.start)
+        self.label_total = QLabel("")
+        self.modelo.total_cambiado.connect(lambda total: self.label_total.setText(f"{total} productos"))
+        busqueda_layout.addWidget(self.input_buscar, 1)
+        busqueda_layout.addWidget(self.label_total)
+        layout.addLayout(busqueda_layout)
+        
+        self.aviso_stock = AvisoStockBajo()
+        layout.addWidget(self.aviso_stock)
+        
         # Tabla de productos (visible para todos)
-        self.tabla_productos = QTableWidget()
-        self.tabla_productos.setColumnCount(4)
-        self.tabla_productos.setHorizontalHeaderLabels(["ID", "Producto", "Precio", "Stock"])
+        self.tabla_productos = QTableView()
+        self.tabla_productos.setModel(self.modelo)
         self.tabla_productos.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.tabla_productos.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.tabla_productos.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabla_productos.verticalHeader().setVisible(False)
+        self.tabla_productos.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_productos.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_productos.setSelectionMode(QAbstractItemView.SingleSelection)
+        # El orden lo resuelve la consulta (ModeloInventario.sort)
+        self.tabla_productos.horizontalHeader().setSortIndicator(1, Qt.AscendingOrder)
+        self.tabla_productos.setSortingEnabled(True)
         self.tabla_productos.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #800020;
                 border-radius: 5px;
@@ -192,33 +250,52 @@ class InventarioView(QWidget):
             """)
             btn_eliminar.clicked.connect(self.eliminar_producto)
             
+            btn_importar = QPushButton("Importar")
+            btn_importar.setMinimumHeight(45)
+            btn_importar.setToolTip("Agregar o actualizar productos desde un archivo CSV o JSON Lines")
+            btn_importar.clicked.connect(self.importar_productos)
+            
+            btn_exportar = QPushButton("Exportar")
+            btn_exportar.setMinimumHeight(45)
+            btn_exportar.clicked.connect(lambda: exportar_tabla(self, "productos"))
+            
+            btn_ajuste = QPushButton("Ajuste masivo")
+            btn_ajuste.setMinimumHeight(45)
+            btn_ajuste.setToolTip("Cambiar precio o stock de varios productos a la vez")
+            btn_ajuste.clicked.connect(self.ajuste_masivo)
+            
             btn_layout.addWidget(btn_editar)
             btn_layout.addWidget(btn_eliminar)
+            btn_layout.addWidget(btn_importar)
+            btn_layout.addWidget(btn_exportar)
+            btn_layout.addWidget(btn_ajuste)
             layout.addLayout(btn_layout)
         
         self.setLayout(layout)
-        self.cargar_productos()
     
     def cargar_productos(self):
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, nombre, precio, stock FROM productos")
-                productos = cursor.fetchall()
-                
-                self.tabla_productos.setRowCount(len(productos))
-                
-                for row, producto in enumerate(productos):
-                    self.tabla_productos.setItem(row, 0, QTableWidgetItem(str(producto[0])))
-                    self.tabla_productos.setItem(row, 1, QTableWidgetItem(producto[1]))
-                    self.tabla_productos.setItem(row, 2, QTableWidgetItem(f"${producto[2]:.2f}"))
-                    self.tabla_productos.setItem(row, 3, QTableWidgetItem(str(producto[3])))
-                    
-            except Exception as e:
-                print(f"Error cargando productos: {e}")
-            finally:
-                conexion.close()
+        """Cargar la primera página, o releer si hubo cambios mientras estaba oculta"""
+        if not self.modelo.cargado:
+            self.modelo.reiniciar()
+        elif self.desactualizado:
+            self.modelo.recargar()
+        self.desactualizado = False
+    
+    def productos_cambiados(self):
+        # MainWindow recarga el inventario al mostrarlo
+        if self.isVisible():
+            self.modelo.recargar()
+        else:
+            self.desactualizado = True
+    
+    def productos_modificados(self):
+        """Releer sin esperar al vigilante lo que cambió desde esta terminal"""
+        self.modelo.recargar()
+        obtener_catalogo().recargar()
+        obtener_alertas().recargar()
+    
+    def producto_seleccionado(self):
+        return self.modelo.producto(self.tabla_productos.currentIndex().row())
     
     def agregar_producto(self):
         # Esta función solo es accesible para administradores
@@ -229,77 +306,56 @@ class InventarioView(QWidget):
         if not nombre:
             QMessageBox.warning(self, "Error", "El nombre del producto es obligatorio")
             return
+        
+        def al_terminar(_):
+            self.productos_modificados()
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute(
-                    "INSERT INTO productos (nombre, precio, stock) VALUES (?, ?, ?)",
-                    (nombre, precio, stock)
-                )
-                conexion.commit()
-                self.cargar_productos()
-                
-                # Limpiar formulario
-                self.input_nombre.clear()
-                self.input_precio.setValue(0.01)
-                self.input_stock.setValue(0)
-                
-                QMessageBox.information(self, "Éxito", "Producto agregado correctamente")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al agregar producto: {str(e)}")
-            finally:
-                conexion.close()
+            # Limpiar formulario
+            self.input_nombre.clear()
+            self.input_precio.setValue(0.01)
+            self.input_stock.setValue(0)
+            
+            QMessageBox.information(self, "Éxito", "Producto agregado correctamente")
+        
+        obtener_ejecutor().enviar(
+            self.servicio.agregar_producto, nombre, precio, stock,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al agregar producto: {str(e)}")
+        )
     
     def editar_producto(self):
         # Esta función solo es accesible para administradores
-        fila_seleccionada = self.tabla_productos.currentRow()
-        if fila_seleccionada < 0:
+        producto = self.producto_seleccionado()
+        if producto is None:
             QMessageBox.warning(self, "Error", "Seleccione un producto para editar")
             return
-            
-        producto_id = int(self.tabla_productos.item(fila_seleccionada, 0).text())
-        nombre = self.tabla_productos.item(fila_seleccionada, 1).text()
-        precio = float(self.tabla_productos.item(fila_seleccionada, 2).text().replace('$', ''))
-        stock = int(self.tabla_productos.item(fila_seleccionada, 3).text())
-        
-        producto = (producto_id, nombre, precio, stock)
+        producto_id = producto.id
         
         dialog = EditarProductoDialog(producto, self)
         if dialog.exec():
-            nombre, precio, stock = dialog.get_datos()
+            nombre, precio, stock, estacion, stock_minimo = dialog.get_datos()
             
             if not nombre:
                 QMessageBox.warning(self, "Error", "El nombre del producto es obligatorio")
                 return
-                
-            conexion = crear_conexion()
-            if conexion:
-                try:
-                    cursor = conexion.cursor()
-                    cursor.execute(
-                        "UPDATE productos SET nombre = ?, precio = ?, stock = ? WHERE id = ?",
-                        (nombre, precio, stock, producto_id)
-                    )
-                    conexion.commit()
-                    self.cargar_productos()
-                    QMessageBox.information(self, "Éxito", "Producto actualizado correctamente")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Error al actualizar producto: {str(e)}")
-                finally:
-                    conexion.close()
+            
+            def al_terminar(_):
+                self.productos_modificados()
+                QMessageBox.information(self, "Éxito", "Producto actualizado correctamente")
+            
+            obtener_ejecutor().enviar(
+                self.servicio.actualizar_producto, producto_id, nombre, precio, stock, estacion, stock_minimo,
+                al_terminar=al_terminar,
+                al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al actualizar producto: {str(e)}")
+            )
     
     def eliminar_producto(self):
         # Esta función solo es accesible para administradores
-        fila_seleccionada = self.tabla_productos.currentRow()
-        if fila_seleccionada < 0:
+        producto = self.producto_seleccionado()
+        if producto is None:
             QMessageBox.warning(self, "Error", "Seleccione un producto para eliminar")
             return
-            
-        producto_id = int(self.tabla_productos.item(fila_seleccionada, 0).text())
-        nombre = self.tabla_productos.item(fila_seleccionada, 1).text()
+        producto_id, nombre = producto.id, producto.nombre
         
         respuesta = QMessageBox.question(
             self,
@@ -309,15 +365,26 @@ class InventarioView(QWidget):
         )
         
         if respuesta == QMessageBox.Yes:
-            conexion = crear_conexion()
-            if conexion:
-                try:
-                    cursor = conexion.cursor()
-                    cursor.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
-                    conexion.commit()
-                    self.cargar_productos()
-                    QMessageBox.information(self, "Éxito", "Producto eliminado correctamente")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Error al eliminar producto: {str(e)}")
-                finally:
-                    conexion.close()
\ No newline at end of file
+            def al_terminar(_):
+                self.productos_modificados()
+                QMessageBox.information(self, "Éxito", "Producto eliminado correctamente")
+            
+            obtener_ejecutor().enviar(
+                self.servicio.eliminar_producto, producto_id,
+                al_terminar=al_terminar,
+                al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al eliminar producto: {str(e)}")
+            )
+    
+    def importar_productos(self):
+        # Esta función solo es accesible para administradores
+        def al_terminar(resultado):
+            if resultado.guardadas:
+                self.productos_modificados()
+        
+        importar_tabla(self, "productos", al_terminar)
+    
+    def ajuste_masivo(self):
+        # Esta función solo es accesible para administradores
+        dialog = AjusteMasivoDialog(self.input_buscar.text().strip(), self.usuario,
+                                    self.productos_modificados, self)
+        dialog.exec()
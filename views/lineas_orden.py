@@ -0,0 +1,132 @@
+from PySide6.QtWidgets import QStyledItemDelegate
+from PySide6.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor, QPainter
+
+class ModeloLineasOrden(QAbstractTableModel):
+    """Líneas de una ``Orden`` para mostrar en un ``QTableView``.
+
+    Los datos viven en la orden (un dict por id de producto); el modelo solo
+    guarda qué producto va en cada fila. Agregar a una línea existente emite
+    ``dataChanged`` de esa fila, una línea nueva o quitada inserta o elimina
+    solo esa fila, y ``total_cambiado`` avisa el total que la orden mantiene.
+    """
+
+    COLUMNAS = ("Producto", "Precio", "Cantidad", "Subtotal", "")
+    COLUMNA_ELIMINAR = 4
+
+    total_cambiado = Signal(float)
+
+    def __init__(self, orden, parent=None):
+        super().__init__(parent)
+        self.orden = orden
+        self._ids = [linea['id'] for linea in orden.lineas]
+        self._filas = {}
+        self._indexar()
+
+    def _indexar(self, desde=0):
+        """Actualizar la fila de cada producto a partir de ``desde``"""
+        for fila in range(desde, len(self._ids)):
+            self._filas[self._ids[fila]] = fila
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if orientacion == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNAS[seccion]
+        return super().headerData(seccion, orientacion, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        linea = self.orden.linea(self._ids[index.row()])
+        columna = index.column()
+        if columna == 0:
+            return linea['nombre']
+        if columna == 1:
+            return f"${linea['precio']:.2f}"
+        if columna == 2:
+            return str(linea['cantidad'])
+        if columna == 3:
+            return f"${linea['subtotal']:.2f}"
+        return None
+
+    def producto_id(self, fila):
+        return self._ids[fila] if 0 <= fila < len(self._ids) else None
+
+    def fila(self, producto_id):
+        return self._filas.get(producto_id)
+
+    def establecer_orden(self, orden):
+        """Mostrar otra orden (p. ej. la cargada de la base de datos)"""
+        self.beginResetModel()
+        self.orden = orden
+        self._ids = [linea['id'] for linea in orden.lineas]
+        self._filas = {}
+        self._indexar()
+        self.endResetModel()
+        self.total_cambiado.emit(self.orden.total)
+
+    def agregar(self, producto_id, nombre, precio, cantidad):
+        fila = self._filas.get(producto_id)
+        if fila is None:
+            fila = len(self._ids)
+            self.beginInsertRows(QModelIndex(), fila, fila)
+            self.orden.agregar(producto_id, nombre, precio, cantidad)
+            self._ids.append(producto_id)
+            self._filas[producto_id] = fila
+            self.endInsertRows()
+        else:
+            self.orden.agregar(producto_id, nombre, precio, cantidad)
+            self.dataChanged.emit(self.index(fila, 2), self.index(fila, 3))
+        self.total_cambiado.emit(self.orden.total)
+
+    def quitar(self, fila):
+        producto_id = self.producto_id(fila)
+        if producto_id is None:
+            return None
+        self.beginRemoveRows(QModelIndex(), fila, fila)
+        linea = self.orden.quitar(producto_id)
+        del self._ids[fila]
+        del self._filas[producto_id]
+        self._indexar(fila)
+        self.endRemoveRows()
+        self.total_cambiado.emit(self.orden.total)
+        return linea
+
+    def limpiar(self):
+        self.beginResetModel()
+        self.orden.limpiar()
+        self._ids = []
+        self._filas = {}
+        self.endResetModel()
+        self.total_cambiado.emit(self.orden.total)
+
+class DelegadoEliminar(QStyledItemDelegate):
+    """Dibuja un botón "Eliminar" en la celda (sin crear un widget por fila)
+    y emite ``eliminar`` con la fila al hacer clic"""
+
+    eliminar = Signal(int)
+
+    COLOR = QColor("#e74c3c")
+
+    def paint(self, painter, option, index):
+        rect = option.rect.adjusted(3, 3, -3, -3)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.COLOR)
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, "Eliminar")
+        painter.restore()
+
+    def editorEvent(self, evento, modelo, option, index):
+        if (evento.type() == QEvent.MouseButtonRelease and evento.button() == Qt.LeftButton
+                and option.rect.contains(evento.position().toPoint())):
+            self.eliminar.emit(index.row())
+            return True
+        return super().editorEvent(evento, modelo, option, index)
@@ -3,10 +3,21 @@ from PySide6.QtWidgets import (
     QVBoxLayout, QMessageBox
 )
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont, QPixmap
-from database import crear_conexion
+from PySide6.QtGui import QFont
+from database import obtener_conexion
+from ejecutor_bd import obtener_ejecutor
+from iconos import RUTA_ICONOS, obtener_iconos
 from views.main_window import MainWindow
 
+def consultar_credenciales(usuario, clave):
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute(
+            "SELECT id, nombre, rol FROM usuarios WHERE usuario = ? AND clave = ?",
+            (usuario, clave)
+        )
+        return cursor.fetchone()
+
 class LoginWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -22,9 +33,8 @@ class LoginWindow(QWidget):
         
         # Logo
         logo_label = QLabel()
-        pixmap = QPixmap("resources/icons/logo3.png")
+        pixmap = obtener_iconos().pixmap(f"{RUTA_ICONOS}/logo3.png", 100, 100, self.devicePixelRatioF())
         if not pixmap.isNull():
-            pixmap = pixmap.scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(pixmap)
         logo_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(logo_label)
@@ -85,24 +95,16 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Todos los campos son obligatorios")
             return
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute(
-                    "SELECT id, nombre, rol FROM usuarios WHERE usuario = ? AND clave = ?",
-                    (usuario, clave)
-                )
-                usuario_data = cursor.fetchone()
-                
-                if usuario_data:
-                    self.main_window = MainWindow(usuario_data)
-                    self.main_window.show()
-                    self.close()
-                else:
-                    QMessageBox.critical(self, "Error", "Credenciales incorrectas")
-                    
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error de base de datos: {str(e)}")
-            finally:
-                conexion.close()
\ No newline at end of file
+        def al_terminar(usuario_data):
+            if usuario_data:
+                self.main_window = MainWindow(usuario_data)
+                self.main_window.show()
+                self.close()
+            else:
+                QMessageBox.critical(self, "Error", "Credenciales incorrectas")
+        
+        obtener_ejecutor().enviar(
+            consultar_credenciales, usuario, clave,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error de base de datos: {str(e)}")
+        )
\ No newline at end of file
@@ -6,6 +6,7 @@ from PySide6.QtCore import Qt, QSize
 from PySide6.QtGui import QAction, QIcon, QFont
 from views.mesas import MesasView
 from views.inventario import InventarioView
+from views.cocina import CocinaView
 from views.usuarios import UsuariosView
 from views.reportes import ReportesView
 from PySide6.QtCore import QPropertyAnimation, QEasingCurve
@@ -55,6 +56,7 @@ class MainWindow(QMainWindow):
         acciones = [
             ("Mesas", "mesa.png", self.mostrar_mesas),
             ("Inventario", "inventario.png", self.mostrar_inventario),
+            ("Cocina", "cocina.png", self.mostrar_cocina),
             ("Reportes", "reportes.png", self.mostrar_reportes) if tiene_reportes else None,
             ("Usuarios", "usuarios.png", self.mostrar_usuarios) if self.usuario[2] == "admin" else None
         ]
@@ -72,8 +74,9 @@ class MainWindow(QMainWindow):
         
         # Vistas - PASAR CORRECTAMENTE EL PARÁMETRO ES_ADMIN
         self.mesas_view = MesasView()
-        self.inventario_view = InventarioView(es_admin=(self.usuario[2] == "admin"))
+        self.inventario_view = InventarioView(es_admin=(self.usuario[2] == "admin"), usuario=self.usuario[1])
         self.usuarios_view = UsuariosView(es_admin=(self.usuario[2] == "admin"))
+        self.cocina_view = CocinaView()
         
         if tiene_reportes:
             self.reportes_view = ReportesView()
@@ -82,6 +85,7 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self.mesas_view)
         self.stacked_widget.addWidget(self.inventario_view)
         self.stacked_widget.addWidget(self.usuarios_view)
+        self.stacked_widget.addWidget(self.cocina_view)
         
         # Barra de estado
         status_bar = QStatusBar()
@@ -129,6 +133,10 @@ class MainWindow(QMainWindow):
         self.stacked_widget.setCurrentWidget(self.inventario_view)
         self.inventario_view.cargar_productos()
         
+    def mostrar_cocina(self):
+        self.stacked_widget.setCurrentWidget(self.cocina_view)
+        self.cocina_view.actualizar()
+        
     def mostrar_usuarios(self):
         self.stacked_widget.setCurrentWidget(self.usuarios_view)
         self.usuarios_view.cargar_usuarios()
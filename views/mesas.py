@@ -4,12 +4,16 @@ from PySide6.QtWidgets import (
     QWidget, QGridLayout, QPushButton, QScrollArea, 
     QVBoxLayout, QLabel, QMessageBox, QInputDialog,
     QGroupBox, QComboBox, QHBoxLayout, QDialog,
-    QFormLayout, QLineEdit
+    QFormLayout, QLineEdit, QStackedWidget, QCheckBox
 )
 from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QIcon, QFont, QPixmap, QColor, QPainter
-from database import crear_conexion
+from ejecutor_bd import obtener_ejecutor
+from iconos import ICONOS_MESA, obtener_iconos
+from services.mesas import MesasService
 from views.orden import OrdenDialog
+from views.plano import PlanoMesas
+from vigilante_bd import obtener_vigilante
 
 class MesaButton(QPushButton):
     def __init__(self, mesa_data, parent=None):
@@ -21,41 +25,7 @@ class MesaButton(QPushButton):
     def setup_ui(self):
         self.setMinimumSize(250, 250)
         self.setIconSize(QSize(50, 50))
-        
-        estado = self.mesa_data[3]  # índice 3 es estado
-        
-        # Determinar qué icono usar según el estado
-        if estado == "ocupada":
-            icon_path = "resources/icons/ocupada.png"
-        else:
-            icon_path = "resources/icons/libre.png"
-        
-        # Cargar icono con fondo transparente
-        if os.path.exists(icon_path):
-            pixmap = QPixmap(icon_path)
-            
-            # Crear una copia para no modificar el original
-            transparent_pixmap = QPixmap(pixmap.size())
-            transparent_pixmap.fill(Qt.transparent)
-            
-            # Pintar solo los píxeles no blancos
-            painter = QPainter(transparent_pixmap)
-            painter.drawPixmap(0, 0, pixmap)
-            painter.end()
-            
-            # Escalar manteniendo relación de aspecto
-            transparent_pixmap = transparent_pixmap.scaled(
-                120, 120, 
-                Qt.KeepAspectRatio, 
-                Qt.SmoothTransformation
-            )
-            self.setIcon(QIcon(transparent_pixmap))
-        else:
-            # Si no existe el archivo, usar texto y color
-            if estado == "ocupada":
-                self.setStyleSheet("background-color: #ffcccc;")
-            else:
-                self.setStyleSheet("background-color: #ccffcc;")
+        self.mostrar_estado()
         
         # Texto adicional
         texto = f"Mesa {self.mesa_data[1]}"
@@ -78,6 +48,24 @@ class MesaButton(QPushButton):
                 border: 2px solid #900028;
             }
         """)
+    
+    def mostrar_estado(self):
+        estado = self.mesa_data[3]  # índice 3 es estado
+        
+        # Icono con fondo transparente, compartido por todas las mesas en ese estado
+        icon_path = ICONOS_MESA["ocupada" if estado == "ocupada" else "libre"]
+        self.setIcon(obtener_iconos().icono(
+            icon_path, 120, 120, self.devicePixelRatioF(), componer=True
+        ))
+    
+    def actualizar(self, mesa_data):
+        """Aplicar los datos nuevos de la mesa sin recrear el botón"""
+        anterior = self.mesa_data
+        self.mesa_data = mesa_data
+        if anterior[3] != mesa_data[3]:
+            self.mostrar_estado()
+        if anterior[1] != mesa_data[1]:
+            self.setText(f"Mesa {mesa_data[1]}")
 
 class MesasView(QWidget):
     mesa_seleccionada = Signal(int)
@@ -85,7 +73,12 @@ class MesasView(QWidget):
     
     def __init__(self):
         super().__init__()
+        self.servicio = MesasService()
+        self.botones = {}   # mesa_id -> MesaButton
+        self.grupos = {}    # seccion -> (QGroupBox, QGridLayout, [mesa_id, ...])
+        self.plano = None   # PlanoMesas, se crea al elegir la vista de plano
         self.setup_ui()
+        obtener_vigilante().mesas_cambiadas.connect(self.mesas_cambiadas)
         
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -109,6 +102,19 @@ class MesasView(QWidget):
         filter_layout.addWidget(self.combo_secciones)
         
         filter_layout.addStretch()
+        
+        # Vista: cuadrícula de botones o plano (recomendado con cientos de mesas)
+        filter_layout.addWidget(QLabel("Vista:"))
+        self.combo_vista = QComboBox()
+        self.combo_vista.setMinimumHeight(35)
+        self.combo_vista.addItems(["Cuadrícula", "Plano"])
+        self.combo_vista.currentIndexChanged.connect(self.cambiar_vista)
+        filter_layout.addWidget(self.combo_vista)
+        
+        self.check_mover = QCheckBox("Mover mesas")
+        self.check_mover.setVisible(False)
+        self.check_mover.toggled.connect(lambda activo: self.plano.set_editable(activo))
+        filter_layout.addWidget(self.check_mover)
         layout.addLayout(filter_layout)
         
         # Área de scroll para mesas
@@ -123,7 +129,10 @@ class MesasView(QWidget):
         self.scroll_layout.setContentsMargins(10, 10, 10, 10)
         
         self.scroll.setWidget(self.scroll_content)
-        layout.addWidget(self.scroll)
+        
+        self.pila_vistas = QStackedWidget()
+        self.pila_vistas.addWidget(self.scroll)
+        layout.addWidget(self.pila_vistas)
         
         # Botones de control
         btn_layout = QHBoxLayout()
@@ -173,127 +182,208 @@ class MesasView(QWidget):
         self.actualizar_mesas()
     
     def cargar_secciones(self):
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT DISTINCT seccion FROM mesas ORDER BY seccion")
-                secciones = cursor.fetchall()
-                
-                self.combo_secciones.clear()
-                self.combo_secciones.addItem("Todas las secciones", None)
-                
-                for seccion in secciones:
-                    self.combo_secciones.addItem(seccion[0], seccion[0])
-                    
-            except Exception as e:
-                print(f"Error cargando secciones: {e}")
-            finally:
-                conexion.close()
+        obtener_ejecutor().enviar(
+            self.servicio.listar_secciones,
+            al_terminar=self.mostrar_secciones,
+            al_fallar=lambda e: print(f"Error cargando secciones: {e}"),
+            clave=("secciones", id(self))
+        )
     
-    def filtrar_mesas(self):
+    def mostrar_secciones(self, secciones):
+        seleccionada = self.combo_secciones.currentData()
+        
+        self.combo_secciones.blockSignals(True)
+        self.combo_secciones.clear()
+        self.combo_secciones.addItem("Todas las secciones", None)
+        
+        for seccion in secciones:
+            self.combo_secciones.addItem(seccion, seccion)
+        
+        indice = self.combo_secciones.findData(seleccionada)
+        self.combo_secciones.setCurrentIndex(max(indice, 0))
+        self.combo_secciones.blockSignals(False)
+        
+        # La sección filtrada ya no existe: mostrar todas
+        if seleccionada is not None and indice < 0:
+            self.actualizar_mesas()
+    
+    def mesas_cambiadas(self):
+        # Cambio en otra terminal; si la vista está oculta se recarga al mostrarla
+        if self.isVisible():
+            self.cargar_secciones()
+            self.actualizar_mesas()
+    
+    def vista_plano(self):
+        return self.plano is not None and self.pila_vistas.currentWidget() is self.plano
+    
+    def cambiar_vista(self, indice):
+        # Solo una de las dos vistas tiene mesas cargadas a la vez
+        if indice == 1:
+            if self.plano is None:
+                self.plano = PlanoMesas()
+                self.plano.mesa_seleccionada.connect(self.abrir_orden)
+                self.plano.mesa_movida.connect(self.guardar_posicion)
+                self.pila_vistas.addWidget(self.plano)
+            self.mostrar_cuadricula([])
+            self.pila_vistas.setCurrentWidget(self.plano)
+        else:
+            if self.plano is not None:
+                self.plano.mostrar_mesas([])
+            self.check_mover.setChecked(False)
+            self.pila_vistas.setCurrentWidget(self.scroll)
+        self.check_mover.setVisible(indice == 1)
         self.actualizar_mesas()
     
+    def guardar_posicion(self, mesa_id, pos_x, pos_y):
+        obtener_ejecutor().enviar(
+            self.servicio.mover_mesa, mesa_id, pos_x, pos_y,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al mover mesa: {str(e)}")
+        )
+    
+    def filtrar_mesas(self):
+        # Todas las mesas ya están en pantalla: solo cambia qué grupos se ven
+        seccion = self.combo_secciones.currentData()
+        if self.vista_plano():
+            self.plano.filtrar(seccion)
+            return
+        for nombre, (group_box, _, _) in self.grupos.items():
+            group_box.setVisible(seccion is None or nombre == seccion)
+    
     def actualizar_mesas(self):
-        # Limpiar layout existente
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
+        # Una actualización nueva reemplaza a la que siga pendiente
+        obtener_ejecutor().enviar(
+            self.servicio.listar_plano if self.vista_plano() else self.servicio.listar_mesas,
+            al_terminar=self.mostrar_mesas,
+            al_fallar=lambda e: print(f"Error cargando mesas: {e}"),
+            clave=("mesas", id(self))
+        )
+    
+    def actualizar_mesa(self, mesa_id):
+        """Refrescar solo una mesa (p. ej. al confirmar o facturar)"""
+        obtener_ejecutor().enviar(
+            self.servicio.obtener_mesa, mesa_id,
+            al_terminar=lambda mesa: self.mostrar_mesa(mesa_id, mesa),
+            al_fallar=lambda e: print(f"Error cargando mesa: {e}"),
+            clave=("mesa", mesa_id, id(self))
+        )
+    
+    def mostrar_mesa(self, mesa_id, mesa):
+        if self.vista_plano():
+            if not self.plano.actualizar_mesa(mesa):
+                self.actualizar_mesas()
+            return
+        boton = self.botones.get(mesa_id)
+        if mesa is None or boton is None or boton.mesa_data[2] != mesa[2]:
+            # Mesa creada, eliminada o movida de sección: recalcular todo
+            self.actualizar_mesas()
+            return
+        boton.actualizar(mesa)
+    
+    def mostrar_mesas(self, mesas):
+        if self.vista_plano():
+            self.plano.filtro = self.combo_secciones.currentData()
+            self.plano.mostrar_mesas(mesas)
+        else:
+            self.mostrar_cuadricula(mesas)
+    
+    def mostrar_cuadricula(self, mesas):
+        """Llevar la grilla al estado de ``mesas`` tocando solo lo que cambió"""
+        mesas_por_seccion = {}
+        for mesa in mesas:
+            mesas_por_seccion.setdefault(mesa[2], []).append(mesa)
+        
+        # Quitar los botones de mesas eliminadas o que cambiaron de sección
+        vigentes = {mesa[0]: mesa for mesa in mesas}
+        for mesa_id, boton in list(self.botones.items()):
+            mesa = vigentes.get(mesa_id)
+            if mesa is None or mesa[2] != boton.mesa_data[2]:
+                self.grupos[boton.mesa_data[2]][1].removeWidget(boton)
+                if mesa is None:
+                    del self.botones[mesa_id]
+                    boton.deleteLater()
+                else:
+                    boton.setParent(None)
+        
+        # Quitar las secciones que quedaron vacías
+        for seccion in list(self.grupos):
+            if seccion not in mesas_por_seccion:
+                group_box = self.grupos.pop(seccion)[0]
+                self.scroll_layout.removeWidget(group_box)
+                group_box.deleteLater()
+        
+        for indice, (seccion, mesas_seccion) in enumerate(sorted(mesas_por_seccion.items())):
+            if seccion not in self.grupos:
+                self.grupos[seccion] = self.crear_grupo(seccion)
+                self.scroll_layout.insertWidget(indice, self.grupos[seccion][0])
+            group_box, grid_layout, orden_actual = self.grupos[seccion]
             
-        # Obtener sección seleccionada
-        seccion = self.combo_secciones.currentData()
-        
-        # Obtener mesas de la base de datos
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                if seccion:
-                    cursor.execute("""
-                        SELECT id, numero, seccion, estado 
-                        FROM mesas 
-                        WHERE seccion = ?
-                        ORDER BY numero
-                    """, (seccion,))
+            for mesa in mesas_seccion:
+                boton = self.botones.get(mesa[0])
+                if boton is None:
+                    boton = MesaButton(mesa)
+                    boton.clicked.connect(lambda checked, b=boton: self.abrir_orden(b.mesa_data))
+                    self.botones[mesa[0]] = boton
                 else:
-                    cursor.execute("SELECT id, numero, seccion, estado FROM mesas ORDER BY seccion, numero")
-                
-                mesas = cursor.fetchall()
-                
-                # Agrupar mesas por sección
-                mesas_por_seccion = {}
-                for mesa in mesas:
-                    seccion = mesa[2]
-                    if seccion not in mesas_por_seccion:
-                        mesas_por_seccion[seccion] = []
-                    mesas_por_seccion[seccion].append(mesa)
-                
-                # Crear grupos para cada sección
-                for seccion, mesas_seccion in mesas_por_seccion.items():
-                    group_box = QGroupBox(seccion)
-                    group_box.setStyleSheet("""
-                        QGroupBox {
-                            font-weight: bold;
-                            font-size: 14pt;
-                            color: #800020;
-                            border: 2px solid #800020;
-                            border-radius: 10px;
-                            margin-top: 20px;
-                        }
-                        QGroupBox::title {
-                            subcontrol-origin: margin;
-                            subcontrol-position: top center;
-                            padding: 0 10px;
-                            background-color: #F5F5DC;
-                        }
-                    """)
-                    
-                    grid_layout = QGridLayout()
-                    grid_layout.setAlignment(Qt.AlignCenter)
-                    grid_layout.setSpacing(20)
-                    
-                    # Agregar mesas a la grilla
-                    row, col = 0, 0
-                    max_cols = 4
-                    
-                    for mesa in mesas_seccion:
-                        btn_mesa = MesaButton(mesa)
-                        btn_mesa.clicked.connect(lambda checked, m=mesa: self.abrir_orden(m))
-                        grid_layout.addWidget(btn_mesa, row, col)
-                        
-                        col += 1
-                        if col >= max_cols:
-                            col = 0
-                            row += 1
-                    
-                    group_box.setLayout(grid_layout)
-                    self.scroll_layout.addWidget(group_box)
-                        
-            except Exception as e:
-                print(f"Error cargando mesas: {e}")
-            finally:
-                conexion.close()
+                    boton.actualizar(mesa)
+            
+            # Reacomodar la grilla solo si cambió qué mesas tiene o su orden
+            orden_nuevo = [mesa[0] for mesa in mesas_seccion]
+            if orden_nuevo != orden_actual:
+                self.acomodar_grupo(grid_layout, orden_nuevo)
+                self.grupos[seccion] = (group_box, grid_layout, orden_nuevo)
+        
+        self.filtrar_mesas()
+    
+    def crear_grupo(self, seccion):
+        group_box = QGroupBox(seccion)
+        group_box.setStyleSheet("""
+            QGroupBox {
+                font-weight: bold;
+                font-size: 14pt;
+                color: #800020;
+                border: 2px solid #800020;
+                border-radius: 10px;
+                margin-top: 20px;
+            }
+            QGroupBox::title {
+                subcontrol-origin: margin;
+                subcontrol-position: top center;
+                padding: 0 10px;
+                background-color: #F5F5DC;
+            }
+        """)
+        
+        grid_layout = QGridLayout()
+        grid_layout.setAlignment(Qt.AlignCenter)
+        grid_layout.setSpacing(20)
+        group_box.setLayout(grid_layout)
+        return group_box, grid_layout, []
+    
+    def acomodar_grupo(self, grid_layout, mesa_ids):
+        # Vaciar la grilla sin destruir los botones y volver a ubicarlos
+        while grid_layout.count():
+            grid_layout.takeAt(0)
+        
+        max_cols = 4
+        for posicion, mesa_id in enumerate(mesa_ids):
+            grid_layout.addWidget(self.botones[mesa_id], posicion // max_cols, posicion % max_cols)
     
     def abrir_orden(self, mesa):
         # Actualizar datos de la mesa antes de abrir el diálogo
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, numero, seccion, estado FROM mesas WHERE id = ?", (mesa[0],))
-                mesa_actualizada = cursor.fetchone()
-                if mesa_actualizada:
-                    mesa = mesa_actualizada
-            except Exception as e:
-                print(f"Error actualizando mesa: {e}")
-            finally:
-                conexion.close()
-        
+        def al_fallar(e):
+            print(f"Error actualizando mesa: {e}")
+            self.mostrar_orden(mesa)
+        
+        obtener_ejecutor().enviar(
+            self.servicio.obtener_mesa, mesa[0],
+            al_terminar=lambda mesa_actualizada: self.mostrar_orden(mesa_actualizada or mesa),
+            al_fallar=al_fallar,
+            clave=("abrir_orden", id(self))
+        )
+    
+    def mostrar_orden(self, mesa):
         dialog = OrdenDialog(mesa)
-        dialog.estado_mesa_cambiado.connect(self.actualizar_mesas)
+        dialog.estado_mesa_cambiado.connect(lambda: self.actualizar_mesa(mesa[0]))
         dialog.exec()
     
     def agregar_mesa(self):
@@ -361,95 +451,93 @@ class MesasView(QWidget):
         except ValueError:
             QMessageBox.warning(self, "Error", "El número de mesa debe ser un valor numérico")
             return
+        
+        def al_terminar(insertada):
+            if not insertada:
+                QMessageBox.warning(self, "Error", f"Ya existe una mesa con el número {numero}")
+                return
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                # Verificar si la mesa ya existe
-                cursor.execute("SELECT COUNT(*) FROM mesas WHERE numero = ?", (numero,))
-                if cursor.fetchone()[0] > 0:
-                    QMessageBox.warning(self, "Error", f"Ya existe una mesa con el número {numero}")
-                    return
-                
-                # Insertar nueva mesa
-                cursor.execute(
-                    "INSERT INTO mesas (numero, seccion) VALUES (?, ?)",
-                    (numero, seccion)
-                )
-                conexion.commit()
-                
-                # Actualizar vistas
-                self.cargar_secciones()
-                self.actualizar_mesas()
-                
-                QMessageBox.information(self, "Éxito", f"Mesa {numero} agregada correctamente")
-                dialog.accept()
-                
-            except sqlite3.IntegrityError:
+            # Actualizar vistas
+            self.cargar_secciones()
+            self.actualizar_mesas()
+            
+            QMessageBox.information(self, "Éxito", f"Mesa {numero} agregada correctamente")
+            dialog.accept()
+        
+        def al_fallar(e):
+            if isinstance(e, sqlite3.IntegrityError):
                 QMessageBox.warning(self, "Error", f"Ya existe una mesa con el número {numero}")
-            except Exception as e:
+            else:
                 QMessageBox.critical(self, "Error", f"Error al agregar mesa: {str(e)}")
-            finally:
-                conexion.close()
+        
+        obtener_ejecutor().enviar(
+            self.servicio.agregar_mesa, numero, seccion,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
     
     def eliminar_mesa(self):
         # Obtener todas las mesas
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, numero, seccion, estado FROM mesas ORDER BY seccion, numero")
-                mesas = cursor.fetchall()
-                
-                if not mesas:
-                    QMessageBox.information(self, "Información", "No hay mesas para eliminar")
+        obtener_ejecutor().enviar(
+            self.servicio.listar_mesas, None,
+            al_terminar=self.seleccionar_mesa_a_eliminar,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al eliminar mesa: {str(e)}")
+        )
+    
+    def seleccionar_mesa_a_eliminar(self, mesas):
+        if not mesas:
+            QMessageBox.information(self, "Información", "No hay mesas para eliminar")
+            return
+        
+        # Crear lista de números de mesa
+        numeros_mesas = [str(mesa[1]) for mesa in mesas]
+        
+        # Mostrar diálogo para seleccionar mesa a eliminar
+        numero, ok = QInputDialog.getItem(
+            self,
+            "Eliminar Mesa",
+            "Seleccione la mesa a eliminar:",
+            numeros_mesas,
+            0,  # Índice por defecto
+            False  # No editable
+        )
+        
+        if not ok or not numero:
+            return
+        
+        # Encontrar la mesa seleccionada
+        mesa_a_eliminar = None
+        for mesa in mesas:
+            if str(mesa[1]) == numero:
+                mesa_a_eliminar = mesa
+                break
+        
+        if not mesa_a_eliminar:
+            return
+        
+        # Verificar si la mesa está ocupada
+        if mesa_a_eliminar[3] == "ocupada":  # índice 3 es estado
+            QMessageBox.warning(self, "Error", "No se puede eliminar una mesa ocupada")
+            return
+            
+        # Confirmar eliminación
+        respuesta = QMessageBox.question(
+            self,
+            "Confirmar eliminación",
+            f"¿Está seguro de eliminar la Mesa {mesa_a_eliminar[1]}?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if respuesta == QMessageBox.Yes:
+            def al_terminar(eliminada):
+                if not eliminada:
+                    QMessageBox.warning(self, "Error", "No se puede eliminar una mesa ocupada")
                     return
-                
-                # Crear lista de números de mesa
-                numeros_mesas = [str(mesa[1]) for mesa in mesas]
-                
-                # Mostrar diálogo para seleccionar mesa a eliminar
-                numero, ok = QInputDialog.getItem(
-                    self,
-                    "Eliminar Mesa",
-                    "Seleccione la mesa a eliminar:",
-                    numeros_mesas,
-                    0,  # Índice por defecto
-                    False  # No editable
-                )
-                
-                if ok and numero:
-                    # Encontrar la mesa seleccionada
-                    mesa_a_eliminar = None
-                    for mesa in mesas:
-                        if str(mesa[1]) == numero:
-                            mesa_a_eliminar = mesa
-                            break
-                    
-                    if mesa_a_eliminar:
-                        # Verificar si la mesa está ocupada
-                        if mesa_a_eliminar[3] == "ocupada":  # índice 3 es estado
-                            QMessageBox.warning(self, "Error", "No se puede eliminar una mesa ocupada")
-                            return
-                            
-                        # Confirmar eliminación
-                        respuesta = QMessageBox.question(
-                            self,
-                            "Confirmar eliminación",
-                            f"¿Está seguro de eliminar la Mesa {mesa_a_eliminar[1]}?",
-                            QMessageBox.Yes | QMessageBox.No
-                        )
-                        
-                        if respuesta == QMessageBox.Yes:
-                            cursor.execute("DELETE FROM mesas WHERE id = ?", (mesa_a_eliminar[0],))
-                            conexion.commit()
-                            self.cargar_secciones()
-                            self.actualizar_mesas()
-                            QMessageBox.information(self, "Éxito", f"Mesa {mesa_a_eliminar[1]} eliminada correctamente")
+                self.cargar_secciones()
+                self.actualizar_mesas()
+                QMessageBox.information(self, "Éxito", f"Mesa {mesa_a_eliminar[1]} eliminada correctamente")
             
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al eliminar mesa: {str(e)}")
-            finally:
-                conexion.close()
\ No newline at end of file
+            obtener_ejecutor().enviar(
+                self.servicio.eliminar_mesa, mesa_a_eliminar[0],
+                al_terminar=al_terminar,
+                al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al eliminar mesa: {str(e)}")
+            )
\ No newline at end of file
@@ -0,0 +1,160 @@
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+from PySide6.QtGui import QColor
+from ejecutor_bd import obtener_ejecutor
+from services.inventario import PAGINA_PRODUCTOS, InventarioService
+
+COLOR_STOCK_BAJO = QColor("#ffcdd2")
+
+class ModeloInventario(QAbstractTableModel):
+    """Productos para el ``QTableView`` del inventario, leídos por páginas.
+
+    La vista pide más filas (``canFetchMore``/``fetchMore``) a medida que se
+    desplaza; cada página se lee en el ejecutor de base de datos a partir de
+    la última fila ya cargada (paginación por clave), así la pantalla abre
+    con una sola página aunque haya decenas de miles de productos. El orden
+    y el filtro por nombre se resuelven en SQL con los índices del
+    inventario. Las filas son ``Producto`` con sus tipos: ``producto(fila)``
+    no necesita interpretar el texto de las celdas.
+    """
+
+    COLUMNAS = ("ID", "Producto", "Precio", "Stock", "Estación", "Mínimo")
+    CAMPOS = ("id", "nombre", "precio", "stock", "estacion", "stock_minimo")
+
+    total_cambiado = Signal(int)
+
+    def __init__(self, servicio=None, pagina=PAGINA_PRODUCTOS, parent=None):
+        super().__init__(parent)
+        self.servicio = servicio or InventarioService()
+        self.pagina = pagina
+        self.orden = "nombre"
+        self.descendente = False
+        self.filtro = ""
+        self._filas = []
+        self._fin = False
+        self._cargando = False
+        self._generacion = 0
+        self.cargado = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if orientacion == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNAS[seccion]
+        return super().headerData(seccion, orientacion, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        producto = self._filas[index.row()]
+        columna = index.column()
+        if role == Qt.DisplayRole:
+            if columna == 2:
+                return f"${producto.precio:.2f}"
+            return str(producto[columna])
+        if role == Qt.UserRole:
+            return producto[columna]
+        if role == Qt.BackgroundRole and producto.stock_minimo and producto.stock <= producto.stock_minimo:
+            # La misma condición que ``alertas_stock``
+            return COLOR_STOCK_BAJO
+        if role == Qt.TextAlignmentRole and columna in (0, 2, 3, 5):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def producto(self, fila):
+        return self._filas[fila] if 0 <= fila < len(self._filas) else None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.cargado and not self._fin and not self._cargando
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._pedir(len(self._filas), self._clave_final(), self.pagina)
+
+    def sort(self, columna, orden=Qt.AscendingOrder):
+        self.orden = self.CAMPOS[columna]
+        self.descendente = orden == Qt.DescendingOrder
+        self.reiniciar()
+
+    def filtrar(self, texto):
+        texto = texto.strip()
+        if texto != self.filtro or not self.cargado:
+            self.filtro = texto
+            self.reiniciar()
+
+    def reiniciar(self):
+        """Volver a la primera página con el orden y el filtro actuales"""
+        self._generacion += 1
+        self.beginResetModel()
+        self._filas = []
+        self._fin = False
+        self.endResetModel()
+        self.cargado = True
+        self._pedir(0, None, self.pagina)
+        obtener_ejecutor().enviar(
+            self.servicio.contar_productos, self.filtro,
+            al_terminar=self.total_cambiado.emit,
+            clave=("inventario-total", id(self))
+        )
+
+    def recargar(self):
+        """Releer las filas ya cargadas (después de cambios en los productos)"""
+        if not self.cargado:
+            self.reiniciar()
+            return
+        self._generacion += 1
+        self._pedir(0, None, max(len(self._filas), self.pagina))
+        obtener_ejecutor().enviar(
+            self.servicio.contar_productos, self.filtro,
+            al_terminar=self.total_cambiado.emit,
+            clave=("inventario-total", id(self))
+        )
+
+    def _clave_final(self):
+        if not self._filas:
+            return None
+        ultimo = self._filas[-1]
+        return getattr(ultimo, self.orden), ultimo.id
+
+    def _pedir(self, desde, despues, limite):
+        self._cargando = True
+        generacion = self._generacion
+        obtener_ejecutor().enviar(
+            self.servicio.pagina_productos, self.orden, self.descendente, self.filtro, despues, limite,
+            al_terminar=lambda filas: self._recibir(generacion, desde, limite, filas),
+            al_fallar=lambda e: self._fallo(generacion, e),
+            clave=("inventario", id(self))
+        )
+
+    def _fallo(self, generacion, error):
+        if generacion == self._generacion:
+            self._cargando = False
+        print(f"Error cargando productos: {error}")
+
+    def _recibir(self, generacion, desde, limite, filas):
+        if generacion != self._generacion:
+            return
+        self._cargando = False
+        self._fin = len(filas) < limite
+        if desde == 0 and self._filas:
+            self._reemplazar(filas)
+        elif filas:
+            self.beginInsertRows(QModelIndex(), len(self._filas), len(self._filas) + len(filas) - 1)
+            self._filas.extend(filas)
+            self.endInsertRows()
+
+    def _reemplazar(self, filas):
+        """Actualizar lo recargado; solo se reinicia si cambiaron las filas"""
+        if [p.id for p in filas] == [p.id for p in self._filas]:
+            cambiadas = [i for i, (nueva, vieja) in enumerate(zip(filas, self._filas)) if nueva != vieja]
+            self._filas = filas
+            if cambiadas:
+                self.dataChanged.emit(self.index(cambiadas[0], 0),
+                                      self.index(cambiadas[-1], len(self.COLUMNAS) - 1))
+        else:
+            self.beginResetModel()
+            self._filas = filas
+            self.endResetModel()
@@ -1,13 +1,22 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-    QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
-    QHeaderView, QComboBox, QSpinBox, QMessageBox
+    QLineEdit, QPushButton, QTableView,
+    QHeaderView, QSpinBox, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QFont
-from database import crear_conexion, sqlite3
-import datetime
-import random
+from database import sqlite3
+from ejecutor_bd import obtener_ejecutor
+from impresion import obtener_impresion
+from services.facturas import FacturasService
+from services.ordenes import Orden, OrdenService, StockInsuficiente
+from services.reservas import DURACION_RESERVA
+from views.alertas_stock import AvisoStockBajo
+from views.catalogo import obtener_catalogo
+from views.factura import mostrar_factura
+from views.lineas_orden import DelegadoEliminar, ModeloLineasOrden
+from views.selector_producto import SelectorProducto
+from vigilante_bd import obtener_vigilante
 
 class OrdenDialog(QDialog):
     estado_mesa_cambiado = Signal()
@@ -15,12 +24,29 @@ class OrdenDialog(QDialog):
     def __init__(self, mesa):
         super().__init__()
         self.mesa = mesa
-        self.productos_seleccionados = []
-        self.orden_id = None
-        self.detalles_originales = {}  # Para almacenar cantidades originales
+        self.servicio = OrdenService()
+        self.facturas = FacturasService()
+        self.catalogo = obtener_catalogo()
+        self.modelo = ModeloLineasOrden(Orden(mesa), self)
         self.setWindowTitle(f"Orden - Mesa {mesa[1]}")
         self.setMinimumSize(800, 600)
+        # Hay una reserva, confirmación o factura en el ejecutor (ver ``reserva_en_curso``)
+        self.reservando = False
+        # Cerrado con una de ellas en curso: las reservas se liberan al terminar
+        self.cerrado = False
         self.setup_ui()
+        
+        obtener_vigilante().ordenes_cambiadas.connect(self.ordenes_cambiadas)
+        
+        # Mantener vigentes las reservas de stock mientras el diálogo está abierto
+        self.timer_reservas = QTimer(self)
+        self.timer_reservas.setInterval(DURACION_RESERVA * 1000 // 3)
+        self.timer_reservas.timeout.connect(self.renovar_reservas)
+        self.timer_reservas.start()
+    
+    @property
+    def orden(self):
+        return self.modelo.orden
     
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -45,13 +71,14 @@ class OrdenDialog(QDialog):
         # Productos disponibles
         productos_layout = QVBoxLayout()
         productos_layout.addWidget(QLabel("Productos Disponibles:"))
+        self.aviso_stock = AvisoStockBajo()
+        productos_layout.addWidget(self.aviso_stock)
         
         # Selección de productos
         producto_selector_layout = QHBoxLayout()
         
-        self.combo_productos = QComboBox()
-        self.combo_productos.setMinimumHeight(40)
-        self.cargar_productos()
+        self.selector_productos = SelectorProducto(self.catalogo)
+        self.selector_productos.producto_elegido.connect(self.agregar_producto)
         
         self.spin_cantidad = QSpinBox()
         self.spin_cantidad.setMinimum(1)
@@ -59,22 +86,26 @@ class OrdenDialog(QDialog):
         self.spin_cantidad.setValue(1)
         self.spin_cantidad.setMinimumHeight(40)
         
-        btn_agregar = QPushButton("Agregar")
-        btn_agregar.setMinimumHeight(40)
-        btn_agregar.clicked.connect(self.agregar_producto)
+        self.btn_agregar = QPushButton("Agregar")
+        self.btn_agregar.setMinimumHeight(40)
+        self.btn_agregar.clicked.connect(self.agregar_producto)
         
-        producto_selector_layout.addWidget(self.combo_productos, 4)
-        producto_selector_layout.addWidget(self.spin_cantidad, 1)
-        producto_selector_layout.addWidget(btn_agregar, 1)
+        producto_selector_layout.addWidget(self.selector_productos, 4)
+        producto_selector_layout.addWidget(self.spin_cantidad, 1, Qt.AlignTop)
+        producto_selector_layout.addWidget(self.btn_agregar, 1, Qt.AlignTop)
         
         productos_layout.addLayout(producto_selector_layout)
         
         # Tabla de productos seleccionados
-        self.tabla_productos = QTableWidget()
-        self.tabla_productos.setColumnCount(5)
-        self.tabla_productos.setHorizontalHeaderLabels(["Producto", "Precio", "Cantidad", "Subtotal", ""])
+        self.tabla_productos = QTableView()
+        self.tabla_productos.setModel(self.modelo)
+        self.tabla_productos.setSelectionBehavior(QTableView.SelectRows)
         self.tabla_productos.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
+        self.delegado_eliminar = DelegadoEliminar(self.tabla_productos)
+        self.delegado_eliminar.eliminar.connect(self.eliminar_producto)
+        self.tabla_productos.setItemDelegateForColumn(ModeloLineasOrden.COLUMNA_ELIMINAR, self.delegado_eliminar)
+        
         # Total
         total_layout = QHBoxLayout()
         total_layout.addWidget(QLabel("Total:"))
@@ -82,6 +113,7 @@ class OrdenDialog(QDialog):
         self.label_total.setFont(QFont("Arial", 14, QFont.Bold))
         self.label_total.setStyleSheet("color: #e74c3c;")
         total_layout.addWidget(self.label_total)
+        self.modelo.total_cambiado.connect(lambda total: self.label_total.setText(f"${total:.2f}"))
         total_layout.addStretch()
         
         # Botones
@@ -122,360 +154,214 @@ class OrdenDialog(QDialog):
             self.input_cliente.setEnabled(False)
         else:
             # Asegurarse de limpiar cualquier dato previo
-            self.productos_seleccionados = []
-            self.orden_id = None
-            self.detalles_originales = {}
-            self.actualizar_tabla_productos()
+            self.modelo.limpiar()
     
-    def cargar_productos(self):
-        self.combo_productos.clear()
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, nombre, precio FROM productos WHERE stock > 0")
-                productos = cursor.fetchall()
-                
-                for producto in productos:
-                    self.combo_productos.addItem(f"{producto[1]} - ${producto[2]:.2f}", producto[0])
-                    
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error cargando productos: {e}")
-            finally:
-                conexion.close()
+    def reserva_en_curso(self, en_curso):
+        """Las reservas van de a una: cada una fija el total pendiente del
+        producto calculado con la orden que dejó la anterior. Confirmar y
+        facturar también las esperan y no dejan editar las líneas mientras
+        borran las reservas de la orden"""
+        self.reservando = en_curso
+        if not en_curso and self.cerrado:
+            # Después de la operación, no antes: si no, su reserva quedaría
+            # retenida hasta vencer
+            self.liberar_reservas()
+            return
+        self.btn_agregar.setEnabled(not en_curso)
+        self.tabla_productos.setEnabled(not en_curso)
+    
+    def reservar(self, producto_id, pendiente, al_terminar=None, al_fallar=None):
+        """Reservar el total ``pendiente`` (calculado aquí, en el hilo de la
+        interfaz) sin pasar la ``Orden`` al ejecutor"""
+        self.reserva_en_curso(True)
+        
+        def terminar(resultado):
+            self.reserva_en_curso(False)
+            if al_terminar and not self.cerrado:
+                al_terminar(resultado)
+        
+        def fallar(error):
+            self.reserva_en_curso(False)
+            if al_fallar and not self.cerrado:
+                al_fallar(error)
+        
+        obtener_ejecutor().enviar(
+            self.servicio.reservar, self.orden.sesion, producto_id, pendiente,
+            al_terminar=terminar, al_fallar=fallar, clave=("reserva", id(self), producto_id)
+        )
     
     def agregar_producto(self):
-        indice = self.combo_productos.currentIndex()
-        if indice < 0:
+        if self.reservando:
+            return
+        producto = self.selector_productos.producto_actual()
+        if producto is None:
             QMessageBox.warning(self, "Error", "Seleccione un producto")
             return
             
-        producto_id = self.combo_productos.itemData(indice)
-        nombre = self.combo_productos.currentText().split(' - ')[0]
-        precio = float(self.combo_productos.currentText().split(' - $')[1])
+        producto_id, nombre, precio = producto.id, producto.nombre, producto.precio
         cantidad = self.spin_cantidad.value()
         
-        stock_disponible = self.consultar_stock(producto_id)
-        if stock_disponible is None:
-            return
-            
-        # Calcular cantidad total en la orden (incluyendo ya existente)
-        cantidad_total = cantidad
-        if producto_id in self.detalles_originales:
-            cantidad_total += self.detalles_originales[producto_id]['cantidad_actual']
-        
-        # Verificar stock disponible
-        if cantidad_total > stock_disponible:
-            QMessageBox.warning(
-                self, 
-                "Stock insuficiente",
-                f"No hay suficiente stock de {nombre}\nStock disponible: {stock_disponible}"
-            )
-            return
-        
-        # Actualizar o agregar producto
-        subtotal = precio * cantidad
-        producto_existente = next(
-            (p for p in self.productos_seleccionados if p['id'] == producto_id), 
-            None
-        )
+        def al_terminar(_):
+            self.modelo.agregar(producto_id, nombre, precio, cantidad)
+            self.selector_productos.limpiar()
         
-        if producto_existente:
-            producto_existente['cantidad'] += cantidad
-            producto_existente['subtotal'] = producto_existente['cantidad'] * precio
-        else:
-            self.productos_seleccionados.append({
-                'id': producto_id,
-                'nombre': nombre,
-                'precio': precio,
-                'cantidad': cantidad,
-                'subtotal': subtotal
-            })
-        
-        self.actualizar_tabla_productos()
-    
-    def consultar_stock(self, producto_id):
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT stock FROM productos WHERE id = ?", (producto_id,))
-                resultado = cursor.fetchone()
-                return resultado[0] if resultado else 0
-            except Exception as e:
+        def al_fallar(e):
+            if isinstance(e, StockInsuficiente):
+                QMessageBox.warning(
+                    self, 
+                    "Stock insuficiente",
+                    f"No hay suficiente stock de {e.nombre}\nStock disponible: {e.disponible}"
+                )
+            else:
                 QMessageBox.critical(self, "Error", f"Error consultando stock: {str(e)}")
-            finally:
-                conexion.close()
-        return None
-    
-    def actualizar_tabla_productos(self):
-        self.tabla_productos.setRowCount(len(self.productos_seleccionados))
-        total = 0
-        
-        for fila, producto in enumerate(self.productos_seleccionados):
-            self.tabla_productos.setItem(fila, 0, QTableWidgetItem(producto['nombre']))
-            self.tabla_productos.setItem(fila, 1, QTableWidgetItem(f"${producto['precio']:.2f}"))
-            self.tabla_productos.setItem(fila, 2, QTableWidgetItem(str(producto['cantidad'])))
-            self.tabla_productos.setItem(fila, 3, QTableWidgetItem(f"${producto['subtotal']:.2f}"))
-            
-            btn_eliminar = QPushButton("Eliminar")
-            btn_eliminar.setStyleSheet("background-color: #e74c3c; color: white;")
-            btn_eliminar.clicked.connect(lambda _, f=fila: self.eliminar_producto(f))
-            self.tabla_productos.setCellWidget(fila, 4, btn_eliminar)
-            
-            total += producto['subtotal']
         
-        self.label_total.setText(f"${total:.2f}")
+        self.reservar(producto_id, self.orden.pendiente(producto_id, cantidad), al_terminar, al_fallar)
     
     def eliminar_producto(self, fila):
-        if 0 <= fila < len(self.productos_seleccionados):
-            self.productos_seleccionados.pop(fila)
-            self.actualizar_tabla_productos()
+        if self.reservando:
+            return
+        linea = self.modelo.quitar(fila)
+        if linea:
+            # Devolver lo reservado para esa línea
+            self.reservar(linea['id'], self.orden.pendiente(linea['id']),
+                          al_fallar=lambda e: print(f"Error liberando reserva: {e}"))
+    
+    def renovar_reservas(self):
+        obtener_ejecutor().enviar(
+            self.servicio.reservas.renovar, self.orden.sesion,
+            al_fallar=lambda e: print(f"Error renovando reservas: {e}")
+        )
+    
+    def liberar_reservas(self):
+        obtener_ejecutor().enviar(
+            self.servicio.liberar_reservas, self.orden.copia(),
+            al_fallar=lambda e: print(f"Error liberando reservas: {e}")
+        )
+    
+    def done(self, resultado):
+        # Al cerrar el diálogo lo no confirmado deja de estar reservado
+        self.timer_reservas.stop()
+        self.cerrado = True
+        if not self.reservando:
+            self.liberar_reservas()
+        super().done(resultado)
     
     def cargar_orden_existente(self):
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("""
-                    SELECT id, cliente_nombre 
-                    FROM ordenes 
-                    WHERE mesa_id = ? AND estado = 'abierta'
-                """, (self.mesa[0],))
-                orden = cursor.fetchone()
-                
-                if orden:
-                    self.orden_id = orden[0]
-                    self.input_cliente.setText(orden[1])
-                    
-                    # Obtener productos de la orden
-                    cursor.execute("""
-                        SELECT p.id, p.nombre, p.precio, d.cantidad, d.subtotal
-                        FROM orden_detalles d
-                        JOIN productos p ON d.producto_id = p.id
-                        WHERE d.orden_id = ?
-                    """, (self.orden_id,))
-                    
-                    self.detalles_originales = {}
-                    self.productos_seleccionados = []
-                    
-                    for producto in cursor.fetchall():
-                        producto_id = producto[0]
-                        self.detalles_originales[producto_id] = {
-                            'cantidad_original': producto[3],
-                            'cantidad_actual': producto[3]
-                        }
-                        self.productos_seleccionados.append({
-                            'id': producto_id,
-                            'nombre': producto[1],
-                            'precio': producto[2],
-                            'cantidad': producto[3],
-                            'subtotal': producto[4]
-                        })
-                    
-                    self.actualizar_tabla_productos()
-                    self.btn_factura.setVisible(True)
-                else:
-                    # No existe orden abierta, limpiar datos
-                    self.orden_id = None
-                    self.productos_seleccionados = []
-                    self.detalles_originales = {}
-                    self.actualizar_tabla_productos()
-                    
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error cargando orden existente: {e}")
-            finally:
-                conexion.close()
+        obtener_ejecutor().enviar(
+            self.servicio.abrir, self.mesa,
+            al_terminar=self.mostrar_orden_existente,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error cargando orden existente: {e}"),
+            clave=("orden", id(self))
+        )
+    
+    def mostrar_orden_existente(self, orden):
+        # Las reservas siguen siendo de este diálogo
+        orden.sesion = self.orden.sesion
+        self.modelo.establecer_orden(orden)
+        if orden.orden_id:
+            self.input_cliente.setText(orden.cliente)
+            self.input_cliente.setEnabled(False)
+            self.btn_factura.setVisible(True)
+        else:
+            self.input_cliente.setEnabled(True)
+            self.btn_factura.setVisible(False)
+    
+    def ordenes_cambiadas(self):
+        # Recargar la orden modificada en otra terminal solo si aquí no hay
+        # cambios sin confirmar ni una operación en curso
+        ocupado = self.reservando or not self.btn_confirmar.isEnabled() or not self.btn_factura.isEnabled()
+        if ocupado or any(self.orden.cambios_stock().values()):
+            return
+        self.cargar_orden_existente()
     
     def confirmar_orden(self):
+        if self.reservando:
+            return
         cliente = self.input_cliente.text().strip()
         if not cliente:
             QMessageBox.warning(self, "Error", "Debe ingresar el nombre del cliente")
             return
             
-        if not self.productos_seleccionados:
+        if not self.orden.lineas:
             QMessageBox.warning(self, "Error", "Debe agregar al menos un producto a la orden")
             return
+        
+        # Se confirma una copia; las líneas no se editan hasta que termine
+        # porque ``confirmar`` borra las reservas de sus productos
+        self.orden.cliente = cliente
+        confirmada = self.orden.copia()
+        
+        def al_terminar(orden_id):
+            self.btn_confirmar.setEnabled(True)
+            self.reserva_en_curso(False)
+            self.orden.orden_id = orden_id
+            self.orden.originales = confirmada.originales
+            QMessageBox.information(self, "Éxito", "Orden registrada correctamente")
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                # Verificar si ya existe una orden para esta mesa
-                cursor.execute("SELECT id FROM ordenes WHERE mesa_id = ? AND estado = 'abierta'", (self.mesa[0],))
-                orden_existente = cursor.fetchone()
-                
-                if orden_existente:
-                    # Actualizar orden existente
-                    self.orden_id = orden_existente[0]
-                    cursor.execute("""
-                        UPDATE ordenes 
-                        SET cliente_nombre = ?, total = ?
-                        WHERE id = ?
-                    """, (cliente, float(self.label_total.text().replace('$', '')), self.orden_id))
-                else:
-                    # Crear nueva orden
-                    cursor.execute("""
-                        INSERT INTO ordenes (mesa_id, cliente_nombre, estado, total) 
-                        VALUES (?, ?, ?, ?)
-                    """, (self.mesa[0], cliente, 'abierta', float(self.label_total.text().replace('$', ''))))
-                    self.orden_id = cursor.lastrowid
-                
-                # Actualizar estado de la mesa
-                cursor.execute("""
-                    UPDATE mesas SET estado = 'ocupada' WHERE id = ?
-                """, (self.mesa[0],))
-                
-                # Manejar cambios en el inventario
-                cambios_stock = {}
-                
-                # Calcular cambios para productos nuevos
-                for producto in self.productos_seleccionados:
-                    producto_id = producto['id']
-                    cantidad_actual = producto['cantidad']
-                    
-                    # Calcular diferencia con la cantidad original
-                    if producto_id in self.detalles_originales:
-                        cantidad_original = self.detalles_originales[producto_id]['cantidad_original']
-                        diferencia = cantidad_actual - cantidad_original
-                    else:
-                        cantidad_original = 0
-                        diferencia = cantidad_actual
-                    
-                    cambios_stock[producto_id] = diferencia
-                
-                # Calcular cambios para productos eliminados
-                for producto_id, detalle in self.detalles_originales.items():
-                    if producto_id not in cambios_stock:
-                        cambios_stock[producto_id] = -detalle['cantidad_original']
-                
-                # Verificar stock disponible para cambios
-                for producto_id, diferencia in cambios_stock.items():
-                    if diferencia > 0:  # Solo verificar si estamos agregando
-                        cursor.execute("SELECT stock, nombre FROM productos WHERE id = ?", (producto_id,))
-                        stock_actual, nombre = cursor.fetchone()
-                        
-                        if stock_actual < diferencia:
-                            QMessageBox.warning(
-                                self, 
-                                "Stock insuficiente",
-                                f"No hay suficiente stock de {nombre}\nStock disponible: {stock_actual}"
-                            )
-                            conexion.rollback()
-                            return
-                
-                # Aplicar cambios al inventario
-                for producto_id, diferencia in cambios_stock.items():
-                    if diferencia != 0:
-                        cursor.execute("""
-                            UPDATE productos 
-                            SET stock = stock - ? 
-                            WHERE id = ?
-                        """, (diferencia, producto_id))
-                
-                # Eliminar detalles antiguos e insertar nuevos
-                cursor.execute("DELETE FROM orden_detalles WHERE orden_id = ?", (self.orden_id,))
-                
-                for producto in self.productos_seleccionados:
-                    cursor.execute("""
-                        INSERT INTO orden_detalles (orden_id, producto_id, cantidad, subtotal)
-                        VALUES (?, ?, ?, ?)
-                    """, (self.orden_id, producto['id'], producto['cantidad'], producto['subtotal']))
-                
-                conexion.commit()
-                QMessageBox.information(self, "Éxito", "Orden registrada correctamente")
-                
-                # Actualizar detalles originales para futuras ediciones
-                for producto in self.productos_seleccionados:
-                    producto_id = producto['id']
-                    self.detalles_originales[producto_id] = {
-                        'cantidad_original': producto['cantidad'],
-                        'cantidad_actual': producto['cantidad']
-                    }
-                
-                self.input_cliente.setEnabled(False)
-                self.btn_factura.setVisible(True)
-                self.estado_mesa_cambiado.emit()
-                
-            except sqlite3.IntegrityError:
+            self.input_cliente.setEnabled(False)
+            self.btn_factura.setVisible(True)
+            self.estado_mesa_cambiado.emit()
+        
+        def al_fallar(e):
+            self.btn_confirmar.setEnabled(True)
+            self.reserva_en_curso(False)
+            if isinstance(e, StockInsuficiente):
+                QMessageBox.warning(
+                    self, 
+                    "Stock insuficiente",
+                    f"No hay suficiente stock de {e.nombre}\nStock disponible: {e.disponible}"
+                )
+            elif isinstance(e, sqlite3.IntegrityError):
                 QMessageBox.critical(self, "Error", "Ya existe una orden abierta para esta mesa")
-            except Exception as e:
-                conexion.rollback()
+            else:
                 QMessageBox.critical(self, "Error", f"Error al guardar la orden: {str(e)}")
-            finally:
-                conexion.close()
+        
+        self.btn_confirmar.setEnabled(False)
+        self.reserva_en_curso(True)
+        obtener_ejecutor().enviar(
+            self.servicio.confirmar, confirmada,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
     
     def generar_factura(self):
-        total = sum(p['subtotal'] for p in self.productos_seleccionados)
-        numero_factura = f"FACT-{datetime.datetime.now().strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
-        
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                # Crear factura
-                cursor.execute("""
-                    INSERT INTO facturas (orden_id, numero_factura, cliente_nombre, total) 
-                    VALUES (?, ?, ?, ?)
-                """, (self.orden_id, numero_factura, self.input_cliente.text(), total))
-                
-                # Actualizar estado de la orden
-                cursor.execute("""
-                    UPDATE ordenes SET estado = 'facturada' 
-                    WHERE id = ?
-                """, (self.orden_id,))
-                
-                # Liberar mesa
-                cursor.execute("""
-                    UPDATE mesas SET estado = 'libre' 
-                    WHERE id = ?
-                """, (self.mesa[0],))
-                
-                conexion.commit()
-                self.mostrar_resumen_factura(numero_factura, total)
-                self.estado_mesa_cambiado.emit()
-                
-                # Limpiar datos para futuras órdenes
-                self.productos_seleccionados = []
-                self.orden_id = None
-                self.detalles_originales = {}
-                self.actualizar_tabla_productos()
-                self.input_cliente.clear()
-                self.input_cliente.setEnabled(True)
-                self.btn_factura.setVisible(False)
-                
-            except Exception as e:
-                conexion.rollback()
-                QMessageBox.critical(self, "Error", f"Error al generar factura: {str(e)}")
-            finally:
-                conexion.close()
-    
-    def mostrar_resumen_factura(self, numero_factura, total):
-        mensaje = f"<b>FACTURA GENERADA</b><br><br>"
-        mensaje += f"<b>Número:</b> {numero_factura}<br>"
-        mensaje += f"<b>Fecha:</b> {datetime.datetime.now().strftime('%d/%m/%Y %H:%M')}<br>"
-        mensaje += f"<b>Mesa:</b> {self.mesa[1]}<br>"
-        mensaje += f"<b>Cliente:</b> {self.input_cliente.text()}<br><br>"
-        
-        mensaje += "<b>Detalle de productos:</b><br>"
-        mensaje += "<table border='1' style='border-collapse: collapse; width: 100%;'>"
-        mensaje += "<tr><th>Producto</th><th>Precio</th><th>Cantidad</th><th>Subtotal</th></tr>"
-        
-        for producto in self.productos_seleccionados:
-            mensaje += f"<tr><td>{producto['nombre']}</td>"
-            mensaje += f"<td>${producto['precio']:.2f}</td>"
-            mensaje += f"<td>{producto['cantidad']}</td>"
-            mensaje += f"<td>${producto['subtotal']:.2f}</td></tr>"
-        
-        mensaje += f"<tr><td colspan='3' align='right'><b>Total:</b></td>"
-        mensaje += f"<td><b>${total:.2f}</b></td></tr>"
-        mensaje += "</table>"
-        
-        msg_box = QMessageBox(self)
-        msg_box.setWindowTitle("Factura Generada")
-        msg_box.setTextFormat(Qt.RichText)
-        msg_box.setText(mensaje)
-        msg_box.setStandardButtons(QMessageBox.Ok)
-        msg_box.exec()
\ No newline at end of file
+        if self.reservando:
+            return
+        # Se factura lo confirmado: lo agregado o quitado después no movió stock
+        if any(self.orden.cambios_stock().values()):
+            QMessageBox.warning(self, "Error", "Confirme los cambios de la orden antes de facturar")
+            return
+        self.orden.cliente = self.input_cliente.text()
+        
+        def al_terminar(resultado):
+            numero_factura, total = resultado
+            self.btn_factura.setEnabled(True)
+            self.reserva_en_curso(False)
+            self.estado_mesa_cambiado.emit()
+            
+            # Imprimir y mostrar lo que quedó guardado en la factura
+            def mostrar(factura):
+                obtener_impresion().imprimir(factura)
+                mostrar_factura(self, factura)
+            obtener_ejecutor().enviar(
+                self.facturas.obtener, numero_factura,
+                al_terminar=mostrar,
+                al_fallar=lambda e: QMessageBox.information(self, "Factura", f"Factura {numero_factura} generada")
+            )
+            
+            # Limpiar datos para futuras órdenes
+            self.modelo.limpiar()
+            self.input_cliente.clear()
+            self.input_cliente.setEnabled(True)
+            self.btn_factura.setVisible(False)
+        
+        def al_fallar(e):
+            self.btn_factura.setEnabled(True)
+            self.reserva_en_curso(False)
+            QMessageBox.critical(self, "Error", f"Error al generar factura: {str(e)}")
+        
+        self.btn_factura.setEnabled(False)
+        self.reserva_en_curso(True)
+        obtener_ejecutor().enviar(
+            self.servicio.facturar, self.orden.copia(),
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
@@ -0,0 +1,236 @@
+from PySide6.QtWidgets import (
+    QApplication, QGraphicsItem, QGraphicsScene, QGraphicsSimpleTextItem,
+    QGraphicsView, QStyleOptionGraphicsItem
+)
+from PySide6.QtCore import Qt, QRectF, Signal
+from PySide6.QtGui import QBrush, QColor, QFont, QPainter, QPen
+from iconos import ICONOS_MESA, obtener_iconos
+
+ANCHO_MESA = 120
+ALTO_MESA = 120
+SEPARACION = 30
+COLUMNAS = 10
+ALTO_TITULO = 50
+ESPACIO_SECCIONES = 40
+
+ZOOM_MINIMO = 0.1
+ZOOM_MAXIMO = 4.0
+
+# Por debajo de este nivel de detalle solo se pinta el color del estado
+DETALLE_MINIMO = 0.4
+
+COLORES_ESTADO = {
+    "ocupada": QColor("#ffcccc"),
+    "libre": QColor("#ccffcc"),
+}
+
+class MesaItem(QGraphicsItem):
+    """Mesa dibujada directamente por la escena, sin widget propio"""
+
+    fuente = None
+
+    def __init__(self, mesa):
+        super().__init__()
+        self.mesa = tuple(mesa[:4])  # (id, numero, seccion, estado)
+
+    def boundingRect(self):
+        return QRectF(0, 0, ANCHO_MESA, ALTO_MESA)
+
+    def actualizar(self, mesa):
+        mesa = tuple(mesa[:4])
+        if mesa != self.mesa:
+            self.mesa = mesa
+            self.update()
+
+    def paint(self, painter, option, widget=None):
+        rect = self.boundingRect().adjusted(1, 1, -1, -1)
+        estado = self.mesa[3]
+
+        painter.setPen(QPen(QColor("#800020"), 2))
+        painter.setBrush(QBrush(COLORES_ESTADO.get(estado, COLORES_ESTADO["libre"])))
+        painter.drawRoundedRect(rect, 15, 15)
+
+        detalle = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if detalle < DETALLE_MINIMO:
+            return
+
+        dpr = widget.devicePixelRatioF() if widget else 1.0
+        pixmap = obtener_iconos().pixmap(
+            ICONOS_MESA["ocupada" if estado == "ocupada" else "libre"], 60, 60, dpr, componer=True
+        )
+        if not pixmap.isNull():
+            ancho = pixmap.width() / pixmap.devicePixelRatio()
+            painter.drawPixmap(int((ANCHO_MESA - ancho) / 2), 12, pixmap)
+
+        if MesaItem.fuente is None:
+            MesaItem.fuente = QFont("Segoe UI", 11, QFont.Bold)
+        painter.setFont(MesaItem.fuente)
+        painter.setPen(QColor("#333333"))
+        painter.drawText(QRectF(0, ALTO_MESA - 40, ANCHO_MESA, 30), Qt.AlignCenter, f"Mesa {self.mesa[1]}")
+
+def posicion_automatica(indice):
+    """Posición dentro de la sección de la mesa número ``indice`` sin ubicar"""
+    fila, columna = divmod(indice, COLUMNAS)
+    return (columna * (ANCHO_MESA + SEPARACION), fila * (ALTO_MESA + SEPARACION))
+
+class PlanoMesas(QGraphicsView):
+    """Plano del salón sobre ``QGraphicsScene``.
+
+    La escena indexa las mesas con un árbol BSP, así que cada repintado solo
+    recorre las que están a la vista. Las posiciones guardadas (``pos_x``,
+    ``pos_y``) son relativas al origen de la sección; las mesas sin posición
+    se acomodan en una grilla.
+    """
+
+    mesa_seleccionada = Signal(object)
+    mesa_movida = Signal(int, float, float)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.escena = QGraphicsScene(self)
+        self.escena.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.escena.setBackgroundBrush(QColor("#F5F5DC"))
+        self.setScene(self.escena)
+
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setOptimizationFlag(QGraphicsView.DontSavePainterState)
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+
+        self.items_mesa = {}    # mesa_id -> MesaItem
+        self.posiciones = {}    # mesa_id -> (pos_x, pos_y) guardadas
+        self.titulos = {}       # seccion -> QGraphicsSimpleTextItem
+        self.filtro = None
+        self.editable = False
+        self._pulsacion = None
+
+    def mostrar_mesas(self, mesas):
+        """Sincronizar la escena con filas (id, numero, seccion, estado, pos_x, pos_y)"""
+        vigentes = {mesa[0]: mesa for mesa in mesas}
+        for mesa_id in [m for m in self.items_mesa if m not in vigentes]:
+            self.escena.removeItem(self.items_mesa.pop(mesa_id))
+            self.posiciones.pop(mesa_id, None)
+
+        for mesa in mesas:
+            item = self.items_mesa.get(mesa[0])
+            if item is None:
+                item = MesaItem(mesa)
+                item.setFlag(QGraphicsItem.ItemIsMovable, self.editable)
+                self.items_mesa[mesa[0]] = item
+                self.escena.addItem(item)
+            else:
+                item.actualizar(mesa)
+            self.posiciones[mesa[0]] = (mesa[4], mesa[5])
+
+        self.acomodar()
+
+    def actualizar_mesa(self, mesa):
+        """Aplicar el estado de una mesa; False si hace falta recargar todo"""
+        item = self.items_mesa.get(mesa[0]) if mesa else None
+        if item is None or item.mesa[2] != mesa[2]:
+            return False
+        item.actualizar(mesa)
+        return True
+
+    def filtrar(self, seccion):
+        self.filtro = seccion
+        self.acomodar()
+
+    def acomodar(self):
+        """Ubicar secciones una debajo de otra y las mesas dentro de cada una"""
+        por_seccion = {}
+        for item in self.items_mesa.values():
+            por_seccion.setdefault(item.mesa[2], []).append(item)
+
+        for seccion in [s for s in self.titulos if s not in por_seccion]:
+            self.escena.removeItem(self.titulos.pop(seccion))
+
+        y = 0
+        for seccion in sorted(por_seccion):
+            items = por_seccion[seccion]
+            titulo = self.titulos.get(seccion)
+            if titulo is None:
+                titulo = QGraphicsSimpleTextItem(seccion)
+                titulo.setFont(QFont("Segoe UI", 16, QFont.Bold))
+                titulo.setBrush(QColor("#800020"))
+                self.escena.addItem(titulo)
+                self.titulos[seccion] = titulo
+
+            visible = self.filtro is None or seccion == self.filtro
+            titulo.setVisible(visible)
+            for item in items:
+                item.setVisible(visible)
+            if not visible:
+                continue
+
+            titulo.setPos(0, y)
+            origen = y + ALTO_TITULO
+            alto = 0
+            items.sort(key=lambda i: i.mesa[1])
+            for indice, item in enumerate(items):
+                pos_x, pos_y = self.posiciones.get(item.mesa[0], (None, None))
+                if pos_x is None or pos_y is None:
+                    pos_x, pos_y = posicion_automatica(indice)
+                item.setPos(pos_x, origen + pos_y)
+                alto = max(alto, pos_y + ALTO_MESA)
+            y = origen + alto + ESPACIO_SECCIONES
+
+        self.escena.setSceneRect(self.escena.itemsBoundingRect().adjusted(-20, -20, 20, 20))
+
+    def set_editable(self, editable):
+        """En modo edición las mesas se arrastran en lugar de abrir la orden"""
+        self.editable = editable
+        self.setDragMode(QGraphicsView.NoDrag if editable else QGraphicsView.ScrollHandDrag)
+        for item in self.items_mesa.values():
+            item.setFlag(QGraphicsItem.ItemIsMovable, editable)
+
+    def zoom(self, factor):
+        actual = self.transform().m11()
+        factor = max(ZOOM_MINIMO / actual, min(factor, ZOOM_MAXIMO / actual))
+        self.scale(factor, factor)
+
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            self.zoom(1.15 ** (event.angleDelta().y() / 120))
+            event.accept()
+        else:
+            super().wheelEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.zoom(1.25)
+        elif event.key() == Qt.Key_Minus:
+            self.zoom(0.8)
+        elif event.key() == Qt.Key_0:
+            self.fitInView(self.escena.sceneRect(), Qt.KeepAspectRatio)
+        else:
+            super().keyPressEvent(event)
+
+    def _mesa_en(self, posicion):
+        item = self.itemAt(posicion)
+        return item if isinstance(item, MesaItem) else None
+
+    def mousePressEvent(self, event):
+        item = self._mesa_en(event.position().toPoint())
+        self._pulsacion = (event.position(), item, item.pos() if item else None)
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if self._pulsacion is None or event.button() != Qt.LeftButton:
+            return
+        inicio, item, posicion = self._pulsacion
+        self._pulsacion = None
+        if item is None:
+            return
+
+        if self.editable:
+            if item.pos() != posicion:
+                titulo = self.titulos[item.mesa[2]]
+                pos_x = max(item.pos().x(), 0)
+                pos_y = max(item.pos().y() - titulo.pos().y() - ALTO_TITULO, 0)
+                self.posiciones[item.mesa[0]] = (pos_x, pos_y)
+                self.mesa_movida.emit(item.mesa[0], pos_x, pos_y)
+                self.acomodar()
+        elif (event.position() - inicio).manhattanLength() < QApplication.startDragDistance():
+            self.mesa_seleccionada.emit(item.mesa)
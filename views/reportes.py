@@ -1,26 +1,170 @@
-from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout
+from PySide6.QtWidgets import (
+    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QComboBox, QTabWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
+)
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont
+from ejecutor_bd import obtener_ejecutor
+from services.reportes import PERIODOS, ReportesService, rango_periodo
+from vigilante_bd import obtener_vigilante
+
+PERIODO_PREDETERMINADO = "Este mes"
+
+def celda(valor, importe=False):
+    if importe:
+        item = QTableWidgetItem(f"$ {valor:,.2f}")
+    else:
+        item = QTableWidgetItem(str(valor))
+    if isinstance(valor, (int, float)):
+        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    return item
 
 class ReportesView(QWidget):
+    """Tablero de ventas del período elegido.
+
+    Lee solo los resúmenes de ventas (``services.reportes``), así que se
+    puede recargar con cada factura sin recorrer el historial.
+    """
+
     def __init__(self):
         super().__init__()
+        self.servicio = ReportesService()
+        # Facturas nuevas mientras la vista estaba oculta
+        self.desactualizado = False
         self.setup_ui()
-        
+        obtener_vigilante().ordenes_cambiadas.connect(self.ordenes_cambiadas)
+
     def setup_ui(self):
         layout = QVBoxLayout()
-        
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
         titulo = QLabel("REPORTES")
         titulo.setFont(QFont("Segoe UI", 16, QFont.Bold))
         titulo.setAlignment(Qt.AlignCenter)
         titulo.setObjectName("titulo")
         layout.addWidget(titulo)
-        
-        mensaje = QLabel("Módulo en construcción")
-        mensaje.setAlignment(Qt.AlignCenter)
-        layout.addWidget(mensaje)
-        
+
+        periodo_layout = QHBoxLayout()
+        periodo_layout.addWidget(QLabel("Período:"))
+        self.input_periodo = QComboBox()
+        self.input_periodo.addItems(PERIODOS)
+        self.input_periodo.setCurrentText(PERIODO_PREDETERMINADO)
+        self.input_periodo.setMinimumHeight(35)
+        self.input_periodo.currentTextChanged.connect(self.cargar_datos)
+        periodo_layout.addWidget(self.input_periodo)
+        self.label_rango = QLabel("")
+        periodo_layout.addWidget(self.label_rango, 1)
+        layout.addLayout(periodo_layout)
+
+        # Totales del período
+        totales_layout = QHBoxLayout()
+        totales_layout.setSpacing(15)
+        self.totales = {}
+        for clave, texto in (("total", "Ventas"), ("facturas", "Facturas"),
+                             ("promedio", "Ticket promedio"), ("impuesto", "Impuesto")):
+            etiqueta = QLabel()
+            etiqueta.setAlignment(Qt.AlignCenter)
+            etiqueta.setStyleSheet("""
+                QLabel {
+                    background-color: white;
+                    border: 1px solid #800020;
+                    border-radius: 5px;
+                    padding: 10px;
+                    font-weight: bold;
+                }
+            """)
+            self.totales[clave] = (etiqueta, texto)
+            totales_layout.addWidget(etiqueta)
+        layout.addLayout(totales_layout)
+
+        self.pestanas = QTabWidget()
+        self.tabla_dias = self.crear_tabla(["Fecha", "Facturas", "Ventas"])
+        self.tabla_horas = self.crear_tabla(["Hora", "Facturas", "Ventas"])
+        self.tabla_productos = self.crear_tabla(["Producto", "Cantidad", "Ventas"])
+        self.tabla_secciones = self.crear_tabla(["Sección", "Facturas", "Ventas"])
+        self.pestanas.addTab(self.tabla_dias, "Por día")
+        self.pestanas.addTab(self.tabla_horas, "Por hora")
+        self.pestanas.addTab(self.tabla_productos, "Productos más vendidos")
+        self.pestanas.addTab(self.tabla_secciones, "Por sección")
+        layout.addWidget(self.pestanas)
+
         self.setLayout(layout)
-    
+        self.mostrar_totales(None)
+
+    def crear_tabla(self, columnas):
+        tabla = QTableWidget(0, len(columnas))
+        tabla.setHorizontalHeaderLabels(columnas)
+        tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        tabla.verticalHeader().setVisible(False)
+        tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tabla.setStyleSheet("""
+            QTableView {
+                background-color: white;
+                border: 1px solid #800020;
+                border-radius: 5px;
+            }
+            QHeaderView::section {
+                background-color: #800020;
+                color: white;
+                font-weight: bold;
+            }
+        """)
+        return tabla
+
     def cargar_datos(self):
-        pass  # Implementaremos esto más adelante
\ No newline at end of file
+        desde, hasta = rango_periodo(self.input_periodo.currentText())
+        self.desactualizado = False
+        obtener_ejecutor().enviar(
+            self.servicio.tablero, desde, hasta,
+            al_terminar=self.mostrar_tablero,
+            al_fallar=lambda e: print(f"Error cargando reportes: {e}"),
+            clave=("reportes", id(self))
+        )
+
+    def ordenes_cambiadas(self):
+        # MainWindow recarga los reportes al mostrarlos
+        if self.isVisible():
+            self.cargar_datos()
+        else:
+            self.desactualizado = True
+
+    def mostrar_totales(self, resumen):
+        if resumen is None or not resumen.facturas:
+            valores = {"total": "$ 0.00", "facturas": "0", "promedio": "-", "impuesto": "$ 0.00"}
+        else:
+            valores = {
+                "total": f"$ {resumen.total:,.2f}",
+                "facturas": str(resumen.facturas),
+                "promedio": f"$ {resumen.total / resumen.facturas:,.2f}",
+                "impuesto": f"$ {resumen.impuesto:,.2f}",
+            }
+        for clave, (etiqueta, texto) in self.totales.items():
+            etiqueta.setText(f"{texto}\n{valores[clave]}")
+
+    def llenar(self, tabla, filas):
+        tabla.setRowCount(len(filas))
+        for fila, celdas in enumerate(filas):
+            for columna, item in enumerate(celdas):
+                tabla.setItem(fila, columna, item)
+
+    def mostrar_tablero(self, tablero):
+        self.label_rango.setText(f"del {tablero.desde} al {tablero.hasta}")
+        self.mostrar_totales(tablero.resumen)
+        self.llenar(self.tabla_dias, [
+            (celda(dia.fecha), celda(dia.facturas), celda(dia.total, importe=True))
+            for dia in tablero.dias
+        ])
+        self.llenar(self.tabla_horas, [
+            (celda(f"{hora.hora:02d}:00"), celda(hora.facturas), celda(hora.total, importe=True))
+            for hora in tablero.horas
+        ])
+        self.llenar(self.tabla_productos, [
+            (celda(producto.nombre), celda(producto.cantidad), celda(producto.total, importe=True))
+            for producto in tablero.productos
+        ])
+        self.llenar(self.tabla_secciones, [
+            (celda(seccion.seccion or "Sin sección"), celda(seccion.facturas), celda(seccion.total, importe=True))
+            for seccion in tablero.secciones
+        ])
@@ -0,0 +1,86 @@
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListView
+from PySide6.QtCore import Qt, QEvent, Signal
+from views.catalogo import ModeloCatalogo
+
+class SelectorProducto(QWidget):
+    """Buscador de productos para tomar pedidos.
+
+    Con el campo vacío muestra todo el menú (el modelo compartido del
+    catálogo); al escribir muestra las mejores coincidencias del índice de
+    búsqueda, las más vendidas primero. Flechas para moverse, Enter o doble
+    clic para elegir.
+    """
+
+    producto_elegido = Signal(object)
+
+    def __init__(self, catalogo, parent=None):
+        super().__init__(parent)
+        self.catalogo = catalogo
+        self.resultados = ModeloCatalogo(self)
+        self.setup_ui()
+        self.catalogo.actualizado.connect(self.buscar)
+        self.buscar()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+
+        self.input_busqueda = QLineEdit()
+        self.input_busqueda.setPlaceholderText("Buscar producto...")
+        self.input_busqueda.setMinimumHeight(40)
+        self.input_busqueda.setClearButtonEnabled(True)
+        self.input_busqueda.textChanged.connect(self.buscar)
+        self.input_busqueda.installEventFilter(self)
+        layout.addWidget(self.input_busqueda)
+
+        self.lista = QListView()
+        self.lista.setMaximumHeight(200)
+        self.lista.setUniformItemSizes(True)
+        self.lista.setEditTriggers(QListView.NoEditTriggers)
+        self.lista.doubleClicked.connect(self.elegir)
+        layout.addWidget(self.lista)
+
+    def buscar(self):
+        texto = self.input_busqueda.text()
+        if not texto.strip():
+            modelo = self.catalogo.modelo
+        else:
+            self.resultados.establecer(self.catalogo.buscar(texto))
+            modelo = self.resultados
+
+        if self.lista.model() is not modelo:
+            self.lista.setModel(modelo)
+        if not self.lista.currentIndex().isValid() and modelo.rowCount():
+            self.lista.setCurrentIndex(modelo.index(0))
+
+    def producto_actual(self):
+        indice = self.lista.currentIndex()
+        if not indice.isValid():
+            return None
+        return self.lista.model().producto(indice.row())
+
+    def elegir(self):
+        producto = self.producto_actual()
+        if producto is not None:
+            self.producto_elegido.emit(producto)
+
+    def limpiar(self):
+        self.input_busqueda.clear()
+        self.input_busqueda.setFocus()
+
+    def eventFilter(self, objeto, evento):
+        # Las flechas mueven la selección sin sacar el foco del buscador
+        if objeto is self.input_busqueda and evento.type() == QEvent.KeyPress:
+            # Enter elige aquí para que no dispare también el botón por defecto del diálogo
+            if evento.key() in (Qt.Key_Return, Qt.Key_Enter):
+                self.elegir()
+                return True
+            if evento.key() in (Qt.Key_Down, Qt.Key_Up, Qt.Key_PageDown, Qt.Key_PageUp):
+                modelo = self.lista.model()
+                if modelo is not None and modelo.rowCount():
+                    paso = {Qt.Key_Down: 1, Qt.Key_Up: -1, Qt.Key_PageDown: 10, Qt.Key_PageUp: -10}[evento.key()]
+                    fila = max(0, min(self.lista.currentIndex().row() + paso, modelo.rowCount() - 1))
+                    self.lista.setCurrentIndex(modelo.index(fila))
+                return True
+        return super().eventFilter(objeto, evento)
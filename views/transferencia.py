@@ -0,0 +1,94 @@
+import os
+import threading
+
+from PySide6.QtWidgets import QFileDialog, QMessageBox, QProgressDialog
+from PySide6.QtCore import QObject, Qt, Signal
+from ejecutor_bd import obtener_ejecutor
+from services.importacion import ImportacionService, escribir_errores
+
+FILTRO_ARCHIVOS = "CSV (*.csv);;JSON Lines (*.jsonl *.ndjson)"
+
+class _Avance(QObject):
+    """Lleva el progreso del hilo del ejecutor al hilo de la interfaz"""
+    avanzado = Signal(int, int)
+
+def _dialogo_progreso(parent, texto, cancelable):
+    dialogo = QProgressDialog(texto, "Cancelar" if cancelable else None, 0, 100, parent)
+    dialogo.setWindowTitle("Transferencia")
+    dialogo.setWindowModality(Qt.WindowModal)
+    dialogo.setMinimumDuration(300)
+    dialogo.setAutoClose(False)
+    dialogo.setAutoReset(False)
+    avance = _Avance(dialogo)
+
+    def avanzar(hecho, total):
+        # QProgressDialog trabaja con int: se lleva a porcentaje
+        dialogo.setValue(min(100, hecho * 100 // total) if total else 100)
+    avance.avanzado.connect(avanzar)
+    return dialogo, avance
+
+def importar_tabla(parent, tabla, al_terminar=None, servicio=None):
+    """Elegir un archivo e importarlo a ``tabla`` con una barra de progreso.
+
+    La importación corre en el ejecutor de base de datos; las filas con
+    errores se informan en ``<archivo>.errores.csv`` junto al importado.
+    """
+    ruta, _ = QFileDialog.getOpenFileName(parent, f"Importar {tabla}", "", FILTRO_ARCHIVOS)
+    if not ruta:
+        return
+    servicio = servicio or ImportacionService()
+    dialogo, avance = _dialogo_progreso(parent, f"Importando {os.path.basename(ruta)}...", True)
+    cancelar = threading.Event()
+    dialogo.canceled.connect(cancelar.set)
+
+    def terminar(resultado):
+        dialogo.close()
+        mensaje = f"Se guardaron {resultado.guardadas} de {resultado.leidas} filas."
+        if resultado.cancelada:
+            mensaje = "Importación cancelada. " + mensaje
+        if resultado.errores:
+            reporte = os.path.splitext(ruta)[0] + ".errores.csv"
+            try:
+                escribir_errores(resultado.errores, reporte)
+                mensaje += f"\n{len(resultado.errores)} errores; el detalle quedó en {reporte}"
+            except OSError as e:
+                mensaje += f"\n{len(resultado.errores)} errores (no se pudo guardar el reporte: {e})"
+            QMessageBox.warning(parent, "Importación", mensaje)
+        else:
+            QMessageBox.information(parent, "Importación", mensaje)
+        if al_terminar:
+            al_terminar(resultado)
+
+    def fallar(error):
+        dialogo.close()
+        QMessageBox.critical(parent, "Error", f"Error al importar: {str(error)}")
+
+    obtener_ejecutor().enviar(
+        servicio.importar, tabla, ruta,
+        progreso=avance.avanzado.emit, cancelado=cancelar.is_set,
+        al_terminar=terminar, al_fallar=fallar
+    )
+
+def exportar_tabla(parent, tabla, servicio=None):
+    """Elegir dónde guardar y exportar ``tabla`` con una barra de progreso"""
+    ruta, filtro = QFileDialog.getSaveFileName(parent, f"Exportar {tabla}", f"{tabla}.csv", FILTRO_ARCHIVOS)
+    if not ruta:
+        return
+    if not os.path.splitext(ruta)[1]:
+        ruta += ".jsonl" if "JSON" in filtro else ".csv"
+    servicio = servicio or ImportacionService()
+    dialogo, avance = _dialogo_progreso(parent, f"Exportando {tabla}...", False)
+
+    def terminar(filas):
+        dialogo.close()
+        QMessageBox.information(parent, "Exportación", f"Se exportaron {filas} filas a {ruta}")
+
+    def fallar(error):
+        dialogo.close()
+        QMessageBox.critical(parent, "Error", f"Error al exportar: {str(error)}")
+
+    obtener_ejecutor().enviar(
+        servicio.exportar, tabla, ruta,
+        progreso=avance.avanzado.emit,
+        al_terminar=terminar, al_fallar=fallar
+    )
@@ -6,7 +6,70 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QFont, QIcon, QPixmap
-from database import crear_conexion, sqlite3
+from database import obtener_conexion, sqlite3
+from ejecutor_bd import obtener_ejecutor
+
+# Consultas ejecutadas en segundo plano por EjecutorBD
+
+def consultar_usuarios():
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("SELECT id, usuario, clave, rol FROM usuarios")
+        return cursor.fetchall()
+
+def consultar_usuario(usuario_id):
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("SELECT id, nombre, usuario, clave, rol FROM usuarios WHERE id = ?", (usuario_id,))
+        return cursor.fetchone()
+
+def insertar_usuario(nombre, usuario, clave, rol):
+    """Devuelve False si el nombre de usuario ya está en uso"""
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        
+        # Verificar si el usuario ya existe
+        cursor.execute("SELECT COUNT(*) FROM usuarios WHERE usuario = ?", (usuario,))
+        if cursor.fetchone()[0] > 0:
+            return False
+        
+        # Insertar nuevo usuario
+        cursor.execute(
+            "INSERT INTO usuarios (nombre, usuario, clave, rol) VALUES (?, ?, ?, ?)",
+            (nombre, usuario, clave, rol)
+        )
+        conexion.commit()
+        return True
+
+def actualizar_usuario(usuario_id, nombre, usuario, clave, rol):
+    """Devuelve False si el nombre de usuario ya está en uso"""
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        
+        # Verificar si el usuario ya existe (excluyendo el actual)
+        cursor.execute("SELECT COUNT(*) FROM usuarios WHERE usuario = ? AND id != ?", 
+                      (usuario, usuario_id))
+        if cursor.fetchone()[0] > 0:
+            return False
+        
+        # Actualizar usuario
+        if clave:
+            cursor.execute(
+                "UPDATE usuarios SET nombre=?, usuario=?, clave=?, rol=? WHERE id=?",
+                (nombre, usuario, clave, rol, usuario_id))
+        else:
+            cursor.execute(
+                "UPDATE usuarios SET nombre=?, usuario=?, rol=? WHERE id=?",
+                (nombre, usuario, rol, usuario_id))
+        
+        conexion.commit()
+        return True
+
+def borrar_usuario(usuario_id):
+    with obtener_conexion() as conexion:
+        cursor = conexion.cursor()
+        cursor.execute("DELETE FROM usuarios WHERE id=?", (usuario_id,))
+        conexion.commit()
 
 class NuevoUsuarioDialog(QDialog):
     def __init__(self, parent=None):
@@ -128,33 +191,23 @@ class NuevoUsuarioDialog(QDialog):
             QMessageBox.warning(self, "Error", "La contraseña debe tener al menos 4 caracteres")
             return
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                # Verificar si el usuario ya existe
-                cursor.execute("SELECT COUNT(*) FROM usuarios WHERE usuario = ?", (usuario,))
-                if cursor.fetchone()[0] > 0:
-                    QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
-                    return
-                
-                # Insertar nuevo usuario
-                cursor.execute(
-                    "INSERT INTO usuarios (nombre, usuario, clave, rol) VALUES (?, ?, ?, ?)",
-                    (nombre, usuario, clave, rol)
-                )
-                conexion.commit()
-                
-                QMessageBox.information(self, "Éxito", "Usuario registrado correctamente")
-                self.accept()
-                
-            except sqlite3.IntegrityError:
+        def al_terminar(insertado):
+            if not insertado:
                 QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
-            except Exception as e:
+                return
+            QMessageBox.information(self, "Éxito", "Usuario registrado correctamente")
+            self.accept()
+        
+        def al_fallar(e):
+            if isinstance(e, sqlite3.IntegrityError):
+                QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
+            else:
                 QMessageBox.critical(self, "Error", f"Error al registrar usuario: {str(e)}")
-            finally:
-                conexion.close()
+        
+        obtener_ejecutor().enviar(
+            insertar_usuario, nombre, usuario, clave, rol,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
 
 class EditarUsuarioDialog(QDialog):
     def __init__(self, usuario, parent=None):
@@ -276,39 +329,23 @@ class EditarUsuarioDialog(QDialog):
             QMessageBox.warning(self, "Error", "La contraseña debe tener al menos 4 caracteres")
             return
             
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                
-                # Verificar si el usuario ya existe (excluyendo el actual)
-                cursor.execute("SELECT COUNT(*) FROM usuarios WHERE usuario = ? AND id != ?", 
-                              (usuario, self.usuario[0]))
-                if cursor.fetchone()[0] > 0:
-                    QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
-                    return
-                
-                # Actualizar usuario
-                if clave:
-                    cursor.execute(
-                        "UPDATE usuarios SET nombre=?, usuario=?, clave=?, rol=? WHERE id=?",
-                        (nombre, usuario, clave, rol, self.usuario[0]))
-                else:
-                    cursor.execute(
-                        "UPDATE usuarios SET nombre=?, usuario=?, rol=? WHERE id=?",
-                        (nombre, usuario, rol, self.usuario[0]))
-                
-                conexion.commit()
-                
-                QMessageBox.information(self, "Éxito", "Usuario actualizado correctamente")
-                self.accept()
-                
-            except sqlite3.IntegrityError:
+        def al_terminar(actualizado):
+            if not actualizado:
+                QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
+                return
+            QMessageBox.information(self, "Éxito", "Usuario actualizado correctamente")
+            self.accept()
+        
+        def al_fallar(e):
+            if isinstance(e, sqlite3.IntegrityError):
                 QMessageBox.warning(self, "Error", "El nombre de usuario ya está en uso")
-            except Exception as e:
+            else:
                 QMessageBox.critical(self, "Error", f"Error al actualizar usuario: {str(e)}")
-            finally:
-                conexion.close()
+        
+        obtener_ejecutor().enviar(
+            actualizar_usuario, self.usuario[0], nombre, usuario, clave, rol,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
 
 class UsuariosView(QWidget):
     def __init__(self, es_admin=True):  # Cambiado a True por defecto para pruebas
@@ -408,25 +445,21 @@ class UsuariosView(QWidget):
         self.cargar_usuarios()
     
     def cargar_usuarios(self):
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, usuario, clave, rol FROM usuarios")
-                usuarios = cursor.fetchall()
-                
-                self.tabla_usuarios.setRowCount(len(usuarios))
-                
-                for row, usuario in enumerate(usuarios):
-                    self.tabla_usuarios.setItem(row, 0, QTableWidgetItem(str(usuario[0])))
-                    self.tabla_usuarios.setItem(row, 1, QTableWidgetItem(usuario[1]))
-                    self.tabla_usuarios.setItem(row, 2, QTableWidgetItem(usuario[2]))
-                    self.tabla_usuarios.setItem(row, 3, QTableWidgetItem(usuario[3]))
-                    
-            except Exception as e:
-                print(f"Error cargando usuarios: {e}")
-            finally:
-                conexion.close()
+        obtener_ejecutor().enviar(
+            consultar_usuarios,
+            al_terminar=self.mostrar_usuarios,
+            al_fallar=lambda e: print(f"Error cargando usuarios: {e}"),
+            clave=("usuarios", id(self))
+        )
+    
+    def mostrar_usuarios(self, usuarios):
+        self.tabla_usuarios.setRowCount(len(usuarios))
+        
+        for row, usuario in enumerate(usuarios):
+            self.tabla_usuarios.setItem(row, 0, QTableWidgetItem(str(usuario[0])))
+            self.tabla_usuarios.setItem(row, 1, QTableWidgetItem(usuario[1]))
+            self.tabla_usuarios.setItem(row, 2, QTableWidgetItem(usuario[2]))
+            self.tabla_usuarios.setItem(row, 3, QTableWidgetItem(usuario[3]))
     
     def agregar_usuario(self):
         dialog = NuevoUsuarioDialog(self)
@@ -445,22 +478,17 @@ class UsuariosView(QWidget):
         rol = self.tabla_usuarios.item(fila, 3).text()
         
         # Obtener datos completos del usuario
-        conexion = crear_conexion()
-        if conexion:
-            try:
-                cursor = conexion.cursor()
-                cursor.execute("SELECT id, nombre, usuario, clave, rol FROM usuarios WHERE id = ?", (usuario_id,))
-                usuario_data = cursor.fetchone()
-                
-                if usuario_data:
-                    dialog = EditarUsuarioDialog(usuario_data, self)
-                    if dialog.exec():
-                        self.cargar_usuarios()
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al obtener datos del usuario: {str(e)}")
-            finally:
-                conexion.close()
+        def al_terminar(usuario_data):
+            if usuario_data:
+                dialog = EditarUsuarioDialog(usuario_data, self)
+                if dialog.exec():
+                    self.cargar_usuarios()
+        
+        obtener_ejecutor().enviar(
+            consultar_usuario, usuario_id,
+            al_terminar=al_terminar,
+            al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al obtener datos del usuario: {str(e)}")
+        )
     
     def eliminar_usuario(self):
         fila = self.tabla_usuarios.currentRow()
@@ -484,15 +512,12 @@ class UsuariosView(QWidget):
         )
         
         if respuesta == QMessageBox.Yes:
-            conexion = crear_conexion()
-            if conexion:
-                try:
-                    cursor = conexion.cursor()
-                    cursor.execute("DELETE FROM usuarios WHERE id=?", (usuario_id,))
-                    conexion.commit()
-                    self.cargar_usuarios()
-                    QMessageBox.information(self, "Éxito", "Usuario eliminado correctamente")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Error al eliminar usuario: {str(e)}")
-                finally:
-                    conexion.close()
\ No newline at end of file
+            def al_terminar(_):
+                self.cargar_usuarios()
+                QMessageBox.information(self, "Éxito", "Usuario eliminado correctamente")
+            
+            obtener_ejecutor().enviar(
+                borrar_usuario, usuario_id,
+                al_terminar=al_terminar,
+                al_fallar=lambda e: QMessageBox.critical(self, "Error", f"Error al eliminar usuario: {str(e)}")
+            )
\ No newline at end of file
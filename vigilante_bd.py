@@ -0,0 +1,97 @@
+"""Detección de cambios hechos por otras terminales.
+
+Un ``QTimer`` consulta ``PRAGMA data_version`` en una conexión propia (no del
+pool): el valor solo cambia cuando otra conexión confirma una escritura, y
+leerlo no toca ninguna tabla. Cuando cambia, se lee la tabla ``cambios``
+(mantenida por triggers, ver la migración 6) para saber qué tablas se
+modificaron y se emiten solo las señales correspondientes::
+
+    obtener_vigilante().mesas_cambiadas.connect(self.actualizar_mesas)
+"""
+import database
+from PySide6.QtCore import QObject, QTimer, Signal
+
+INTERVALO_VIGILANCIA = 1000  # milisegundos
+
+class VigilanteBD(QObject):
+    tabla_cambiada = Signal(str)
+    mesas_cambiadas = Signal()
+    productos_cambiados = Signal()
+    ordenes_cambiadas = Signal()
+    comandas_cambiadas = Signal()
+
+    def __init__(self, ruta=None, intervalo=INTERVALO_VIGILANCIA, parent=None):
+        super().__init__(parent)
+        self.ruta = ruta
+        self._conexion = None
+        self._data_version = None
+        self._versiones = {}
+        self._timer = QTimer(self)
+        self._timer.setInterval(intervalo)
+        self._timer.timeout.connect(self.revisar)
+        self._senales = {
+            "mesas": self.mesas_cambiadas,
+            "productos": self.productos_cambiados,
+            "ordenes": self.ordenes_cambiadas,
+            "orden_detalles": self.ordenes_cambiadas,
+            "facturas": self.ordenes_cambiadas,
+            "comanda_estaciones": self.comandas_cambiadas,
+        }
+
+    def iniciar(self):
+        if self._conexion is None:
+            self._conexion = database.crear_conexion(self.ruta or database.RUTA_BD)
+            if self._conexion is None:
+                return
+            self._data_version = self._leer_data_version()
+            self._versiones = self._leer_versiones()
+        self._timer.start()
+
+    def detener(self):
+        self._timer.stop()
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def _leer_data_version(self):
+        return self._conexion.execute("PRAGMA data_version").fetchone()[0]
+
+    def _leer_versiones(self):
+        return dict(self._conexion.execute("SELECT tabla, version FROM cambios").fetchall())
+
+    def revisar(self):
+        """Emitir las señales de las tablas modificadas; devuelve sus nombres"""
+        if self._conexion is None:
+            return set()
+        try:
+            data_version = self._leer_data_version()
+            if data_version == self._data_version:
+                return set()
+            self._data_version = data_version
+            versiones = self._leer_versiones()
+        except database.Error as e:
+            print(f"Error revisando cambios: {e}")
+            return set()
+
+        cambiadas = {t for t, v in versiones.items() if self._versiones.get(t) != v}
+        self._versiones = versiones
+
+        # Una señal por vista aunque cambien varias tablas relacionadas
+        emitidas = set()
+        for tabla in sorted(cambiadas):
+            self.tabla_cambiada.emit(tabla)
+            senal = self._senales.get(tabla)
+            if senal is not None and tabla not in emitidas:
+                emitidas.update(t for t, s in self._senales.items() if s is senal)
+                senal.emit()
+        return cambiadas
+
+_vigilante = None
+
+def obtener_vigilante():
+    """Vigilante compartido, iniciado al primer uso (requiere QApplication)"""
+    global _vigilante
+    if _vigilante is None:
+        _vigilante = VigilanteBD()
+        _vigilante.iniciar()
+    return _vigilante